@@ -20,7 +20,35 @@ print("🚀 Завантаження Veritas Core...")
 try:
     # Спроба імпортувати ядро
     from veritas_core import VeritasCore
-    veritas_engine = VeritasCore()
+    from veritas_cache import ResultCache
+    # Репутація переживає рестарт, якщо задано каталог журналу
+    reputation_dir = os.environ.get('VERITAS_REPUTATION_DIR')
+    # Спільна таблиця для всіх воркерів багатопроцесного сервера.
+    # Місткість фіксується першим воркером: VERITAS_REPUTATION_CAPACITY слотів
+    # (степінь 2) вміщують до 90% джерел (65536 -> 58982); репутація нових
+    # джерел понад це не зберігається (RuntimeWarning), запити не падають
+    reputation_shm = os.environ.get('VERITAS_REPUTATION_SHM')
+    if reputation_shm:
+        import atexit
+        from veritas_shared import SharedReputationTable
+        reputation_registry = SharedReputationTable(
+            reputation_shm, capacity=int(os.environ.get('VERITAS_REPUTATION_CAPACITY', 1 << 16)),
+            drop_when_full=True)
+        atexit.register(reputation_registry.close)
+    elif reputation_dir:
+        import atexit
+        from veritas_journal import JournaledRegistry
+        reputation_registry = JournaledRegistry(reputation_dir)
+        atexit.register(reputation_registry.close)
+    else:
+        reputation_registry = None
+    veritas_engine = VeritasCore(registry=reputation_registry)
+    # Кеш чистої оцінки тексту; репутація оновлюється на кожен запит
+    result_cache = ResultCache(
+        max_bytes=int(os.environ.get('VERITAS_CACHE_BYTES', 64 * 1024 * 1024)),
+        ttl=float(os.environ.get('VERITAS_CACHE_TTL', 24 * 3600)),
+        disk_path=os.environ.get('VERITAS_CACHE_PATH')
+    )
     CORE_AVAILABLE = True
     print("✅ Veritas Core успішно завантажено!")
     print(f"📊 Завантажено вузлів: {len(veritas_engine.reputation_registry)}")
@@ -30,6 +58,7 @@ except ImportError as e:
     print(f"   Деталі: {e}")
     CORE_AVAILABLE = False
     veritas_engine = None
+    result_cache = None
 
 print("=" * 60)
 
@@ -55,6 +84,7 @@ def health_check():
     return jsonify({
         "status": "healthy" if CORE_AVAILABLE else "degraded",
         "core": "loaded" if CORE_AVAILABLE else "missing",
+        "cache": result_cache.stats() if result_cache else None,
         "timestamp": "2024-01-24T10:00:00Z"
     })
 
@@ -93,7 +123,9 @@ def analyze():
         
         # ВИКОНУЄМО СПРАВЖНІЙ АНАЛІЗ через VeritasCore
         print(f"🔍 Аналіз тексту від {source} ({len(text)} символів)")
-        result = veritas_engine.evaluate_integrity(text, source)
+        score = result_cache.get_or_compute(text, veritas_engine.version_tag(),
+                                            veritas_engine.score_text)
+        result = veritas_engine.apply_score(source, score)
         
         # Формуємо відповідь
         return jsonify({
@@ -130,7 +162,7 @@ def test_endpoint():
         "test": "passed",
         "core": "working",
         "sample_result": test_result,
-        "registry": veritas_engine.reputation_registry
+        "registry": dict(veritas_engine.reputation_registry)
     })
 
 if __name__ == '__main__':
@@ -13,9 +13,20 @@ sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
 try:
     from veritas_calibrated_core import VeritasCalibratedEngine
+    from veritas_cache import ResultCache
 except ImportError:
     # Fallback if import fails
     VeritasCalibratedEngine = None
+    ResultCache = None
+
+# Module-level state survives between warm invocations of the function
+engine = VeritasCalibratedEngine() if VeritasCalibratedEngine else None
+result_cache = ResultCache(
+    max_bytes=int(os.environ.get('VERITAS_CACHE_BYTES', 16 * 1024 * 1024)),
+    ttl=float(os.environ.get('VERITAS_CACHE_TTL', 24 * 3600)),
+    # Only /tmp is writable on Vercel
+    disk_path=os.environ.get('VERITAS_CACHE_PATH')
+) if ResultCache else None
 
 
 class handler(BaseHTTPRequestHandler):
@@ -43,7 +54,8 @@ class handler(BaseHTTPRequestHandler):
             'status': 'online',
             'service': 'Veritas Protocol Analysis API',
             'version': '3.0-calibrated',
-            'endpoint': '/api/analyze (POST)'
+            'endpoint': '/api/analyze (POST)',
+            'cache': result_cache.stats() if result_cache else None
         }
         
         self.wfile.write(json.dumps(response, ensure_ascii=False).encode('utf-8'))
@@ -71,13 +83,12 @@ class handler(BaseHTTPRequestHandler):
                 return
             
             # Check if engine is available
-            if VeritasCalibratedEngine is None:
+            if engine is None:
                 self._send_error(500, 'Analysis engine not available')
                 return
             
-            # Initialize engine and analyze
-            engine = VeritasCalibratedEngine()
-            result = engine.analyze(text)
+            # Analyze (repeated texts are served from the cache)
+            result = result_cache.get_or_compute(text, engine.version_tag(), engine.analyze)
             
             # Add source to result
             result['source'] = source
@@ -0,0 +1,4 @@
+"""
+Veritas Protocol - Benchmarks
+Скрипти вимірювання продуктивності движків аналізу.
+"""
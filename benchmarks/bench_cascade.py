@@ -0,0 +1,67 @@
+"""
+Benchmark: каскадний режим VeritasCalibratedEngine.analyze_cascade проти analyze
+Показує, який рівень ухвалив рішення, збіг статусів з повним аналізом
+і виграш у часі.
+
+Використання: python -m benchmarks.bench_cascade [paths ...] [--synthetic 20] [--repeats 5]
+"""
+
+import argparse
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.bench_suite import load_cases, load_scenarios, make_synthetic
+from veritas_calibrated_core import VeritasCalibratedEngine
+
+
+def best_of(fn, texts, repeats: int) -> float:
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for text in texts:
+            fn(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('paths', nargs='*', help='Тексти (default: cases/ + сценарії docs/TESTS.md)')
+    parser.add_argument('--synthetic', type=int, default=20, help='Синтетичних документів по 10KB')
+    parser.add_argument('--repeats', type=int, default=5)
+    args = parser.parse_args()
+
+    if args.paths:
+        texts = [Path(p).read_text(encoding='utf-8') for p in args.paths]
+    else:
+        texts = load_cases() + load_scenarios()
+    texts += [make_synthetic(10 << 10, seed=seed) for seed in range(args.synthetic)]
+
+    engine = VeritasCalibratedEngine()
+    tiers = Counter()
+    agree = Counter()
+    for text in texts:
+        full = engine.analyze(text)
+        cascade = engine.analyze_cascade(text)
+        if 'error' in full:
+            continue
+        tiers[cascade['tier']] += 1
+        agree[cascade['tier']] += cascade['status'] == full['status']
+
+    full_time = best_of(engine.analyze, texts, args.repeats)
+    cascade_time = best_of(engine.analyze_cascade, texts, args.repeats)
+
+    print(f"Documents: {sum(tiers.values())}")
+    print(f"{'tier':>5} {'docs':>6} {'status agrees':>14}")
+    for tier in sorted(tiers):
+        print(f"{tier:>5} {tiers[tier]:>6} {agree[tier] / tiers[tier]:>13.1%}")
+    print(f"  analyze:         {full_time * 1000:8.2f} ms")
+    print(f"  analyze_cascade: {cascade_time * 1000:8.2f} ms  (x{full_time / cascade_time:.2f})")
+
+
+if __name__ == "__main__":
+    main()
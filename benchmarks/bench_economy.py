@@ -0,0 +1,61 @@
+"""
+Benchmark: розрахунок епохи VeritasLedger
+Постів/с для settle_epoch на готових оцінках і для encode_posts (оцінка
+текстів), плюс послідовний VeritasSecureEconomy.process_cycle для порівняння.
+
+Використання: python -m benchmarks.bench_economy [--entities 1000000] [--posts 5000000] [--epochs 3]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from veritas_economy_proto import VeritasLedger, VeritasSecureEconomy
+
+TEXTS = ["The data shows consistent growth in the sector.", "Incredible massive news!",
+         "Shocking historic move!", "Quarterly report published."]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--entities', type=int, default=1_000_000)
+    parser.add_argument('--posts', type=int, default=5_000_000)
+    parser.add_argument('--epochs', type=int, default=3)
+    parser.add_argument('--texts', type=int, default=200_000, help='Постів для encode_posts і process_cycle')
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    ledger = VeritasLedger(args.entities)
+    for i in range(args.entities):
+        ledger.add_entity(f'e{i}', 1000.0, 0.5)
+    ledger.trust[:] = rng.random(args.entities)
+
+    for _ in range(args.epochs):
+        posts = (rng.integers(0, args.entities, args.posts), rng.choice([1, 4, 7, 10], args.posts))
+        start = time.perf_counter()
+        summary = ledger.settle_epoch(posts)
+        elapsed = time.perf_counter() - start
+        print(f"epoch {summary['epoch']}: {args.posts:,} posts in {elapsed:.2f}s "
+              f"({args.posts / elapsed:,.0f} posts/s), pool {summary['reward_pool']:,.0f}")
+
+    pairs = [(f'e{i % args.entities}', TEXTS[i % len(TEXTS)]) for i in range(args.texts)]
+    start = time.perf_counter()
+    ledger.encode_posts(pairs)
+    print(f"encode_posts: {args.texts / (time.perf_counter() - start):,.0f} posts/s")
+
+    economy = VeritasSecureEconomy()
+    economy.registry = {f'e{i}': {"balance": 1000.0, "trust": 0.5, "is_bot": False}
+                        for i in range(min(args.entities, args.texts))}
+    start = time.perf_counter()
+    for entity, text in pairs:
+        economy.process_cycle(entity, text)
+    print(f"process_cycle: {args.texts / (time.perf_counter() - start):,.0f} posts/s")
+
+
+if __name__ == "__main__":
+    main()
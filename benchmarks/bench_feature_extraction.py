@@ -0,0 +1,55 @@
+"""
+Benchmark: однопрохідне виділення ознак у VeritasCalibratedEngine
+Використання: python -m benchmarks.bench_feature_extraction [--words 10000]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from veritas_calibrated_core import VeritasCalibratedEngine
+
+
+def make_article(words: int, seed: int = 1) -> str:
+    """Синтетична стаття з лексики paper/veritas_protocol.md"""
+    vocab = (Path(__file__).parent.parent / 'paper' / 'veritas_protocol.md').read_text(
+        encoding='utf-8').split()
+    rnd = random.Random(seed)
+    return ' '.join(rnd.choice(vocab) for _ in range(words))
+
+
+def best_of(fn, repeats: int) -> float:
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--words', type=int, default=10000)
+    parser.add_argument('--repeats', type=int, default=50)
+    args = parser.parse_args()
+
+    engine = VeritasCalibratedEngine()
+    text = make_article(args.words)
+
+    extract = best_of(lambda: engine.extract_features(text), args.repeats)
+    features = engine.extract_features(text)
+    score = best_of(lambda: engine.analyze_features(features), args.repeats)
+    total = best_of(lambda: engine.analyze(text), args.repeats)
+
+    print(f"Article: {args.words} words, {len(text)} chars")
+    print(f"  extract_features: {extract * 1000:8.2f} ms")
+    print(f"  analyze_features: {score * 1000:8.2f} ms")
+    print(f"  analyze (total):  {total * 1000:8.2f} ms  ({args.words / total:,.0f} words/s)")
+
+
+if __name__ == "__main__":
+    main()
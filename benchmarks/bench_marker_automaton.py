@@ -0,0 +1,72 @@
+"""
+Benchmark: автомат маркерів MultilingualVeritasCore vs підрядковий пошук
+Показує, як масштабується підрахунок маркерів із ростом лексикону
+(від поточних ~20 маркерів на клас до 10k).
+
+Використання: python -m benchmarks.bench_marker_automaton [--words 2000]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'veritas-news-analyzer' / 'app'))
+
+from translator import LanguageDetector, MarkerAutomaton
+
+LEXICON_SIZES = (20, 100, 1000, 10000)
+CLASSES = {'chaos': 'CHAOS_MARKERS', 'noise': 'NOISE_MARKERS', 'signal': 'SIGNAL_MARKERS'}
+
+
+def grow_lexicon(base: set, size: int, rnd: random.Random) -> set:
+    """Доповнює лексикон синтетичними маркерами до заданого розміру"""
+    letters = 'абвгдежзиіїйклмнопрстуфхцчшщьюяє'
+    lexicon = set(base)
+    while len(lexicon) < size:
+        lexicon.add(''.join(rnd.choice(letters) for _ in range(rnd.randint(5, 10))))
+    return lexicon
+
+
+def substring_counts(words, marker_classes):
+    """Еталон: семантика any(m in w for m in markers) до появи автомата"""
+    return {
+        name: sum(1 for w in words if any(m in w for m in markers))
+        for name, markers in marker_classes.items()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--words', type=int, default=2000)
+    args = parser.parse_args()
+
+    rnd = random.Random(7)
+    doc_path = Path(__file__).parent.parent / 'cases' / 'case_03_pechersk_trukhanov.txt'
+    vocab = doc_path.read_text(encoding='utf-8').lower().replace(',', '').replace('.', '').split()
+    words = [rnd.choice(vocab) for _ in range(args.words)]
+
+    print(f"Document: {len(words)} words")
+    print(f"{'markers/class':>14} {'substring ms':>13} {'automaton ms':>13} {'speedup':>8}")
+    for size in LEXICON_SIZES:
+        marker_classes = {
+            name: grow_lexicon(getattr(LanguageDetector, attr)['uk'], size, rnd)
+            for name, attr in CLASSES.items()
+        }
+        automaton = MarkerAutomaton(marker_classes)
+
+        start = time.perf_counter()
+        expected = substring_counts(words, marker_classes)
+        legacy = time.perf_counter() - start
+
+        start = time.perf_counter()
+        counts = automaton.count_words(words)
+        compiled = time.perf_counter() - start
+
+        assert counts == expected, (size, counts, expected)
+        print(f"{size:>14} {legacy * 1000:>13.2f} {compiled * 1000:>13.2f} {legacy / compiled:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
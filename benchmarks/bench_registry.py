@@ -0,0 +1,76 @@
+"""
+Benchmark: ConcurrentRegistry під конкуренцією потоків
+Для кожної кількості потоків - оновлень/с для гарячого джерела (усі потоки
+б'ють в один ключ), розкиданих джерел і пакетного apply_updates, плюс
+перевірка, що жодне оновлення не загубилося.
+
+Використання: python -m benchmarks.bench_registry [--threads 1 2 4 8 16 32 64] [--updates 20000]
+"""
+
+import argparse
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from veritas_registry import ConcurrentRegistry
+
+BATCH = 16
+
+
+def increment(value):
+    return value + 1
+
+
+def run(threads: int, updates: int, mode: str) -> float:
+    """Оновлень/с; AssertionError, якщо сума не збігається"""
+    registry = ConcurrentRegistry()
+    per_thread = updates // threads
+    barrier = threading.Barrier(threads + 1)
+
+    def worker(i):
+        barrier.wait()
+        if mode == 'hot':
+            for _ in range(per_thread):
+                registry.update('hot', increment, 0)
+        elif mode == 'spread':
+            for n in range(per_thread):
+                registry.update(f'src{(i * 7919 + n) % 1024}', increment, 0)
+        else:
+            for _ in range(per_thread // BATCH):
+                registry.apply_updates('hot', [increment] * BATCH, 0)
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    for thread in workers:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    expected = threads * (per_thread if mode != 'batch' else per_thread // BATCH * BATCH)
+    total = sum(registry.values())
+    assert total == expected, f"lost updates: {total} != {expected} ({mode}, {threads} threads)"
+    return expected / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--threads', type=int, nargs='+', default=[1, 2, 4, 8, 16, 32, 64])
+    parser.add_argument('--updates', type=int, default=20000, help='Оновлень на прогін')
+    args = parser.parse_args()
+
+    print(f"{'threads':>7} {'hot upd/s':>12} {'spread upd/s':>13} {'batch upd/s':>12}")
+    for threads in args.threads:
+        hot = run(threads, args.updates, 'hot')
+        spread = run(threads, args.updates, 'spread')
+        batch = run(threads, args.updates, 'batch')
+        print(f"{threads:>7} {hot:>12,.0f} {spread:>13,.0f} {batch:>12,.0f}")
+    print("no lost updates")
+
+
+if __name__ == "__main__":
+    main()
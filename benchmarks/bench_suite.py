@@ -0,0 +1,341 @@
+"""
+Benchmark: відтворюваний прогін движків по cases/, сценаріях docs/TESTS.md
+і синтетичному корпусі від 100 B до 10 MB
+
+Для кожного движка (core, calibrated, multilingual, analyzer) і кожної групи
+документів міряються docs/s, bytes/s, p50/p99 затримки і пікова RSS.
+Кожен движок проганяється в окремому процесі, тож RSS не змішується;
+групи йдуть за зростанням розміру, і peak_rss_mb групи - це пік процесу
+до її завершення включно.
+
+Використання:
+    python -m benchmarks.bench_suite run --out bench.json
+    python -m benchmarks.bench_suite run --engines calibrated --sizes 1KB,1MB
+    python -m benchmarks.bench_suite compare base.json bench.json --tolerance 0.1
+"""
+
+import argparse
+import json
+import multiprocessing
+import platform
+import random
+import re
+import subprocess
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from time import perf_counter_ns
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / 'veritas-news-analyzer' / 'app'))
+
+from veritas_profiling import LatencyHistogram
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+ENGINES = ('core', 'calibrated', 'multilingual', 'analyzer')
+DEFAULT_SIZES = ('100B', '1KB', '10KB', '100KB', '1MB', '10MB')
+
+_SIZE_RE = re.compile(r'^(\d+(?:\.\d+)?)\s*(B|KB|MB|GB)?$', re.IGNORECASE)
+_SIZE_UNITS = {'B': 1, 'KB': 1 << 10, 'MB': 1 << 20, 'GB': 1 << 30}
+_SCENARIO_RE = re.compile(
+    r'^### [^\n]*?Test (\d+): ([^\n]*)\n+\*\*Input:\*\*\n```\n(.*?)\n```', re.MULTILINE | re.DOTALL
+)
+
+
+# === Корпус ===
+
+def parse_size(spec: str) -> int:
+    """'100B', '10KB', '1.5MB' -> байти"""
+    match = _SIZE_RE.match(spec.strip())
+    if not match:
+        raise ValueError(f"Bad size: {spec}")
+    return int(float(match.group(1)) * _SIZE_UNITS[(match.group(2) or 'B').upper()])
+
+
+def format_size(size: int) -> str:
+    for unit in ('GB', 'MB', 'KB'):
+        if size >= _SIZE_UNITS[unit] and size % _SIZE_UNITS[unit] == 0:
+            return f"{size // _SIZE_UNITS[unit]}{unit}"
+    return f"{size}B"
+
+
+def load_cases() -> List[str]:
+    return [p.read_text(encoding='utf-8') for p in sorted((ROOT / 'cases').glob('*')) if p.is_file()]
+
+
+def load_scenarios() -> List[str]:
+    """Вхідні тексти сценаріїв з docs/TESTS.md (блоки **Input:**)"""
+    text = (ROOT / 'docs' / 'TESTS.md').read_text(encoding='utf-8')
+    return [match.group(3) for match in _SCENARIO_RE.finditer(text)]
+
+
+def make_synthetic(size: int, seed: int = 1) -> str:
+    """
+    Синтетичний документ заданого розміру в байтах UTF-8 (мінус обрізаний
+    багатобайтовий символ на кінці)
+
+    Лексика - з cases/ і paper/veritas_protocol.md, з домішкою чисел,
+    КАПС-слів і знаків !/?, щоб працювали всі гілки ознак.
+    """
+    vocab = (ROOT / 'paper' / 'veritas_protocol.md').read_text(encoding='utf-8').split()
+    for case in load_cases():
+        vocab.extend(case.split())
+    rnd = random.Random(seed)
+
+    parts, words = [], []
+    total = 0
+    while total < size:
+        roll = rnd.random()
+        if roll < 0.03:
+            word = f"{rnd.randint(1, 9999)}.{rnd.randint(0, 99)}"
+        elif roll < 0.05:
+            word = rnd.choice(vocab).upper()
+        else:
+            word = rnd.choice(vocab)
+        if roll > 0.98:
+            word += rnd.choice('!?')
+        words.append(word)
+        total += len(word.encode('utf-8')) + 1
+        # Склеюємо частинами: мільйон дрібних str роздуває RSS більше, ніж сам текст
+        if len(words) == 4096:
+            parts.append(' '.join(words))
+            words.clear()
+    parts.append(' '.join(words))
+
+    text = ' '.join(parts).strip().encode('utf-8')[:size]
+    return text.decode('utf-8', errors='ignore')
+
+
+def build_groups(sizes: Iterable[int], seed: int = 1) -> Iterator[Tuple[str, List[str]]]:
+    """
+    (назва групи, документи) за зростанням розміру документів
+
+    Синтетичні документи генеруються ліниво, перед своєю групою,
+    щоб не потрапляти в базову RSS движка.
+    """
+    groups = [('cases', load_cases()), ('scenarios', load_scenarios())]
+    groups.sort(key=lambda group: max(map(len, group[1]), default=0))
+    yield from groups
+    for size in sorted(sizes):
+        yield f"synthetic-{format_size(size)}", [make_synthetic(size, seed)]
+
+
+# === Движки ===
+
+def make_runner(name: str) -> Callable[[str], object]:
+    """Функція оцінки документа (без змін реєстрів репутацій)"""
+    if name == 'core':
+        from veritas_core import VeritasCore
+        return VeritasCore().score_text
+    if name == 'calibrated':
+        from veritas_calibrated_core import VeritasCalibratedEngine
+        return VeritasCalibratedEngine().analyze
+    if name == 'multilingual':
+        from translator import MultilingualVeritasCore
+        return MultilingualVeritasCore().score_text
+    if name == 'analyzer':
+        from analyzer import VeritasAnalyzer
+        from core import VeritasEngine
+        analyzer, engine = VeritasAnalyzer({}), VeritasEngine({})
+
+        def run(text: str):
+            score = engine.calculate_veritas_score(analyzer.analyze(text))
+            return score, engine.get_status(score)
+        return run
+    raise ValueError(f"Unknown engine: {name}")
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Пікова RSS процесу в МБ (None, якщо resource недоступний)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux - КБ, macOS - байти
+    return round(peak / (1 << 20 if sys.platform == 'darwin' else 1 << 10), 1)
+
+
+def measure(run: Callable[[str], object], docs: List[str], min_runs: int, min_time: float) -> Dict:
+    """
+    Ганяє групу документів, доки не набереться min_runs проходів і min_time секунд
+
+    Returns:
+        Dict: docs, bytes, runs, seconds, docs_per_s, bytes_per_s, p50_ms, p99_ms
+    """
+    sizes = [len(doc.encode('utf-8')) for doc in docs]
+    run(docs[0])  # прогрів
+
+    latency = LatencyHistogram()
+    elapsed = 0
+    rounds = 0
+    while rounds < min_runs or elapsed < min_time * 1e9:
+        for doc in docs:
+            start = perf_counter_ns()
+            run(doc)
+            duration = perf_counter_ns() - start
+            latency.add(duration)
+            elapsed += duration
+        rounds += 1
+
+    seconds = elapsed / 1e9
+    return {
+        'docs': len(docs),
+        'bytes': sum(sizes),
+        'runs': latency.count,
+        'seconds': round(seconds, 4),
+        'docs_per_s': round(latency.count / seconds, 2),
+        'bytes_per_s': round(sum(sizes) * rounds / seconds),
+        'p50_ms': round(latency.quantile(0.50) / 1e6, 4),
+        'p99_ms': round(latency.quantile(0.99) / 1e6, 4)
+    }
+
+
+def run_engine(name: str, sizes: List[int], min_runs: int = 3, min_time: float = 0.5,
+               seed: int = 1) -> Dict:
+    """Прогін усіх груп одним движком (у поточному процесі)"""
+    run = make_runner(name)
+    result = {'rss_baseline_mb': peak_rss_mb(), 'groups': {}}
+    for group, docs in build_groups(sizes, seed):
+        if not docs:
+            continue
+        result['groups'][group] = measure(run, docs, min_runs, min_time)
+        result['groups'][group]['peak_rss_mb'] = peak_rss_mb()
+    result['peak_rss_mb'] = peak_rss_mb()
+    return result
+
+
+def run_suite(engines: Iterable[str] = ENGINES, sizes: Iterable[int] = (),
+              min_runs: int = 3, min_time: float = 0.5, seed: int = 1, isolate: bool = True) -> Dict:
+    """
+    Повний прогін; isolate=True - кожен движок у свіжому процесі (чиста RSS)
+    """
+    sizes = sorted(sizes)
+    report = {
+        'meta': environment(),
+        'config': {'sizes': [format_size(s) for s in sizes], 'min_runs': min_runs,
+                   'min_time': min_time, 'seed': seed},
+        'engines': {}
+    }
+    for name in engines:
+        if name not in ENGINES:
+            raise ValueError(f"Unknown engine: {name}")
+        if isolate:
+            context = multiprocessing.get_context('spawn')
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                result = pool.submit(run_engine, name, sizes, min_runs, min_time, seed).result()
+        else:
+            result = run_engine(name, sizes, min_runs, min_time, seed)
+        report['engines'][name] = result
+    return report
+
+
+def environment() -> Dict:
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                                capture_output=True, text=True, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    try:
+        import numpy
+        numpy_version = numpy.__version__
+    except ImportError:
+        numpy_version = None
+    return {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'numpy': numpy_version
+    }
+
+
+# === Порівняння ===
+
+def compare(baseline: Dict, current: Dict, tolerance: float = 0.1) -> Dict:
+    """
+    Порівнює docs/s двох прогонів по спільних (движок, група)
+
+    Returns:
+        Dict: rows [(engine, group, base, current, ratio)], regressions
+              (рядки з ratio < 1 - tolerance)
+    """
+    rows = []
+    for name, engine in current['engines'].items():
+        base_groups = baseline['engines'].get(name, {}).get('groups', {})
+        for group, stats in engine['groups'].items():
+            if group not in base_groups:
+                continue
+            base = base_groups[group]['docs_per_s']
+            ratio = stats['docs_per_s'] / base if base else float('inf')
+            rows.append((name, group, base, stats['docs_per_s'], round(ratio, 3)))
+    return {
+        'rows': rows,
+        'regressions': [row for row in rows if row[-1] < 1 - tolerance]
+    }
+
+
+def format_report(report: Dict) -> str:
+    lines = [f"{'engine':<13} {'group':<18} {'docs/s':>11} {'MB/s':>8} "
+             f"{'p50 ms':>10} {'p99 ms':>10} {'RSS MB':>8}"]
+    for name, engine in report['engines'].items():
+        for group, s in engine['groups'].items():
+            lines.append(f"{name:<13} {group:<18} {s['docs_per_s']:>11,.1f} "
+                         f"{s['bytes_per_s'] / (1 << 20):>8.2f} {s['p50_ms']:>10.3f} "
+                         f"{s['p99_ms']:>10.3f} {s['peak_rss_mb'] or 0:>8.1f}")
+    return '\n'.join(lines)
+
+
+def main(argv: Optional[Iterable[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Veritas Protocol - benchmark suite')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p_run = sub.add_parser('run', help='Прогнати движки і записати JSON')
+    p_run.add_argument('--engines', default=','.join(ENGINES))
+    p_run.add_argument('--sizes', default=','.join(DEFAULT_SIZES),
+                       help='Розміри синтетичних документів (100B,1KB,...,10MB)')
+    p_run.add_argument('--min-runs', type=int, default=3)
+    p_run.add_argument('--min-time', type=float, default=0.5, help='Мінімум секунд на групу')
+    p_run.add_argument('--seed', type=int, default=1)
+    p_run.add_argument('--out', help='Куди записати результат у JSON')
+
+    p_cmp = sub.add_parser('compare', help='Порівняти два прогони (exit 1 при регресії)')
+    p_cmp.add_argument('baseline')
+    p_cmp.add_argument('current')
+    p_cmp.add_argument('--tolerance', type=float, default=0.1,
+                       help='Допустиме падіння docs/s (0.1 = 10%%)')
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'run':
+        report = run_suite(
+            engines=[e for e in args.engines.split(',') if e],
+            sizes=[parse_size(s) for s in args.sizes.split(',') if s],
+            min_runs=args.min_runs, min_time=args.min_time, seed=args.seed
+        )
+        print(format_report(report))
+        if args.out:
+            Path(args.out).write_text(json.dumps(report, indent=2), encoding='utf-8')
+        return 0
+
+    baseline = json.loads(Path(args.baseline).read_text(encoding='utf-8'))
+    current = json.loads(Path(args.current).read_text(encoding='utf-8'))
+    result = compare(baseline, current, args.tolerance)
+    print(f"{'engine':<13} {'group':<18} {'base docs/s':>12} {'docs/s':>12} {'ratio':>7}")
+    for name, group, base, value, ratio in result['rows']:
+        flag = '  REGRESSION' if ratio < 1 - args.tolerance else ''
+        print(f"{name:<13} {group:<18} {base:>12,.1f} {value:>12,.1f} {ratio:>7.3f}{flag}")
+    if result['regressions']:
+        print(f"\n{len(result['regressions'])} regression(s) beyond {args.tolerance:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
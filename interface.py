@@ -1,4 +1,5 @@
 import os
+from itertools import islice
 from core import VeritasCore
 from states import get_action_protocol
 
@@ -19,7 +20,10 @@ def run_interface():
         print("="*50)
         print("   VERITAS PROTOCOL v7.2 - МОНІТОР ІСТИНИ")
         print("="*50)
-        print("\n[ДОСТУПНІ ВУЗЛИ]:", ", ".join(core.reputation_registry.keys()))
+        # Лише верхівка рейтингу: повний список не вміщається при сотнях тисяч вузлів
+        registry = core.reputation_registry
+        top = registry.index.top_k(10) if getattr(registry, 'index', None) else list(islice(registry.items(), 10))
+        print(f"\n[ДОСТУПНІ ВУЗЛИ] ({len(registry)}, топ-10):", ", ".join(name for name, _ in top))
         
         print("\n" + "-"*50)
         source = input("Введіть назву джерела (або 'exit'): ").strip()
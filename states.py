@@ -38,6 +38,22 @@ def calculate_state_from_reputation(reputation: float) -> str:
         return "QUARANTINE"
 
 
+def get_source_state(registry, source: str, default: float = 0.5) -> str:
+    """
+    Стан джерела за поточною репутацією з реєстру.
+    
+    Args:
+        registry: Реєстр репутацій (dict, ConcurrentRegistry, DecayingRegistry)
+        source: Джерело
+        default: Репутація джерела, якого немає в реєстрі
+        
+    Returns:
+        str: System state descriptor; для DecayingRegistry - з урахуванням
+             згасання на момент виклику
+    """
+    return calculate_state_from_reputation(registry.get(source, default))
+
+
 def get_state_description(state: str) -> str:
     """
     Повертає детальний опис стану.
@@ -0,0 +1,58 @@
+import os
+import tempfile
+import unittest
+
+from veritas_archive import ScoredArchive
+from veritas_calibrated_core import VeritasCalibratedEngine
+
+DOCS = {
+    'science': "The study shows a correlation of 0.73 between data and result in the sample.",
+    'rhetoric': "It is historically important to act now, the situation is outrageous and urgent!",
+    'kitchen': "Борщ і сметана: її рецепт, який важливо знати кожній господині на кухні.",
+    'plain': "The weather today is calm and the market opened without notable changes.",
+}
+PATCH = {
+    'add': {'noise': {'en': ['outrageous', 'the']}, 'chaos': {'uk': ['борщ']}},
+    'remove': {'signal': {'en': ['data']}}
+}
+
+
+class TestScoredArchive(unittest.TestCase):
+    def test_patch_matches_full_reanalysis(self):
+        archive = ScoredArchive()
+        for doc_id, text in DOCS.items():
+            archive.add(doc_id, text)
+
+        report = archive.apply_lexicon_patch(PATCH)
+        self.assertEqual(report['tokens'], 4)
+        self.assertEqual(report['documents_touched'], 4)
+
+        engine = VeritasCalibratedEngine()
+        engine.noise_markers['en'] |= {'outrageous', 'the'}
+        engine.chaos_markers['uk'].add('борщ')
+        engine.signal_markers['en'].discard('data')
+        for doc_id, text in DOCS.items():
+            expected = engine.analyze(text)
+            stored = archive.get(doc_id)
+            self.assertEqual((stored['entropy'], stored['status']),
+                             (expected['entropy'], expected['status']))
+
+    def test_patches_persist_and_noop_changes_are_skipped(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'archive.db')
+            archive = ScoredArchive(path)
+            archive.add('rhetoric', DOCS['rhetoric'])
+            archive.apply_lexicon_patch(PATCH)
+            archive.close()
+
+            reopened = ScoredArchive(path)
+            self.assertIn('outrageous', reopened.engine.noise_markers['en'])
+            self.assertEqual(reopened.documents_with('Outrageous'), [('rhetoric', 1)])
+            report = reopened.apply_lexicon_patch(PATCH)
+            self.assertEqual(report['tokens'], 0)
+            self.assertEqual(report['documents_touched'], 0)
+            reopened.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
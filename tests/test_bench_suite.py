@@ -0,0 +1,34 @@
+import copy
+import unittest
+
+from benchmarks.bench_suite import (compare, format_size, load_scenarios, make_synthetic,
+                                    parse_size, run_suite)
+
+
+class TestBenchSuite(unittest.TestCase):
+    def test_corpus(self):
+        self.assertEqual(parse_size('10MB'), 10 << 20)
+        self.assertEqual(format_size(parse_size('100KB')), '100KB')
+        self.assertEqual(len(load_scenarios()), 10)
+        text = make_synthetic(4096, seed=3)
+        self.assertIn(len(text.encode('utf-8')), range(4093, 4097))
+        self.assertEqual(text, make_synthetic(4096, seed=3))
+
+    def test_run_and_compare(self):
+        report = run_suite(engines=['calibrated', 'analyzer'], sizes=[parse_size('1KB')],
+                           min_runs=1, min_time=0, isolate=False)
+        groups = report['engines']['calibrated']['groups']
+        self.assertEqual(list(groups), ['scenarios', 'cases', 'synthetic-1KB'])
+        self.assertEqual(groups['scenarios']['docs'], 10)
+        self.assertGreater(groups['synthetic-1KB']['docs_per_s'], 0)
+        self.assertEqual(compare(report, report)['regressions'], [])
+
+        slower = copy.deepcopy(report)
+        slower['engines']['analyzer']['groups']['cases']['docs_per_s'] *= 0.8
+        regressions = compare(report, slower, tolerance=0.1)['regressions']
+        self.assertEqual([row[:2] for row in regressions], [('analyzer', 'cases')])
+        self.assertEqual(compare(report, slower, tolerance=0.25)['regressions'], [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'veritas-news-analyzer' / 'app'))
+
+from veritas_cache import ResultCache
+from veritas_calibrated_core import VeritasCalibratedEngine
+from translator import MultilingualVeritasCore
+from veritas_core import VeritasCore
+
+TEXT = "ШОКУЮЧА СЕНСАЦІЯ!!! Історично важливо і необхідно діяти негайно!"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestResultCache(unittest.TestCase):
+    def test_hit_returns_same_result(self):
+        engine = VeritasCalibratedEngine()
+        cache = ResultCache()
+        first = cache.get_or_compute(TEXT, engine.version_tag(), engine.analyze)
+        second = cache.get_or_compute("  " + TEXT + "\n", engine.version_tag(), engine.analyze)
+        self.assertEqual(first, engine.analyze(TEXT))
+        self.assertEqual(second, first)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_lru_ttl_and_size_bound(self):
+        clock = FakeClock()
+        cache = ResultCache(max_bytes=60, ttl=10, clock=clock)
+        cache.put('a', {'v': 'x' * 20})
+        cache.put('b', {'v': 'y' * 20})
+        cache.get('a')
+        cache.put('c', {'v': 'z' * 20})
+        self.assertIsNone(cache.get('b'))
+        self.assertIsNotNone(cache.get('a'))
+        clock.now += 11
+        self.assertIsNone(cache.get('a'))
+        self.assertLessEqual(cache.stats()['bytes'], 60)
+
+    def test_disk_tier_survives_restart(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'cache.db')
+            cache = ResultCache(disk_path=path)
+            cache.put('k', {'entropy': 0.5})
+            cache.close()
+            restarted = ResultCache(disk_path=path)
+            self.assertEqual(restarted.get('k'), {'entropy': 0.5})
+            self.assertEqual(restarted.disk_hits, 1)
+            restarted.close()
+
+    def test_reputation_applied_on_hit(self):
+        plain = MultilingualVeritasCore()
+        cached = MultilingualVeritasCore(cache=ResultCache())
+        for _ in range(3):
+            self.assertEqual(cached.evaluate_integrity(TEXT, "Tabloid"),
+                             plain.evaluate_integrity(TEXT, "Tabloid"))
+        self.assertEqual(cached.cache.hits, 2)
+        self.assertEqual(cached.reputation_registry, plain.reputation_registry)
+
+    def test_core_lexicon_change_invalidates_entries(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'cache.db')
+            engine = VeritasCore()
+            cache = ResultCache(disk_path=path)
+            text = "Якщо результат дорівнює нулю, тоді наказ виконано."
+            self.assertEqual(cache.get_or_compute(text, engine.version_tag(), engine.score_text),
+                             engine.score_text(text))
+            cache.close()
+
+            class Retuned(VeritasCore):
+                SIGNAL_MARKERS = VeritasCore.SIGNAL_MARKERS - {"якщо"}
+
+            retuned = Retuned()
+            self.assertNotEqual(retuned.version_tag(), engine.version_tag())
+            self.assertEqual(VeritasCore().version_tag(), engine.version_tag())
+            restarted = ResultCache(disk_path=path)
+            score = restarted.get_or_compute(text, retuned.version_tag(), retuned.score_text)
+            self.assertEqual(score, retuned.score_text(text))
+            self.assertEqual(restarted.misses, 1)
+            restarted.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
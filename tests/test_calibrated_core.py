@@ -0,0 +1,148 @@
+import unittest
+from veritas_calibrated_core import (MAX_CARRY, MAX_CHARS_PER_WORD, StreamingFeatureExtractor,
+                                     VeritasCalibratedEngine)
+
+ACADEMIC = """
+    У дослідженні взяли участь 2,847 респондентів віком від 18 до 65 років.
+    Статистичний аналіз показав кореляцію 0.73 (p<0.01) між змінними A та B.
+    """
+PROPAGANDA = "ІСТОРИЧНО ВАЖЛИВО!!! Етично неприпустимо ігнорувати цю КРИТИЧНУ ситуацію!"
+CONSPIRACY = "Рептилоїди через масонську змову контролюють світову економіку і фінанси."
+
+
+class TestCalibratedEngine(unittest.TestCase):
+    def setUp(self):
+        self.engine = VeritasCalibratedEngine()
+
+    def test_feature_record(self):
+        features = self.engine.extract_features(PROPAGANDA)
+        self.assertEqual(features.word_count, 8)
+        self.assertEqual(features.unique_words, 8)
+        self.assertEqual(features.caps_words, 3)
+        self.assertEqual(features.exclamations, 4)
+        self.assertEqual(features.char_count, len(PROPAGANDA))
+        self.assertEqual(sum(features.char_hist.values()), len(PROPAGANDA))
+        self.assertEqual(features.language, 'en')
+
+    def test_scores_unchanged(self):
+        # Значення зафіксовані до переходу на спільний запис ознак
+        result = self.engine.analyze(ACADEMIC)
+        self.assertEqual(result['entropy'], 0.184)
+        self.assertEqual(result['status'], 'TRUSTED')
+        self.assertEqual(result['diagnostics']['number_density'], 0.214)
+
+        result = self.engine.analyze(PROPAGANDA)
+        self.assertEqual(result['entropy'], 0.513)
+        self.assertEqual(result['diagnostics']['shout_factor'], 1.0)
+
+    def test_chaos_short_circuit(self):
+        result = self.engine.analyze(CONSPIRACY)
+        self.assertEqual(result['status'], 'CRITICAL')
+        self.assertEqual(result['entropy'], 0.99)
+
+    def test_batch_matches_scalar(self):
+        texts = [ACADEMIC, PROPAGANDA, CONSPIRACY, "short", ACADEMIC * 40 + PROPAGANDA]
+        self.assertEqual(self.engine.analyze_batch(texts),
+                         [self.engine.analyze(t) for t in texts])
+
+    def test_stream_matches_analyze(self):
+        text = ACADEMIC * 3 + PROPAGANDA
+        chunks = [text[i:i + 7] for i in range(0, len(text), 7)]
+        self.assertEqual(self.engine.analyze_stream(iter(chunks)), self.engine.analyze(text))
+        self.assertEqual(self.engine.analyze_stream(["   ", "short  "]), {'error': 'Text too short'})
+
+    def test_stream_bounds_carry_without_whitespace(self):
+        extractor = StreamingFeatureExtractor(self.engine)
+        extractor.feed(ACADEMIC)
+        for _ in range(100):
+            extractor.feed('x' * 10_000)
+            self.assertLessEqual(len(extractor._carry), MAX_CARRY)
+        extractor.feed(' ' + PROPAGANDA)
+        features = extractor.finish()
+        self.assertEqual(features.char_count, len(ACADEMIC) + 1_000_001 + len(PROPAGANDA))
+        # Слова до і після довгого шматка рахуються як у цілому тексті
+        exact = self.engine.extract_features(ACADEMIC + ' ' + PROPAGANDA)
+        self.assertEqual(features.caps_words, exact.caps_words)
+        self.assertEqual(features.number_count, exact.number_count)
+
+    def test_entropy_profile_matches_window_slices(self):
+        text = ACADEMIC * 4 + PROPAGANDA + CONSPIRACY + ACADEMIC * 2
+        profile = self.engine.entropy_profile(text, window=12, stride=5)
+        self.assertEqual(profile[-1]['end'], len(text.rstrip()))
+        for window in profile:
+            result = self.engine.analyze(text[window['start']:window['end']])
+            diagnostics = result['diagnostics']
+            self.assertEqual(window['shannon_entropy'], diagnostics['shannon_entropy'])
+            self.assertEqual(window['chaos_markers'], diagnostics['chaos_markers'])
+            self.assertEqual(window['word_count'], diagnostics['word_count'])
+            if 'shout_factor' in diagnostics:
+                self.assertEqual(window['shout_factor'], diagnostics['shout_factor'])
+                self.assertEqual(window['noise_markers'], diagnostics['noise_markers'])
+                self.assertEqual(window['signal_markers'], diagnostics['signal_markers'])
+
+    def test_cascade_matches_full_analysis(self):
+        self.assertEqual(self.engine.analyze_cascade(CONSPIRACY)['tier'], 0)
+        texts = [ACADEMIC, PROPAGANDA, CONSPIRACY, ACADEMIC * 40 + PROPAGANDA,
+                 "Якщо результат дорівнює нулю, тоді координати фіксуються як факт."]
+        for text in texts:
+            full = self.engine.analyze(text)
+            cascade = self.engine.analyze_cascade(text)
+            tier = cascade.pop('tier')
+            self.assertEqual(cascade['status'], full['status'])
+            if tier == 2:
+                self.assertEqual(cascade, full)
+            elif 'entropy_bounds' in cascade:
+                low, high = cascade['entropy_bounds']
+                self.assertTrue(low - 0.001 <= full['entropy'] <= high + 0.001)
+        self.assertEqual(self.engine.analyze_cascade("short"), {'error': 'Text too short'})
+
+    def test_cascade_tier0_accounts_for_shouting(self):
+        calm = "Якщо результат дорівнює нулю, тоді координати фіксуються як факт."
+        self.assertEqual(self.engine.analyze_cascade(calm)['tier'], 0)
+        for text in ["ЯКЩО РЕЗУЛЬТАТ ДОРІВНЮЄ НУЛЮ, ТОДІ КООРДИНАТИ ФІКСУЮТЬСЯ ЯК ФАКТ!!!",
+                     "Якщо результат дорівнює нулю!!! Тоді координати фіксуються як ФАКТ!!!"]:
+            full = self.engine.analyze(text)
+            cascade = self.engine.analyze_cascade(text)
+            self.assertEqual(cascade['status'], full['status'])
+            self.assertNotEqual(cascade['tier'], 0)
+            self.assertEqual(cascade['diagnostics']['shout_factor'], full['diagnostics']['shout_factor'])
+
+    def test_approximate_bounds_exact_score(self):
+        small = self.engine.analyze_approximate(ACADEMIC)
+        self.assertFalse(small['approximate'])
+        self.assertEqual(small['entropy'], self.engine.analyze(ACADEMIC)['entropy'])
+
+        text = (ACADEMIC * 3 + PROPAGANDA) * 400
+        exact = self.engine.analyze(text)
+        result = self.engine.analyze_approximate(text, token_budget=2000, window=50)
+        self.assertTrue(result['approximate'])
+        self.assertLess(result['sample']['fraction'], 0.2)
+        low, high = result['entropy_interval']
+        self.assertTrue(low <= exact['entropy'] <= high)
+
+        rushed = self.engine.analyze_approximate(text, token_budget=2000, window=50, time_budget=0)
+        self.assertEqual(rushed['sample']['groups'], 2)
+
+    def test_approximate_whitespace_free_tail(self):
+        text = 'the data shows a result ' * 20 + 'x' * 2_000_000
+        result = self.engine.analyze_approximate(text, token_budget=2000)
+        self.assertTrue(result['approximate'])
+        self.assertLessEqual(result['sample']['sampled_chars'], 2000 * MAX_CHARS_PER_WORD + 200)
+
+    def test_approximate_cjk_respects_budget(self):
+        text = '数据显示结果为四十二。' * 200_000
+        result = self.engine.analyze_approximate(text, token_budget=2000)
+        self.assertTrue(result['approximate'])
+        self.assertLessEqual(result['sample']['sampled_chars'], 2000 * MAX_CHARS_PER_WORD + 200)
+        self.assertEqual(result['language'], self.engine.analyze(text[:20_000])['language'])
+
+    def test_hyperloglog_estimate(self):
+        from veritas_sketches import HyperLogLog
+        sketch = HyperLogLog(precision=12, exact_limit=1000)
+        sketch.update('w%d' % i for i in range(20000))
+        self.assertFalse(sketch.is_exact)
+        self.assertAlmostEqual(sketch.count() / 20000, 1.0, delta=0.05)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+from unittest import mock
+
+import veritas_calibration
+from veritas_calibrated_core import VeritasCalibratedEngine
+from veritas_calibration import STATUSES, FeatureStore, sweep
+
+TEXTS = {
+    'academic': """У дослідженні взяли участь 2,847 респондентів віком від 18 до 65 років.
+    Статистичний аналіз показав кореляцію 0.73 (p<0.01) між змінними A та B.""",
+    'propaganda': "ІСТОРИЧНО ВАЖЛИВО!!! Етично неприпустимо ігнорувати цю КРИТИЧНУ ситуацію!",
+    'news': "The central bank raised interest rates by 0.25 points to 4.5% after inflation data.",
+    'conspiracy': "Рептилоїди через масонську змову контролюють світову економіку і фінанси.",
+}
+
+
+class TestCalibrationSweep(unittest.TestCase):
+    def setUp(self):
+        self.engine = VeritasCalibratedEngine()
+        self.store = FeatureStore(engine=self.engine)
+        for doc_id, text in TEXTS.items():
+            self.store.add(doc_id, text, self.engine.analyze(text)['status'])
+
+    def test_baseline_reproduces_engine_statuses(self):
+        _, labels, columns = self.store.load()
+        report = sweep(columns, labels, {})
+        self.assertEqual(report['baseline']['accuracy'], 1.0)
+        self.assertEqual(sum(map(sum, report['baseline']['confusion'])), len(TEXTS))
+
+    def test_sweep_matches_scalar_engine(self):
+        doc_ids, labels, columns = self.store.load()
+        grid = {'trusted': [0.1, 0.3, 0.5], 'acceptable': [0.4, 0.6], 'shout_factor': [0.0, 0.5]}
+        report = sweep(columns, labels, grid, top=12)
+        self.assertEqual(report['combinations'], 12)
+        self.assertEqual(report['evaluated'], 10)  # trusted=0.5 >= acceptable=0.4 відкинуто
+
+        for entry in report['best']:
+            engine = VeritasCalibratedEngine()
+            for name, value in entry['params'].items():
+                (engine.weights if name in engine.weights else engine.thresholds)[name] = value
+            predicted = [STATUSES.index(engine.analyze(TEXTS[d])['status']) for d in doc_ids]
+            expected = sum(p == l for p, l in zip(predicted, labels)) / len(labels)
+            self.assertAlmostEqual(entry['accuracy'], expected, places=4)
+
+    def test_requires_numpy(self):
+        with mock.patch.object(veritas_calibration, 'np', None):
+            with self.assertRaisesRegex(ImportError, 'numpy'):
+                FeatureStore()
+            with self.assertRaisesRegex(ImportError, 'numpy'):
+                sweep({}, [], {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,38 @@
+import unittest
+from veritas_corpus import CorpusRunner, make_engine
+
+TEXTS = [
+    "Якщо результат дорівнює нулю, тоді координати фіксуються як факт.",
+    "ШОКУЮЧА СЕНСАЦІЯ!!! Історично важливо і необхідно діяти негайно!",
+    "The data shows a correlation of 0.73 between the measured variables.",
+    "Рептилоїди через масонську змову контролюють світ!!!",
+] * 5
+SOURCES = ["A", "B", "A", "C"] * 5
+
+
+class TestCorpusRunner(unittest.TestCase):
+    def test_reputation_merge_matches_serial(self):
+        serial = make_engine('multilingual')
+        expected = [serial.evaluate_integrity(t, s) for t, s in zip(TEXTS, SOURCES)]
+
+        runner = CorpusRunner('multilingual', workers=2, chunk_size=3)
+        self.assertEqual(list(runner.run(TEXTS, SOURCES)), expected)
+        self.assertEqual(runner.reputation_registry, serial.reputation_registry)
+
+    def test_unordered_covers_all_documents(self):
+        runner = CorpusRunner('calibrated', workers=2, chunk_size=3)
+        indices = sorted(i for i, _ in runner.run(TEXTS, ordered=False))
+        self.assertEqual(indices, list(range(len(TEXTS))))
+
+    def test_sources_must_match_texts(self):
+        runner = CorpusRunner('multilingual', workers=1, chunk_size=3)
+        with self.assertRaisesRegex(ValueError, '20 texts but 19 sources'):
+            list(runner.run(TEXTS, SOURCES[:-1]))
+        with self.assertRaisesRegex(ValueError, 'ran out after 19'):
+            list(runner.run(iter(TEXTS), iter(SOURCES[:-1])))
+        with self.assertRaisesRegex(ValueError, 'More sources'):
+            list(runner.run(iter(TEXTS), iter(SOURCES + ["D"])))
+
+
+if __name__ == '__main__':
+    unittest.main()
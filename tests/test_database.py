@@ -0,0 +1,136 @@
+import random
+import sys
+import tempfile
+import unittest
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'veritas-news-analyzer' / 'app'))
+
+from database import SERIES_RESOLUTIONS, VeritasDatabase
+
+HOUR = 3600
+DAY = 86400
+# Початок доби (UTC), щоб кошики були передбачувані
+T0 = 1_700_000_000 - 1_700_000_000 % DAY
+
+
+class TestSourceSeries(unittest.TestCase):
+    def setUp(self):
+        self.db = VeritasDatabase(':memory:')
+
+    def tearDown(self):
+        self.db.close()
+
+    def test_downsampling(self):
+        points = [(T0 + 10, 0.5, 0.2), (T0 + 20, 0.45, 0.4), (T0 + HOUR + 5, 0.4, 0.6),
+                  (T0 + DAY + 1, 0.35, 0.8)]
+        for t, reputation, entropy in points:
+            self.db.append_series('RT', reputation, entropy, t)
+
+        raw = self.db.get_source_series('RT', 'raw')
+        self.assertEqual([p['reputation'] for p in raw], [0.5, 0.45, 0.4, 0.35])
+
+        hourly = self.db.get_source_series('RT', 'hourly')
+        self.assertEqual([p['count'] for p in hourly], [2, 1, 1])
+        self.assertEqual(hourly[0]['reputation'], 0.45)
+        self.assertAlmostEqual(hourly[0]['entropy'], 0.3)
+        self.assertEqual(hourly[0]['timestamp'], datetime.fromtimestamp(T0).isoformat())
+
+        daily = self.db.get_source_series('RT', 'daily')
+        self.assertEqual([p['count'] for p in daily], [3, 1])
+        self.assertAlmostEqual(daily[0]['entropy'], 0.4)
+
+    def test_ring_is_bounded(self):
+        capacity = SERIES_RESOLUTIONS['raw'][1]
+        for i in range(capacity + 10):
+            self.db.append_series('BBC', 0.5, i / 1000, T0 + i)
+        raw = self.db.get_source_series('BBC', 'raw')
+        self.assertEqual(len(raw), capacity)
+        self.assertEqual(raw[0]['entropy'], 0.01)
+        self.assertEqual(raw[-1]['entropy'], round((capacity + 9) / 1000, 4))
+
+    def test_range_and_sources_are_separate(self):
+        for h in range(10):
+            self.db.append_series('BBC', 0.5 + h / 100, 0.1, T0 + h * HOUR)
+        self.db.append_series('RT', 0.1, 0.9, T0)
+        window = self.db.get_source_series('BBC', 'hourly', start=T0 + 2 * HOUR, end=T0 + 4 * HOUR)
+        self.assertEqual([p['reputation'] for p in window], [0.52, 0.53, 0.54])
+        self.assertEqual(len(self.db.get_source_series('RT', 'hourly')), 1)
+        self.assertEqual(self.db.get_source_series('CNN'), [])
+        with self.assertRaises(ValueError):
+            self.db.get_source_series('BBC', 'minutely')
+
+    def test_save_analysis_appends_series(self):
+        self.db.save_analysis({
+            'timestamp': datetime.fromtimestamp(T0 + 30).isoformat(),
+            'content': {'source': 'Test Source'},
+            'veritas_analysis': {'entropy_index': 0.45, 'reputation': 0.75}
+        })
+        raw = self.db.get_source_series('Test Source', 'raw')
+        self.assertEqual(len(raw), 1)
+        self.assertEqual(raw[0]['reputation'], 0.75)
+        self.assertEqual(raw[0]['timestamp'], datetime.fromtimestamp(T0 + 30).isoformat())
+
+
+class TestSourceRanking(unittest.TestCase):
+    def setUp(self):
+        self.db = VeritasDatabase(':memory:')
+        rng = random.Random(5)
+        self.values = {}
+        for i in range(600):
+            source = f'src{rng.randrange(300)}'
+            self.values[source] = round(rng.random(), 3)
+            self.db._update_source_reputation(source, self.values[source])
+
+    def tearDown(self):
+        self.db.close()
+
+    def test_keyset_pages_cover_ranking(self):
+        expected = sorted(self.values.items(), key=lambda item: (item[1], item[0]), reverse=True)
+        seen, cursor = [], None
+        while True:
+            page = self.db.get_sources_page(limit=37, cursor=cursor)
+            seen += [(row['source'], row['reputation']) for row in page['sources']]
+            cursor = page['next_cursor']
+            if cursor is None:
+                break
+        self.assertEqual(seen, expected)
+
+        bottom = self.db.get_sources_page(limit=5, order='asc')['sources']
+        self.assertEqual([row['source'] for row in bottom], [s for s, _ in expected[::-1][:5]])
+        with self.assertRaises(ValueError):
+            self.db.get_sources_page(order='sideways')
+
+    def test_reputation_range(self):
+        page = self.db.get_sources_page(limit=1000, order='asc', min_reputation=0.2, max_reputation=0.4)
+        expected = sorted((v, s) for s, v in self.values.items() if 0.2 <= v <= 0.4)
+        self.assertEqual([(row['reputation'], row['source']) for row in page['sources']], expected)
+        self.assertIsNone(page['next_cursor'])
+
+    def test_quantiles_match_sorted_values(self):
+        ordered = sorted(self.values.values())
+        quantiles = [0.0, 0.1, 0.5, 0.9, 1.0]
+        result = self.db.get_reputation_quantiles(quantiles)
+        self.assertEqual(result, {q: ordered[int(q * (len(ordered) - 1))] for q in quantiles})
+        self.assertEqual(VeritasDatabase(':memory:').get_reputation_quantiles([0.5]), {0.5: None})
+
+    def test_histogram_rebuilt_for_existing_database(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = str(Path(directory) / 'veritas.db')
+            db = VeritasDatabase(path)
+            for source, value in self.values.items():
+                db._update_source_reputation(source, value)
+            # База, створена до появи гістограми
+            db.conn.execute("DELETE FROM reputation_histogram")
+            db.conn.commit()
+            db.close()
+
+            reopened = VeritasDatabase(path)
+            ordered = sorted(self.values.values())
+            self.assertEqual(reopened.get_reputation_quantiles([0.5])[0.5], ordered[(len(ordered) - 1) // 2])
+            reopened.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import unittest
+
+from veritas_calibrated_core import VeritasCalibratedEngine
+from veritas_dedup import NearDuplicateIndex
+
+ARTICLE = " ".join(
+    f"Statistics bureau reported {i} percent growth in region {i % 7} according to the "
+    f"official methodology and peer-reviewed research published in journal volume {i}."
+    for i in range(40)
+)
+OTHER = " ".join(
+    f"Local team won match {i} after a long season with fans celebrating in the streets "
+    f"of city {i % 5} until late night."
+    for i in range(40)
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestNearDuplicateIndex(unittest.TestCase):
+    def test_syndicated_copy_reuses_features(self):
+        engine = VeritasCalibratedEngine()
+        index = NearDuplicateIndex(engine)
+        self.assertEqual(index.analyze(ARTICLE), engine.analyze(ARTICLE))
+
+        copy = "WIRE REPORT!\nBy Staff Writer\n" + ARTICLE + "\nRead more at example.com"
+        result = index.analyze(copy)
+        self.assertAlmostEqual(result['entropy'], engine.analyze(copy)['entropy'], delta=0.01)
+        self.assertEqual(result['diagnostics']['char_count'], len(copy))
+
+        self.assertEqual(index.analyze(OTHER), engine.analyze(OTHER))
+        self.assertEqual(index.stats()['saved'], 1)
+        self.assertEqual(index.stats()['full_analyses'], 2)
+
+    def test_expiry_and_bound(self):
+        clock = FakeClock()
+        index = NearDuplicateIndex(ttl=60, max_entries=1, clock=clock)
+        index.analyze(ARTICLE)
+        index.analyze(OTHER)
+        self.assertEqual(len(index), 1)
+
+        clock.now += 61
+        index.analyze(ARTICLE)
+        self.assertEqual(index.stats()['expired'], 1)
+        self.assertEqual(index.stats()['saved'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
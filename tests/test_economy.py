@@ -0,0 +1,114 @@
+import random
+import unittest
+
+import numpy as np
+
+from veritas_economy_proto import VeritasLedger, VeritasSecureEconomy, score_text
+
+DEMO = [
+    ("Bot_Net_001", "Incredible massive news!"),
+    ("Bot_Net_001", "Shocking historic move!"),
+    ("BBC_News", "The data shows consistent growth in the sector."),
+]
+
+
+def fresh_ledger():
+    return VeritasLedger.from_registry(VeritasSecureEconomy().registry)
+
+
+def total_money(ledger):
+    return float(ledger.balance.sum()) + ledger.reward_pool
+
+
+class TestVeritasLedger(unittest.TestCase):
+    def test_demo_epoch_matches_process_cycle(self):
+        economy = VeritasSecureEconomy()
+        for entity, text in DEMO:
+            economy.process_cycle(entity, text)
+        ledger = fresh_ledger()
+        summary = ledger.settle_epoch(ledger.encode_posts(DEMO))
+        self.assertEqual(summary['denied'], 2)
+        self.assertEqual(summary['rewarded'], 1)
+        self.assertAlmostEqual(ledger.reward_pool, economy.reward_pool)
+        for name, entry in economy.registry.items():
+            for key, value in entry.items():
+                self.assertAlmostEqual(ledger.entity(name)[key], value, msg=(name, key))
+
+    def test_single_post_epochs_match_process_cycle(self):
+        rng = random.Random(5)
+        texts = ["Calm report.", "Historic day", "Incredible massive historic!", "massive growth"]
+        economy = VeritasSecureEconomy()
+        economy.reward_pool = 500.0
+        ledger = VeritasLedger.from_registry(economy.registry, reward_pool=500.0)
+        for _ in range(300):
+            post = (rng.choice(list(economy.registry)), rng.choice(texts))
+            economy.process_cycle(*post)
+            ledger.settle_epoch(ledger.encode_posts([post]))
+        self.assertAlmostEqual(ledger.reward_pool, economy.reward_pool, places=6)
+        for name, entry in economy.registry.items():
+            self.assertAlmostEqual(ledger.entity(name)['balance'], entry['balance'], places=6)
+            self.assertAlmostEqual(ledger.entity(name)['trust'], entry['trust'], places=9)
+
+    def test_epoch_is_order_independent_and_conserves_money(self):
+        rng = np.random.default_rng(11)
+        ledger = VeritasLedger(capacity=4)
+        for i in range(500):
+            ledger.add_entity(f'e{i}', 1000.0, rng.random(), bool(i % 7 == 0))
+        ids = rng.integers(0, 500, 20000)
+        scores = rng.choice([1, 4, 7, 10], 20000)
+        before = total_money(ledger)
+
+        shuffled = VeritasLedger.from_registry(ledger.to_registry())
+        order = rng.permutation(len(ids))
+        a = ledger.settle_epoch((ids, scores))
+        b = shuffled.settle_epoch((ids[order], scores[order]))
+        self.assertEqual(a['denied'] + a['slashed'] + a['rewarded'], 20000)
+        np.testing.assert_allclose(ledger.balance, shuffled.balance)
+        np.testing.assert_array_equal(ledger.trust, shuffled.trust)
+        self.assertAlmostEqual(total_money(ledger), before, places=4)
+        self.assertLessEqual(a['rewards'], a['penalties'] * 0.3 + 1e-6)
+        self.assertTrue(((ledger.trust >= 0) & (ledger.trust <= 1)).all())
+        self.assertAlmostEqual(b['reward_pool'], a['reward_pool'])
+
+    def test_good_posts_do_not_unlock_bundled_hype(self):
+        ledger = VeritasLedger.from_registry({'bot': {'balance': 100.0, 'trust': 0.1, 'is_bot': True},
+                                              'bbc': {'balance': 1000.0, 'trust': 1.0}}, reward_pool=500.0)
+        good = "The data shows consistent growth in the sector."
+        hype = ["Historic growth figures", "Incredible massive historic news!"]
+        posts = [('bot', good)] * 4 + [('bot', text) for text in hype]
+        summary = ledger.settle_epoch(ledger.encode_posts(posts))
+        # Довіра після епохи 0.1 + 4 * 0.05 - 0.2, але жоден пост не пройшов ідентифікацію
+        self.assertEqual(summary['denied'], 6)
+        self.assertEqual(summary['rewarded'], 0)
+        self.assertAlmostEqual(ledger.entity('bot')['balance'], 100.0 - 6 * 50.0)
+        self.assertAlmostEqual(ledger.entity('bot')['trust'], 0.1)
+
+        ledger = VeritasLedger.from_registry({'bot': {'balance': 100.0, 'trust': 0.1}})
+        summary = ledger.settle_epoch(ledger.encode_posts([('bot', good)] * 4 + [('bot', "Historic growth")]))
+        self.assertEqual(summary['denied'], 5)
+        self.assertAlmostEqual(ledger.entity('bot')['trust'], 0.3)
+
+    def test_claims_are_scaled_to_pool_share(self):
+        ledger = VeritasLedger.from_registry({'a': {'balance': 0.0, 'trust': 1.0},
+                                              'b': {'balance': 0.0, 'trust': 1.0}}, reward_pool=100.0)
+        summary = ledger.settle_epoch(([0, 0, 1], [10, 10, 5]))
+        self.assertAlmostEqual(summary['rewards'], 30.0)
+        self.assertAlmostEqual(ledger.entity('a')['balance'], 24.0)
+        self.assertAlmostEqual(ledger.entity('b')['balance'], 6.0)
+
+    def test_validation(self):
+        ledger = fresh_ledger()
+        with self.assertRaises(IndexError):
+            ledger.settle_epoch(([99], [10]))
+        with self.assertRaises(ValueError):
+            ledger.settle_epoch(([0, 1], [10]))
+        with self.assertRaises(KeyError):
+            ledger.encode_posts([("Nobody", "text")])
+        with self.assertRaises(ValueError):
+            ledger.add_entity("BBC_News")
+        self.assertEqual(score_text("Historic and incredible"), 4)
+        self.assertEqual(ledger.settle_epoch(([], []))['posts'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,40 @@
+import unittest
+
+from veritas_ensemble import DocumentFeatures, EnsembleRunner
+
+TEXT = """У дослідженні взяли участь 2,847 респондентів. Якщо дані підтверджено, тоді результат
+дорівнює 0.73! ШОКУЮЧА правда: квантовий борщ важливо перевірити?"""
+
+
+class TestEnsembleRunner(unittest.TestCase):
+    def test_scores_match_individual_engines(self):
+        ensemble = EnsembleRunner()
+        result = ensemble.analyze(TEXT)
+
+        core = ensemble.engine('core')
+        calibrated = ensemble.engine('calibrated')
+        multilingual = ensemble.engine('multilingual')
+        analyzer, engine = ensemble.engine('analyzer')
+        metrics = analyzer.analyze(TEXT)
+
+        self.assertEqual(result['scores']['core'], core.score_text(TEXT))
+        self.assertEqual(result['scores']['calibrated'], calibrated.analyze(TEXT))
+        self.assertEqual(result['scores']['multilingual'], multilingual.score_text(TEXT))
+        self.assertEqual(result['entropy']['analyzer'], engine.calculate_veritas_score(metrics))
+        self.assertAlmostEqual(result['fused_entropy'],
+                               sum(result['entropy'].values()) / 4, places=3)
+
+    def test_subset_computes_only_needed_features(self):
+        ensemble = EnsembleRunner(weights={'core': 3.0})
+        doc = DocumentFeatures(TEXT)
+        result = ensemble.analyze(doc, engines=['core'])
+        self.assertEqual(set(result['scores']), {'core'})
+        self.assertEqual(sorted(doc.computed()), ['lower', 'marker_words'])
+        self.assertEqual(result['fused_entropy'], round(result['entropy']['core'], 3))
+
+        with self.assertRaises(ValueError):
+            ensemble.analyze(TEXT, engines=['unknown'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,42 @@
+import math
+import unittest
+from collections import Counter
+
+from veritas_entropy import batch_shannon_entropy, char_histogram, shannon_entropy
+
+TEXTS = [
+    "",
+    "aaaa",
+    "Історично важливо і необхідно діяти негайно!",
+    "Mixed текст with emoji 😀 and numbers 42.5",
+    "According to the peer-reviewed study, the methodology is sound. " * 20,
+]
+
+
+def reference_entropy(symbols):
+    counts = Counter(symbols)
+    total = sum(counts.values())
+    return -sum(c / total * math.log2(c / total) for c in counts.values()) if total else 0.0
+
+
+class TestEntropyKernel(unittest.TestCase):
+    def test_exact_mode_matches_code_points(self):
+        for text in TEXTS:
+            self.assertEqual(char_histogram(text), Counter(text))
+            self.assertAlmostEqual(shannon_entropy(text), reference_entropy(text), places=12)
+
+    def test_byte_mode(self):
+        for text in TEXTS:
+            expected = reference_entropy(text.encode('utf-8'))
+            self.assertAlmostEqual(shannon_entropy(text, exact=False), expected, places=12)
+
+    def test_batch_matches_single(self):
+        for exact in (True, False):
+            batch = batch_shannon_entropy(TEXTS, exact=exact)
+            single = [shannon_entropy(text, exact=exact) for text in TEXTS]
+            for a, b in zip(batch, single):
+                self.assertAlmostEqual(a, b, places=12)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,189 @@
+import os
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'veritas-news-analyzer' / 'app'))
+
+from veritas_core import VeritasCore
+from veritas_journal import JournaledRegistry, ReputationJournal, read_frames
+from translator import MultilingualVeritasCore
+
+TEXT = "Статистичний аналіз показав кореляцію 0.73 (p<0.01) між змінними A та B."
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        self.now += 1
+        return self.now
+
+
+class TestJournaledRegistry(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.directory = self.tmp.name
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def open(self, **options):
+        return JournaledRegistry(self.directory, **options)
+
+    def test_reopen_restores_state(self):
+        registry = self.open(clock=FakeClock())
+        registry['BBC'] = 0.62
+        registry['RT'] = 0.1
+        registry['BBC'] = 0.65
+        registry.close()
+
+        reopened = self.open()
+        self.assertEqual(dict(reopened), {'BBC': 0.65, 'RT': 0.1})
+        self.assertEqual(reopened.updated_at('BBC'), 1003.0)
+        reopened.close()
+
+    def test_delete_survives_restart(self):
+        registry = self.open()
+        registry['BBC'] = 0.62
+        registry['RT'] = 0.1
+        del registry['RT']
+        self.assertNotIn('RT', registry)
+        self.assertEqual(len(registry), 1)
+        with self.assertRaises(KeyError):
+            del registry['RT']
+        registry.close()
+
+        reopened = self.open()
+        self.assertEqual(dict(reopened), {'BBC': 0.62})
+        self.assertIsNone(reopened.get('RT'))
+        reopened.close()
+
+    def test_snapshot_compacts_old_files(self):
+        registry = self.open()
+        for i in range(100):
+            registry[f'src{i}'] = i / 100
+        del registry['src0']
+        registry.snapshot()
+        registry['after'] = 0.9
+        registry.close()
+
+        names = sorted(os.listdir(self.directory))
+        self.assertEqual(names, ['journal-00000001.vrj', 'snapshot-00000001.vrj'])
+        reopened = self.open()
+        self.assertEqual(len(reopened), 100)
+        self.assertEqual(reopened['src42'], 0.42)
+        self.assertEqual(reopened['after'], 0.9)
+        reopened.close()
+
+    def test_auto_snapshot_by_size(self):
+        registry = self.open(snapshot_bytes=256, sync='always')
+        for i in range(20):
+            registry['BBC'] = i / 100
+        registry.close()
+        self.assertTrue(any(name.startswith('snapshot-') for name in os.listdir(self.directory)))
+        reopened = self.open()
+        self.assertEqual(dict(reopened), {'BBC': 0.19})
+        reopened.close()
+
+    def test_auto_snapshot_runs_off_the_writer_thread(self):
+        registry = self.open(snapshot_bytes=256, sync='always')
+        started, release = threading.Event(), threading.Event()
+        threads = []
+        snapshot = registry.journal.snapshot
+
+        def slow_snapshot(state):
+            threads.append(threading.current_thread().name)
+            started.set()
+            release.wait(5)
+            snapshot(state)
+
+        registry.journal.snapshot = slow_snapshot
+        for i in range(20):
+            registry['BBC'] = i / 100
+        self.assertTrue(started.wait(5))
+        # Записи не чекали на знімок, і поки він триває, другий не запускається
+        self.assertFalse(release.is_set())
+        self.assertEqual(threads, ['reputation-snapshot'])
+        release.set()
+        registry.close()
+        reopened = self.open()
+        self.assertEqual(dict(reopened), {'BBC': 0.19})
+        reopened.close()
+
+    def test_torn_tail_is_dropped(self):
+        registry = self.open(sync='always')
+        registry['BBC'] = 0.62
+        registry['RT'] = 0.1
+        registry.close()
+
+        path = Path(self.directory) / 'journal-00000000.vrj'
+        intact = path.stat().st_size
+        with open(path, 'ab') as f:
+            f.write(b'VRJ1\x05\x00')
+
+        reopened = self.open()
+        self.assertEqual(dict(reopened), {'BBC': 0.62, 'RT': 0.1})
+        self.assertEqual(path.stat().st_size, intact)
+        reopened['CNN'] = 0.7
+        reopened.close()
+        self.assertEqual(len(read_frames(path)[0]), 3)
+
+    def test_group_commit_batches_updates(self):
+        registry = self.open(group_size=1000, group_interval=60)
+        for i in range(10):
+            registry[f'src{i}'] = 0.5
+        registry.flush()
+        frames, _ = read_frames(Path(self.directory) / 'journal-00000000.vrj')
+        self.assertEqual(len(frames), 1)
+        self.assertEqual(len(frames[0][0]), 10)
+        registry.close()
+
+    def test_rejects_nul_in_name(self):
+        journal = ReputationJournal(self.directory)
+        journal.recover()
+        with self.assertRaises(ValueError):
+            journal.append('bad\0name', 0.5)
+        journal.close()
+
+    def test_use_after_close_raises(self):
+        journal = ReputationJournal(self.directory, group_size=1000, group_interval=60)
+        journal.recover()
+        journal.append('BBC', 0.62)
+        journal.close()
+        with self.assertRaisesRegex(ValueError, 'journal is closed'):
+            journal.append('RT', 0.1)
+        with self.assertRaisesRegex(ValueError, 'journal is closed'):
+            journal.flush()
+        journal.close()
+        frames, _ = read_frames(Path(self.directory) / 'journal-00000000.vrj')
+        self.assertEqual([names for names, _ in frames], [['BBC']])
+
+    def test_veritas_core_reputation_persists(self):
+        registry = self.open()
+        engine = VeritasCore(registry=registry)
+        result = engine.evaluate_integrity(TEXT, 'Dr_Snizhok')
+        registry.close()
+
+        reopened = self.open()
+        self.assertEqual(VeritasCore(registry=reopened).reputation_registry['Dr_Snizhok'],
+                         round(result['new_reputation'], 2))
+        self.assertEqual(reopened['Taiwan_Semi_Official'], 0.85)
+        reopened.close()
+
+    def test_multilingual_reputation_persists(self):
+        registry = self.open()
+        result = MultilingualVeritasCore(registry=registry).evaluate_integrity(TEXT, 'BBC')
+        registry.close()
+
+        reopened = self.open()
+        self.assertEqual(reopened['BBC'], round(result['reputation'], 2))
+        self.assertEqual(reopened['Unknown_Source'], 0.5)
+        reopened.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
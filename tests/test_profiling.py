@@ -0,0 +1,49 @@
+import json
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'veritas-news-analyzer' / 'app'))
+
+from veritas_calibrated_core import VeritasCalibratedEngine
+from veritas_profiling import NULL_TIMER, LatencyHistogram, StageTimer
+from translator import MultilingualVeritasCore
+
+TEXT = "Статистичний аналіз показав кореляцію 0.73 (p<0.01) між змінними A та B. ВАЖЛИВО!"
+
+
+class TestStageTimer(unittest.TestCase):
+    def test_calibrated_stages_recorded(self):
+        timer = StageTimer()
+        engine = VeritasCalibratedEngine(timer=timer)
+        for _ in range(3):
+            self.assertEqual(engine.analyze(TEXT), VeritasCalibratedEngine().analyze(TEXT))
+
+        snapshot = json.loads(timer.dump())
+        for stage in ('tokenization', 'language', 'markers', 'shannon', 'complexity',
+                      'sanity', 'number_density', 'shout', 'status', 'total'):
+            self.assertEqual(snapshot['stages'][stage]['count'], 3)
+        self.assertEqual(snapshot['input_chars']['analyze']['max'], len(TEXT))
+
+    def test_multilingual_stages_recorded(self):
+        timer = StageTimer()
+        result = MultilingualVeritasCore(timer=timer).evaluate_integrity(TEXT, 'Test')
+        self.assertEqual(result, MultilingualVeritasCore().evaluate_integrity(TEXT, 'Test'))
+        stages = timer.snapshot()['stages']
+        self.assertEqual(stages['markers']['count'], 1)
+        self.assertGreaterEqual(stages['total']['mean'], stages['markers']['mean'])
+
+    def test_null_timer_and_histogram(self):
+        with NULL_TIMER.stage('anything') as stage:
+            self.assertIs(stage, NULL_TIMER)
+        self.assertIsNone(VeritasCalibratedEngine().timer.record_size('analyze', 10))
+
+        histogram = LatencyHistogram()
+        for value in range(1, 1001):
+            histogram.add(value)
+        self.assertAlmostEqual(histogram.quantile(0.5), 500, delta=500 * 0.05)
+        self.assertAlmostEqual(histogram.quantile(0.99), 990, delta=990 * 0.05)
+
+
+if __name__ == '__main__':
+    unittest.main()
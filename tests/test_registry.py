@@ -0,0 +1,271 @@
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'veritas-news-analyzer' / 'app'))
+
+from veritas_core import VeritasCore
+from states import get_source_state
+from veritas_journal import JournaledRegistry
+import random
+
+from veritas_registry import ConcurrentRegistry, DecayingRegistry, ReputationIndex
+from translator import MultilingualVeritasCore
+
+TEXT = "Це ЗРАДА!!! Всі ПРОКИНЬТЕСЯ! Ганьба і катастрофа!"
+
+
+def run_threads(count, target):
+    threads = [threading.Thread(target=target, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+class TestConcurrentRegistry(unittest.TestCase):
+    def setUp(self):
+        # Часте перемикання потоків - максимум шансів на гонку
+        self.interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+
+    def tearDown(self):
+        sys.setswitchinterval(self.interval)
+
+    def test_no_lost_updates_under_contention(self):
+        for threads in (1, 8, 64):
+            registry = ConcurrentRegistry(stripes=4)
+            per_thread = 200
+
+            def worker(i):
+                for n in range(per_thread):
+                    registry.update(f'hot{n % 3}', lambda value: value + 1, 0)
+
+            run_threads(threads, worker)
+            self.assertEqual(sum(registry.values()), threads * per_thread, threads)
+
+    def test_apply_updates_is_atomic_batch(self):
+        registry = ConcurrentRegistry()
+
+        def worker(i):
+            for _ in range(20):
+                results = registry.apply_updates('BBC', [lambda value: value + 1] * 10, 0)
+                # Пакет бачить власні проміжні значення без чужих вставок
+                self.assertEqual([new - old for old, new in results], [1] * 10)
+                self.assertEqual(results[-1][1] - results[0][0], 10)
+
+        run_threads(32, worker)
+        self.assertEqual(registry['BBC'], 32 * 20 * 10)
+
+    def test_compare_and_set(self):
+        registry = ConcurrentRegistry({'BBC': 0.5})
+        self.assertTrue(registry.compare_and_set('BBC', 0.5, 0.6))
+        self.assertFalse(registry.compare_and_set('BBC', 0.5, 0.7))
+        self.assertTrue(registry.compare_and_set('RT', None, 0.1))
+        self.assertEqual(dict(registry), {'BBC': 0.6, 'RT': 0.1})
+
+    def test_multilingual_engine_matches_serial(self):
+        serial = MultilingualVeritasCore()
+        for _ in range(64 * 3):
+            expected = serial.evaluate_integrity(TEXT, 'Shared')
+        self.assertEqual(expected['reputation'], 0.0)
+
+        engine = MultilingualVeritasCore()
+        run_threads(64, lambda i: [engine.evaluate_integrity(TEXT, 'Shared') for _ in range(3)])
+        self.assertEqual(engine.reputation_registry, serial.reputation_registry)
+
+    def test_apply_scores_matches_sequential(self):
+        texts = [TEXT, "Факт: результат дорівнює 42, тому наказ виконано.", TEXT]
+        sequential = VeritasCore()
+        expected = [sequential.evaluate_integrity(text, 'BBC') for text in texts]
+        batched = VeritasCore()
+        self.assertEqual(batched.apply_scores('BBC', [batched.score_text(t) for t in texts]), expected)
+        self.assertEqual(batched.reputation_registry, sequential.reputation_registry)
+
+    def test_journaled_backend_under_threads(self):
+        with tempfile.TemporaryDirectory() as directory:
+            registry = ConcurrentRegistry(JournaledRegistry(directory))
+
+            def worker(i):
+                for n in range(50):
+                    registry.update(f'src{i}-{n % 5}', lambda value: value + 1, 0)
+
+            run_threads(16, worker)
+            registry.data.close()
+            reopened = JournaledRegistry(directory)
+            self.assertEqual(len(reopened), 16 * 5)
+            self.assertEqual(sum(reopened.values()), 16 * 50)
+            reopened.close()
+
+
+class ManualClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+DAY = 86400
+
+
+class TestDecayingRegistry(unittest.TestCase):
+    def test_decays_toward_default_on_read(self):
+        clock = ManualClock()
+        registry = DecayingRegistry({'RT': 0.1, 'BBC': 0.9}, half_life=30 * DAY, clock=clock)
+        self.assertEqual(registry['RT'], 0.1)
+        clock.now += 30 * DAY
+        self.assertAlmostEqual(registry['RT'], 0.3)
+        self.assertAlmostEqual(registry.get('BBC'), 0.7)
+        self.assertIsNone(registry.get('missing'))
+        # Сховище не переписується при читанні
+        self.assertEqual(registry.data['RT'], 0.1)
+
+    def test_update_starts_from_decayed_value(self):
+        clock = ManualClock()
+        registry = DecayingRegistry({'RT': 0.1}, half_life=10 * DAY, clock=clock)
+        clock.now += 10 * DAY
+        old, new = registry.update('RT', lambda rep: round(rep - 0.1, 2), 0.5)
+        self.assertAlmostEqual(old, 0.3)
+        self.assertEqual(new, 0.2)
+        self.assertEqual(registry['RT'], 0.2)
+        self.assertEqual(registry.updated_at('RT'), clock.now)
+
+    def test_bulk_decay_matches_scalar(self):
+        clock = ManualClock()
+        registry = DecayingRegistry(half_life=7 * DAY, clock=clock)
+        for i in range(200):
+            clock.now += 3600
+            registry[f'src{i}'] = i / 200
+        clock.now += DAY
+        bulk = registry.decayed()
+        self.assertEqual(set(bulk), set(registry))
+        for name, value in bulk.items():
+            self.assertAlmostEqual(value, registry[name], places=12)
+        self.assertEqual(set(registry.decayed(['src1', 'missing'])), {'src1'})
+
+    def test_journaled_timestamps_survive_restart(self):
+        clock = ManualClock()
+        with tempfile.TemporaryDirectory() as directory:
+            registry = DecayingRegistry(JournaledRegistry(directory), half_life=DAY, clock=clock)
+            registry['RT'] = 0.1
+            del registry['RT']
+            registry['RT'] = 0.1
+            registry['BBC'] = 0.9
+            registry.data.close()
+
+            clock.now += DAY
+            reopened = DecayingRegistry(JournaledRegistry(directory), half_life=DAY, clock=clock)
+            self.assertAlmostEqual(reopened['RT'], 0.3)
+            bulk = reopened.decayed()
+            self.assertEqual(set(bulk), {'RT', 'BBC'})
+            self.assertAlmostEqual(bulk['BBC'], 0.7)
+            reopened.data.close()
+
+    def test_states_see_decayed_reputation(self):
+        clock = ManualClock()
+        registry = DecayingRegistry(half_life=30 * DAY, clock=clock)
+        engine = VeritasCore(registry=registry)
+        self.assertIs(engine.reputation_registry, registry)
+        self.assertEqual(engine.get_system_state('Prosecutor_Council_UA'), 'SYSTEMIC_FATIGUE')
+        self.assertEqual(get_source_state(registry, 'Ethical_Council_UA'), 'STABLE_TRUST')
+        self.assertEqual(engine.get_system_state('Dr_Snizhok'), 'LAMINAR_FLOW')
+        clock.now += 90 * DAY
+        self.assertEqual(engine.get_system_state('Dr_Snizhok'), 'SYSTEMIC_FATIGUE')
+        self.assertEqual(get_source_state(registry, 'Ethical_Council_UA'), 'WARNING')
+
+    def test_multilingual_config_enables_decay(self):
+        engine = MultilingualVeritasCore({'reputation_decay': {'half_life_days': 30},
+                                          'default_reputation': 0.5})
+        self.assertIsInstance(engine.reputation_registry, DecayingRegistry)
+        self.assertIsInstance(MultilingualVeritasCore().reputation_registry, ConcurrentRegistry)
+        self.assertNotIsInstance(MultilingualVeritasCore().reputation_registry, DecayingRegistry)
+
+
+class TestReputationIndex(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(3)
+        self.values = {f'src{i}': round(rng.random(), 2) for i in range(2000)}
+        self.registry = ConcurrentRegistry(dict(self.values), index=ReputationIndex())
+
+    def expected(self, descending=True):
+        return sorted(self.values.items(), key=lambda item: (-item[1], item[0]) if descending
+                      else (item[1], item[0]))
+
+    def test_top_and_bottom_k_with_offset(self):
+        index = self.registry.index
+        self.assertEqual(index.top_k(25), self.expected()[:25])
+        self.assertEqual(index.top_k(25, offset=500), self.expected()[500:525])
+        self.assertEqual(index.bottom_k(10, offset=1990), self.expected(False)[1990:])
+
+    def test_incremental_updates(self):
+        self.registry['src0'] = 1.0
+        self.registry.update('src1', lambda value: 0.0, 0.5)
+        del self.registry['src2']
+        self.values.update({'src0': 1.0, 'src1': 0.0})
+        del self.values['src2']
+        self.assertEqual(self.registry.index.top_k(5), self.expected()[:5])
+        self.assertEqual(self.registry.index.bottom_k(5), self.expected(False)[:5])
+        self.assertEqual(len(self.registry.index), 1999)
+
+    def test_range_and_quantile(self):
+        index = self.registry.index
+        expected = [item for item in self.expected(False) if 0.25 <= item[1] <= 0.3]
+        self.assertEqual(index.range(0.25, 0.3, limit=10_000), expected)
+        self.assertEqual(index.range(0.25, 0.3, offset=5, limit=7), expected[5:12])
+        ordered = sorted(self.values.values())
+        for q in (0.0, 0.1, 0.5, 0.99, 1.0):
+            self.assertEqual(index.quantile(q), ordered[int(q * (len(ordered) - 1))])
+        self.assertIsNone(ReputationIndex().quantile(0.5))
+
+    def test_pages_through_tied_hot_bucket(self):
+        # Більшість джерел на репутації за замовчуванням - один кошик
+        values = {f'src{i:05d}': 0.5 if i % 10 else round(i / 20000, 3) for i in range(20000)}
+        index = ReputationIndex()
+        for name, value in values.items():
+            index.update(name, value)
+        for name in list(values)[::7]:
+            values[name] = 0.5
+            index.update(name, 0.5)
+        ordered = sorted(values.items(), key=lambda item: (-item[1], item[0]))
+        for offset in (0, 990, 1500, 12345, 19995):
+            self.assertEqual(index.top_k(10, offset=offset), ordered[offset:offset + 10])
+        ties = sorted(name for name, value in values.items() if value == 0.5)
+        self.assertEqual(index.range(0.5, 0.5, offset=5000, limit=10),
+                         [(name, 0.5) for name in ties[5000:5010]])
+        self.assertEqual(index.quantile(0.5), sorted(values.values())[9999])
+
+    def test_half_life_rejects_wrapped_registry(self):
+        registry = ConcurrentRegistry({'BBC': 0.9})
+        with self.assertRaises(ValueError):
+            VeritasCore(registry=registry, half_life=DAY)
+        with self.assertRaises(ValueError):
+            MultilingualVeritasCore({'reputation_decay': {'half_life_days': 30}}, registry=registry)
+        self.assertNotIn('Dr_Snizhok', registry)
+        decaying = DecayingRegistry(half_life=DAY)
+        self.assertIs(VeritasCore(registry=decaying).reputation_registry, decaying)
+
+    def test_shipped_config_has_no_decay(self):
+        import yaml
+        config = yaml.safe_load((Path(__file__).parent.parent / 'veritas-news-analyzer' / 'config.yaml')
+                                .read_text(encoding='utf-8'))['veritas']
+        self.assertNotIn('reputation_decay', config)
+        self.assertNotIsInstance(MultilingualVeritasCore(config).reputation_registry, DecayingRegistry)
+
+    def test_decaying_engines_are_not_indexed(self):
+        engine = VeritasCore(half_life=DAY)
+        self.assertIsNone(engine.reputation_registry.index)
+        engine = MultilingualVeritasCore({'reputation_decay': {'half_life_days': 30}})
+        self.assertIsNone(engine.reputation_registry.index)
+
+    def test_engine_registry_is_indexed(self):
+        engine = VeritasCore()
+        engine.evaluate_integrity(TEXT, 'Dr_Snizhok')
+        top = engine.reputation_registry.index.top_k(2)
+        self.assertEqual(top, sorted(engine.reputation_registry.items(), key=lambda item: -item[1])[:2])
+
+
+if __name__ == '__main__':
+    unittest.main()
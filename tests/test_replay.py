@@ -0,0 +1,117 @@
+import json
+import random
+import sys
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'veritas-news-analyzer' / 'app'))
+
+from database import VeritasDatabase
+from veritas_journal import JournaledRegistry
+from veritas_replay import (load_database, load_log, make_replay_engine, replay_parallel, replay_serial,
+                           write_database, write_journal)
+
+TEXTS = [
+    "Факт: результат дорівнює 42, тому наказ виконано.",
+    "Це ЗРАДА!!! Всі ПРОКИНЬТЕСЯ! Ганьба і катастрофа!",
+    "The study found a correlation of 0.73 (p<0.01) between the variables."
+]
+
+
+def make_records(count, sources, seed=7):
+    rng = random.Random(seed)
+    start = datetime(2026, 1, 1)
+    records = []
+    for i in range(count):
+        records.append({
+            'id': i,
+            # Однакові мітки часу - порядок вирішує id
+            'timestamp': (start + timedelta(minutes=rng.randrange(count // 2))).isoformat(),
+            'source': f'src{rng.randrange(sources)}',
+            'language': 'uk',
+            'entropy_index': round(rng.random(), 3),
+            'diagnostics': {}
+        })
+    rng.shuffle(records)
+    return records
+
+
+class TestReplay(unittest.TestCase):
+    def test_parallel_matches_serial_bitwise(self):
+        records = make_records(3000, 40)
+        config = {'slashing': {'penalty_multiplier': 0.27, 'reward_bonus': 0.03}}
+        serial = replay_serial(records, config=config)
+        for workers in (1, 3):
+            parallel = replay_parallel(records, config=config, workers=workers, task_records=200)
+            self.assertEqual(json.dumps(parallel, sort_keys=True), json.dumps(serial, sort_keys=True))
+        self.assertEqual(len(serial), 41)
+
+    def test_core_engine(self):
+        records = make_records(500, 5)
+        self.assertEqual(replay_parallel(records, 'core', workers=2, task_records=50),
+                         replay_serial(records, 'core'))
+
+    def test_core_engine_rejects_config(self):
+        with self.assertRaises(ValueError):
+            make_replay_engine('core', {'slashing': {'penalty_multiplier': 0.3}})
+
+    def test_write_back(self):
+        records = make_records(300, 4)
+        registry = replay_parallel(records, workers=1)
+        with tempfile.TemporaryDirectory() as directory:
+            path = str(Path(directory) / 'veritas.db')
+            db = VeritasDatabase(path)
+            db.save_analysis({'content': {'source': 'src0'},
+                              'veritas_analysis': {'reputation': 0.99, 'entropy_index': 0.1}})
+            db.save_analysis({'content': {'source': 'Untouched'},
+                              'veritas_analysis': {'reputation': 0.42, 'entropy_index': 0.1}})
+            db.close()
+            write_database(path, registry, records)
+            db = VeritasDatabase(path)
+            row = db.get_source_reputation('src0')
+            self.assertEqual(row['reputation'], registry['src0'])
+            self.assertEqual(row['total_analyses'], sum(r['source'] == 'src0' for r in records))
+            self.assertEqual(db.get_source_reputation('Untouched')['reputation'], 0.42)
+            self.assertEqual(len(db.get_all_sources()), len(registry) + 1)
+            self.assertEqual(db.get_reputation_quantiles([1.0])[1.0], max(max(registry.values()), 0.42))
+            db.close()
+
+            journal_dir = str(Path(directory) / 'reputation')
+            journaled = JournaledRegistry(journal_dir)
+            journaled['Stale'] = 0.3
+            journaled.close()
+            write_journal(journal_dir, registry)
+            journaled = JournaledRegistry(journal_dir)
+            self.assertEqual(dict(journaled), registry)
+            journaled.close()
+
+    def test_database_source(self):
+        with tempfile.TemporaryDirectory() as directory:
+            db = VeritasDatabase(str(Path(directory) / 'veritas.db'))
+            for i, text in enumerate(TEXTS * 3):
+                db.save_analysis({
+                    'timestamp': datetime(2026, 1, 1, 0, i).isoformat(),
+                    'content': {'source': f'site{i % 2}'},
+                    'veritas_analysis': {'language': 'uk', 'entropy_index': 0.1 * i,
+                                         'reputation': 0.5, 'diagnostics': {'words': i}}
+                })
+            db.close()
+            records = list(load_database(str(Path(directory) / 'veritas.db')))
+        self.assertEqual(len(records), 9)
+        self.assertEqual(records[1]['diagnostics'], {'words': 1})
+        self.assertEqual(replay_parallel(records, workers=2), replay_serial(records))
+
+    def test_text_log_is_rescored(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / 'log.jsonl'
+            lines = [json.dumps({'timestamp': f'2026-01-01T00:00:0{i}', 'source': f's{i % 2}', 'text': text},
+                                ensure_ascii=False) for i, text in enumerate(TEXTS * 2)]
+            path.write_text('\n'.join(lines), encoding='utf-8')
+            records = list(load_log(str(path)))
+        self.assertEqual(replay_parallel(records, workers=1), replay_serial(records))
+
+
+if __name__ == '__main__':
+    unittest.main()
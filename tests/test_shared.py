@@ -0,0 +1,134 @@
+import os
+import struct
+import sys
+import unittest
+import uuid
+import warnings
+from multiprocessing import get_context
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from veritas_core import VeritasCore
+from veritas_shared import SharedReputationTable, TableFullError
+
+
+def _increment_worker(name, count):
+    table = SharedReputationTable(name)
+    for _ in range(count):
+        table.update('hot', lambda value: value + 1, 0.0)
+    table['worker-%d' % os.getpid()] = 1.0
+    table.close()
+
+
+def _increment_inherited(table, count):
+    # Об'єкт таблиці успадковано через fork, без повторного підключення
+    for _ in range(count):
+        table.update('hot', lambda value: value + 1, 0.0)
+
+
+class TestSharedReputationTable(unittest.TestCase):
+    def setUp(self):
+        self.name = f"veritas-test-{uuid.uuid4().hex[:12]}"
+        self.table = SharedReputationTable(self.name, capacity=1024, name_bytes=30)
+
+    def tearDown(self):
+        self.table.close()
+        self.table.unlink()
+
+    def test_mapping_semantics(self):
+        self.table['BBC'] = 0.62
+        self.table['Київ'] = 0.4
+        self.assertEqual(self.table['BBC'], 0.62)
+        self.assertEqual(len(self.table), 2)
+        del self.table['BBC']
+        self.assertNotIn('BBC', self.table)
+        self.assertIsNone(self.table.get('BBC'))
+        with self.assertRaises(KeyError):
+            self.table['BBC']
+        self.table['BBC'] = 0.7
+        self.assertEqual(dict(self.table), {'Київ': 0.4, 'BBC': 0.7})
+
+    def test_attached_table_sees_writes(self):
+        other = SharedReputationTable(self.name)
+        self.assertEqual(other.capacity, 1024)
+        self.table['RT'] = 0.1
+        self.assertEqual(other['RT'], 0.1)
+        other.update('RT', lambda value: value + 0.2, 0.5)
+        self.assertAlmostEqual(self.table['RT'], 0.3)
+        self.assertIsNotNone(self.table.updated_at('RT'))
+        other.close()
+
+    def test_no_lost_updates_across_processes(self):
+        context = get_context('spawn')
+        workers = [context.Process(target=_increment_worker, args=(self.name, 200)) for _ in range(4)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+            self.assertEqual(worker.exitcode, 0)
+        self.assertEqual(self.table['hot'], 800)
+        self.assertEqual(len(self.table), 5)
+
+    @unittest.skipUnless(hasattr(os, 'fork'), "fork start method is POSIX-only")
+    def test_no_lost_updates_across_forked_workers(self):
+        context = get_context('fork')
+        workers = [context.Process(target=_increment_inherited, args=(self.table, 5000)) for _ in range(4)]
+        # fork під захопленим блокуванням: діти не успадковують його стан
+        with self.table._lock:
+            for worker in workers:
+                worker.start()
+        for worker in workers:
+            worker.join(60)
+            self.assertEqual(worker.exitcode, 0)
+        self.assertEqual(self.table['hot'], 20000)
+
+    def test_limits(self):
+        with self.assertRaises(ValueError):
+            self.table['x' * 31] = 0.5
+        self.assertIsNone(self.table.get('x' * 31))
+        with self.assertRaises(MemoryError):
+            for i in range(1024):
+                self.table[f'src{i}'] = 0.5
+        self.assertEqual(len(self.table), int(1024 * 0.9))
+
+    def test_full_table_drops_engine_updates(self):
+        table = SharedReputationTable(self.name, drop_when_full=True)
+        for i in range(int(1024 * 0.9)):
+            table[f'src{i}'] = 0.5
+        with self.assertRaises(TableFullError):
+            table.store('explicit', 0.5)
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            engine = VeritasCore(registry=table)
+            result = engine.evaluate_integrity("Факт: результат дорівнює 42.", 'Overflow')
+        self.assertIn('new_reputation', result)
+        self.assertNotIn('Overflow', table)
+        self.assertGreater(table.dropped, 0)
+        self.assertTrue(any(issubclass(w.category, RuntimeWarning) for w in caught))
+        table.close()
+
+    def test_reader_repairs_seq_left_by_dead_writer(self):
+        self.table['BBC'] = 0.62
+        offset = self.table._offset(self.table._find('BBC'))
+        seq = struct.unpack_from('<Q', self.table._buf, offset)[0]
+        struct.pack_into('<Q', self.table._buf, offset, seq + 1)
+        other = SharedReputationTable(self.name)
+        self.assertEqual(other['BBC'], 0.62)
+        self.assertEqual(struct.unpack_from('<Q', self.table._buf, offset)[0], seq + 2)
+        self.table.update('BBC', lambda value: value + 0.1)
+        self.assertAlmostEqual(other['BBC'], 0.72)
+        other.close()
+
+    def test_engine_uses_shared_table(self):
+        engine = VeritasCore(registry=self.table)
+        self.assertIs(engine.reputation_registry, self.table)
+        result = engine.evaluate_integrity("Факт: результат дорівнює 42.", 'Dr_Snizhok')
+        other = SharedReputationTable(self.name)
+        self.assertEqual(other['Dr_Snizhok'], round(result['new_reputation'], 2))
+        self.assertEqual(VeritasCore(registry=other).get_system_state('Dr_Snizhok'), 'LAMINAR_FLOW')
+        other.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
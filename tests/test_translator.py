@@ -0,0 +1,32 @@
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'veritas-news-analyzer' / 'app'))
+
+from translator import MarkerAutomaton, MultilingualVeritasCore
+
+
+class TestMarkerAutomaton(unittest.TestCase):
+    def test_matches_substring_semantics(self):
+        classes = {
+            'chaos': {'змова', 'lizard'},
+            'noise': {'важливо', 'паніка', 'ніка'},
+            'signal': {'дані', 'факт', 'ані'}
+        }
+        words = ['змова', 'надзвичайноважливо', 'паніка', 'даними', 'факти', 'lizards', 'ніщо', 'дані']
+        expected = {
+            name: sum(1 for w in words if any(m in w for m in markers))
+            for name, markers in classes.items()
+        }
+        self.assertEqual(MarkerAutomaton(classes).count_words(words), expected)
+
+    def test_entropy_coefficient(self):
+        core = MultilingualVeritasCore()
+        self.assertEqual(core._calculate_entropy_coefficient("Рептилоїди контролюють світ", 'uk'), 0.99)
+        text = "Якщо результат дорівнює нулю, тоді важливо перевірити дані."
+        self.assertEqual(core._calculate_entropy_coefficient(text, 'uk'), 0.333)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,176 @@
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'veritas-news-analyzer' / 'app'))
+
+from database import VeritasDatabase
+from states import get_source_state
+from veritas_registry import DecayingRegistry
+from veritas_trust import CitationExtractor, TrustGraph, site_key
+
+
+def analysis(source, reputation, title='', preview='', url='', **content):
+    content.update({'source': source, 'title': title, 'text_preview': preview})
+    return {'url': url, 'content': content,
+            'veritas_analysis': {'entropy_index': 0.3, 'reputation': reputation, 'status': 'X'}}
+
+
+class TestTrustGraph(unittest.TestCase):
+    def setUp(self):
+        self.graph = TrustGraph(damping=0.8, tol=1e-12)
+        for source, reputation in {'BBC': 0.9, 'Mid': 0.7, 'Bot': 0.1}.items():
+            self.graph.set_reputation(source, reputation)
+
+    def test_laundering_drags_amplifier_down(self):
+        self.graph.add_edges([('Mid', 'Bot', 3), ('Mid', 'BBC')])
+        self.graph.propagate()
+        # 0.2 * 0.7 + 0.8 * (0.75 * 0.1 + 0.25 * 0.9)
+        self.assertAlmostEqual(self.graph['Mid'], 0.38)
+        self.assertEqual(self.graph['Bot'], 0.1)
+        self.assertEqual(self.graph['BBC'], 0.9)
+        self.assertEqual(self.graph.reputation('Mid'), 0.7)
+        self.assertEqual(self.graph.most_discounted(5), [('Mid', 0.7, self.graph['Mid'])])
+
+    def test_citing_reputable_sources_never_raises_trust(self):
+        self.graph.add_edge('Bot', 'BBC', 10)
+        self.graph.propagate()
+        self.assertEqual(self.graph['Bot'], 0.1)
+
+    def test_distrust_flows_along_chains(self):
+        self.graph.add_edges([('New', 'Mid'), ('Mid', 'Bot')])
+        self.graph.propagate()
+        mid = 0.2 * 0.7 + 0.8 * 0.1
+        self.assertAlmostEqual(self.graph['Mid'], mid)
+        self.assertAlmostEqual(self.graph['New'], 0.2 * 0.5 + 0.8 * mid)
+
+    def test_duplicate_edges_are_summed(self):
+        self.graph.add_edges([('Mid', 'Bot'), ('Mid', 'Bot'), ('Mid', 'Bot'), ('Mid', 'BBC')])
+        self.graph.propagate()
+        self.assertEqual(self.graph.edge_count, 2)
+        self.assertAlmostEqual(self.graph['Mid'], 0.38)
+
+    def test_warm_start_matches_cold_solution(self):
+        rng = np.random.default_rng(7)
+        graph = TrustGraph(tol=1e-12)
+        for i, reputation in enumerate(rng.random(2000)):
+            graph.set_reputation(f'src{i}', reputation)
+        graph.add_edge_arrays(rng.integers(0, 2000, 20000), rng.integers(0, 2000, 20000))
+        cold_iterations = graph.propagate()
+
+        graph.add_edge_arrays(rng.integers(0, 2000, 50), rng.integers(0, 2000, 50), np.full(50, 2.0))
+        graph.add_edge('src1', 'late')
+        warm_iterations = graph.propagate()
+        warm = dict(graph)
+        graph.propagate(warm_start=False)
+        for source, trust in graph.items():
+            self.assertAlmostEqual(warm[source], trust, places=9)
+        self.assertLess(warm_iterations, cold_iterations)
+        self.assertEqual(len(graph), 2001)
+
+    def test_incremental_merge_matches_single_build(self):
+        rng = np.random.default_rng(3)
+        batches = [(rng.integers(0, 300, 2000), rng.integers(0, 300, 2000), rng.integers(1, 4, 2000))
+                   for _ in range(4)]
+        incremental, single = TrustGraph(), TrustGraph()
+        for graph in (incremental, single):
+            for i in range(300):
+                graph.set_reputation(f'src{i}', i / 300)
+        for batch in batches:
+            incremental.add_edge_arrays(*batch)
+            incremental.propagate()
+            single.add_edge_arrays(*batch)
+        single.propagate()
+        np.testing.assert_array_equal(incremental._indptr, single._indptr)
+        np.testing.assert_array_equal(incremental._indices, single._indices)
+        np.testing.assert_array_equal(incremental._weights, single._weights)
+        np.testing.assert_allclose(incremental._out, single._out)
+
+    def test_edge_validation(self):
+        with self.assertRaises(ValueError):
+            self.graph.add_edge('Mid', 'Bot', 0)
+        with self.assertRaises(IndexError):
+            self.graph.add_edge_arrays([0], [99])
+        self.graph.add_edge('Mid', 'Mid')
+        self.assertEqual(self.graph.edge_count, 0)
+
+    def test_readable_by_states(self):
+        self.graph.add_edge('Mid', 'Bot')
+        self.assertEqual(self.graph.action_protocol('Mid')['state'], 'MONITORED')
+        self.graph.propagate()
+        protocol = self.graph.action_protocol('Mid')
+        self.assertEqual(protocol['state'], 'CRITICAL')
+        self.assertEqual(protocol['reputation'], self.graph['Mid'])
+        self.assertEqual(get_source_state(self.graph, 'Mid'), 'CRITICAL')
+        self.assertEqual(self.graph.action_protocol('missing')['state'], 'WARNING')
+
+    def test_reputations_from_decaying_registry(self):
+        registry = DecayingRegistry({'Bot': 0.1}, half_life=1.0, clock=lambda: 0.0)
+        self.graph.set_reputations(registry)
+        self.assertEqual(self.graph.reputation('Bot'), 0.1)
+
+
+class TestCitations(unittest.TestCase):
+    def test_names_domains_and_links(self):
+        extractor = CitationExtractor()
+        extractor.add_source('Kyiv Post', 'https://www.kyivpost.com/post/1')
+        extractor.add_source('Dr_Snizhok')
+        extractor.add_source('Unknown')
+        extractor.add_source('BBC', 'https://bbc.co.uk/news/1')
+        cited = extractor.citations('Mid', [
+            'As the KYIV POST reported, Dr_Snizhok said', 'see https://news.bbc.co.uk/x; unknown'])
+        self.assertEqual(cited, {'Kyiv Post', 'BBC', 'Dr_Snizhok'})
+        self.assertEqual(extractor.citations('BBC', [], ['https://kyivpost.com/a', 'BBC']), {'Kyiv Post'})
+
+    def test_platform_links_need_account_match(self):
+        extractor = CitationExtractor()
+        extractor.add_source('Channel A', 'https://t.me/chan_a/12')
+        extractor.add_source('Channel B', 'https://t.me/s/chan_b/5')
+        extractor.add_source('Blog One', 'https://one.blogspot.com/2024/post')
+        self.assertEqual(extractor.citations('Mid', ['via https://t.me/chan_b/99.']), {'Channel B'})
+        self.assertEqual(extractor.citations('Mid', ['https://t.me/other/1 https://t.me/']), set())
+        self.assertEqual(extractor.citations('Mid', ['https://two.blogspot.com/x']), set())
+        self.assertEqual(extractor.citations('Mid', [], ['https://one.blogspot.com/y']), {'Blog One'})
+
+    def test_shared_site_is_not_attributed(self):
+        extractor = CitationExtractor()
+        extractor.add_source('BBC', 'https://www.bbc.co.uk/news/1')
+        extractor.add_source('Wire A', 'https://news-hub.example/a')
+        extractor.add_source('Wire B', 'https://news-hub.example/b')
+        self.assertEqual(extractor.citations('Mid', ['https://sport.bbc.co.uk/x https://evil.co.uk/y']),
+                         {'BBC'})
+        self.assertEqual(extractor.citations('Mid', ['https://news-hub.example/a/2']), set())
+        self.assertEqual(site_key('https://youtube.com/c/SomeChannel/videos'), 'youtube.com/somechannel')
+        self.assertIsNone(site_key('https://co.uk/'))
+
+    def test_graph_from_database(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'veritas.db')
+            db = VeritasDatabase(path)
+            db.save_analysis(analysis('Mid_Outlet', 0.7, 'Exclusive via Shady_Wire',
+                                      'Shady_Wire sources claim...', 'https://mid.example/1'))
+            db.save_analysis(analysis('Mid_Outlet', 0.7, preview='Per https://shady.example/x',
+                                      citations=['Shady_Wire']))
+            db.save_analysis(analysis('Shady_Wire', 0.1, 'Wake up', url='https://shady.example/2'))
+            db.save_analysis(analysis('Calm_Daily', 0.8, 'Weather'))
+            db.close()
+
+            graph = TrustGraph.from_database(path, damping=0.8)
+            graph.propagate()
+            self.assertEqual(graph.edge_count, 1)
+            self.assertAlmostEqual(graph['Mid_Outlet'], 0.2 * 0.7 + 0.8 * 0.1)
+            self.assertEqual(graph['Calm_Daily'], 0.8)
+            self.assertEqual(graph.action_protocol('Mid_Outlet')['state'], 'CRITICAL')
+
+            registry = {'Mid_Outlet': 0.9, 'Shady_Wire': 0.9}
+            graph = TrustGraph.from_database(path, registry=registry)
+            graph.propagate()
+            self.assertAlmostEqual(graph['Mid_Outlet'], 0.9)
+
+
+if __name__ == '__main__':
+    unittest.main()
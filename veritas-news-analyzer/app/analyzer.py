@@ -1,5 +1,6 @@
 import re
 import math
+from collections import Counter
 from typing import Dict, List
 
 class VeritasAnalyzer:
@@ -18,17 +19,23 @@ class VeritasAnalyzer:
         words = re.findall(r'\w+', text)
         sentences = re.split(r'[.!?]+', text)
         sentences = [s.strip() for s in sentences if len(s.strip()) > 2]
+        return self.analyze_tokens(words, sentences, text.lower())
 
+    def analyze_tokens(self, words: List[str], sentences: List[str], text_lower: str) -> Dict:
+        """Метрики з уже розбитого тексту (слова \\w+, речення, text.lower())"""
         # 1. Покращений Shout Factor (ігноруємо короткі абревіатури AI, DNA тощо)
         # Рахуємо як крик тільки довгі слова CAPS
-        caps_words = [w for w in words if w.isupper() and len(w) > 4 and not any(d.isdigit() for d in w)]
-        shout_factor = len(caps_words) / (len(words) + 1)
+        # (перевіряємо кожне унікальне слово один раз)
+        word_counts = Counter(words)
+        caps_words = sum(n for w, n in word_counts.items()
+                         if w.isupper() and len(w) > 4 and not any(d.isdigit() for d in w))
+        shout_factor = caps_words / (len(words) + 1)
 
         # 2. Семантична перевірка (Sanity Check)
-        sanity_index = self._check_sanity(text.lower())
+        sanity_index = self._check_sanity(text_lower)
 
         # 3. Розрахунок складності (Linguistic Complexity)
-        unique_words = len(set([w.lower() for w in words]))
+        unique_words = len({w.lower() for w in word_counts})
         complexity = unique_words / len(words) if words else 0
 
         # Повертаємо повний набір метрик для Engine
@@ -5,11 +5,30 @@ SQLite база для зберігання результатів аналіз
 
 import sqlite3
 import json
+from bisect import bisect_right
 from datetime import datetime
 from typing import Dict, List, Optional
 from pathlib import Path
 
 
+# Часові ряди репутації/ентропії джерел: резолюція -> (ширина кошика в секундах, місткість кільця)
+# raw - кожен аналіз окремо; hourly/daily - агрегати (остання репутація, середня ентропія)
+SERIES_RESOLUTIONS = {
+    'raw': (0, 256),
+    'hourly': (3600, 24 * 14),
+    'daily': (86400, 365 * 2)
+}
+
+
+# Гістограма репутацій для квантилів: нижні межі кошиків
+# (останній кошик відкритий догори)
+REPUTATION_BOUNDS = [i / 1000 for i in range(1000)]
+
+
+def _reputation_bucket(reputation: float) -> int:
+    return max(bisect_right(REPUTATION_BOUNDS, reputation) - 1, 0)
+
+
 class VeritasDatabase:
     """
     Управління базою даних для зберігання результатів аналізу
@@ -61,7 +80,46 @@ class VeritasDatabase:
             )
         """)
         
+        # Часові ряди джерел: кільцеві буфери фіксованої місткості
+        # (slot = head % місткість), тож історія не росте і не вимагає
+        # розбору analyses.full_data
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS source_series (
+                source TEXT NOT NULL,
+                resolution TEXT NOT NULL,
+                slot INTEGER NOT NULL,
+                bucket REAL NOT NULL,
+                reputation REAL NOT NULL,
+                entropy_sum REAL NOT NULL,
+                count INTEGER NOT NULL,
+                PRIMARY KEY (source, resolution, slot)
+            ) WITHOUT ROWID
+        """)
+        
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS series_head (
+                source TEXT NOT NULL,
+                resolution TEXT NOT NULL,
+                head INTEGER NOT NULL,
+                bucket REAL NOT NULL,
+                PRIMARY KEY (source, resolution)
+            ) WITHOUT ROWID
+        """)
+        
+        # Кількість джерел по кошиках репутації (квантилі без сканування)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS reputation_histogram (
+                bucket INTEGER PRIMARY KEY,
+                count INTEGER NOT NULL
+            )
+        """)
+        
         # Індекси для швидшого пошуку
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_reputation
+            ON source_reputation(reputation, source)
+        """)
+        
         cursor.execute("""
             CREATE INDEX IF NOT EXISTS idx_timestamp 
             ON analyses(timestamp)
@@ -77,6 +135,16 @@ class VeritasDatabase:
             ON analyses(status)
         """)
         
+        # Одноразова побудова гістограми для бази, створеної до її появи
+        cursor.execute("SELECT 1 FROM reputation_histogram LIMIT 1")
+        if cursor.fetchone() is None:
+            counts = {}
+            for row in cursor.execute("SELECT reputation FROM source_reputation"):
+                bucket = _reputation_bucket(row['reputation'])
+                counts[bucket] = counts.get(bucket, 0) + 1
+            cursor.executemany("INSERT INTO reputation_histogram (bucket, count) VALUES (?, ?)",
+                               counts.items())
+        
         self.conn.commit()
     
     def save_analysis(self, analysis: Dict) -> int:
@@ -123,12 +191,32 @@ class VeritasDatabase:
             v.get('reputation', 0.0)
         )
         
+        # Точка часового ряду джерела
+        timestamp = analysis.get('timestamp')
+        self.append_series(
+            c.get('source', 'Unknown'),
+            v.get('reputation', 0.0),
+            v.get('entropy_index', 0.0),
+            datetime.fromisoformat(timestamp).timestamp() if timestamp else None
+        )
+        
         return cursor.lastrowid
     
     def _update_source_reputation(self, source: str, reputation: float):
-        """Оновлює репутацію джерела"""
+        """Оновлює репутацію джерела (і гістограму репутацій)"""
         cursor = self.conn.cursor()
         
+        cursor.execute("SELECT reputation FROM source_reputation WHERE source = ?", (source,))
+        old = cursor.fetchone()
+        if old is not None:
+            cursor.execute("""
+                UPDATE reputation_histogram SET count = count - 1 WHERE bucket = ?
+            """, (_reputation_bucket(old['reputation']),))
+        cursor.execute("""
+            INSERT INTO reputation_histogram (bucket, count) VALUES (?, 1)
+            ON CONFLICT(bucket) DO UPDATE SET count = count + 1
+        """, (_reputation_bucket(reputation),))
+        
         cursor.execute("""
             INSERT INTO source_reputation (source, reputation, total_analyses, last_updated)
             VALUES (?, ?, 1, ?)
@@ -145,6 +233,122 @@ class VeritasDatabase:
         ))
         
         self.conn.commit()
+
+    def replace_reputations(self, reputations: Dict[str, float],
+                            counts: Optional[Dict[str, int]] = None):
+        """
+        Записує перебудований реєстр (veritas_replay) однією транзакцією
+
+        Гістограма репутацій перераховується в тій самій транзакції;
+        джерела, яких немає в reputations, не змінюються.
+
+        Args:
+            reputations: Джерело -> репутація
+            counts: Джерело -> кількість аналізів (default - без змін,
+                    0 для нових джерел)
+        """
+        now = datetime.now().isoformat()
+        counts = counts or {}
+        with self.conn:
+            cursor = self.conn.cursor()
+            cursor.executemany("""
+                INSERT INTO source_reputation (source, reputation, total_analyses, last_updated)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(source) DO UPDATE SET
+                    reputation = excluded.reputation,
+                    total_analyses = COALESCE(?, total_analyses),
+                    last_updated = excluded.last_updated
+            """, ((source, reputation, counts.get(source, 0), now, counts.get(source))
+                  for source, reputation in reputations.items()))
+
+            histogram = {}
+            for row in cursor.execute("SELECT reputation FROM source_reputation"):
+                bucket = _reputation_bucket(row['reputation'])
+                histogram[bucket] = histogram.get(bucket, 0) + 1
+            cursor.execute("DELETE FROM reputation_histogram")
+            cursor.executemany("INSERT INTO reputation_histogram (bucket, count) VALUES (?, ?)",
+                               histogram.items())
+
+    def append_series(self, source: str, reputation: float, entropy: float,
+                      timestamp: Optional[float] = None):
+        """
+        Додає точку в часові ряди джерела (усі резолюції), O(1)
+        
+        Args:
+            source: Назва джерела
+            reputation: Репутація після аналізу
+            entropy: Індекс ентропії
+            timestamp: Unix-час (default - зараз); запізнілі точки
+                       агрегуються в поточний кошик
+        """
+        if timestamp is None:
+            timestamp = datetime.now().timestamp()
+        cursor = self.conn.cursor()
+        
+        for resolution, (width, capacity) in SERIES_RESOLUTIONS.items():
+            bucket = timestamp - timestamp % width if width else timestamp
+            cursor.execute("""
+                SELECT head, bucket FROM series_head
+                WHERE source = ? AND resolution = ?
+            """, (source, resolution))
+            row = cursor.fetchone()
+            head = row['head'] if row else 0
+            
+            if row and width and bucket <= row['bucket']:
+                # Той самий (або запізнілий) кошик - агрегуємо в останній слот
+                cursor.execute("""
+                    UPDATE source_series
+                    SET reputation = ?, entropy_sum = entropy_sum + ?, count = count + 1
+                    WHERE source = ? AND resolution = ? AND slot = ?
+                """, (reputation, entropy, source, resolution, (head - 1) % capacity))
+                continue
+            
+            # Новий кошик перезаписує найстаріший слот кільця
+            cursor.execute("""
+                INSERT OR REPLACE INTO source_series
+                    (source, resolution, slot, bucket, reputation, entropy_sum, count)
+                VALUES (?, ?, ?, ?, ?, ?, 1)
+            """, (source, resolution, head % capacity, bucket, reputation, entropy))
+            cursor.execute("""
+                INSERT OR REPLACE INTO series_head (source, resolution, head, bucket)
+                VALUES (?, ?, ?, ?)
+            """, (source, resolution, head + 1, bucket))
+        
+        self.conn.commit()
+    
+    def get_source_series(self, source: str, resolution: str = 'hourly',
+                          start: Optional[float] = None, end: Optional[float] = None) -> List[Dict]:
+        """
+        Часовий ряд джерела (читає лише кільце джерела, не analyses)
+        
+        Args:
+            source: Назва джерела
+            resolution: 'raw', 'hourly' або 'daily'
+            start: Unix-час початку (включно), None - без обмеження
+            end: Unix-час кінця (включно), None - без обмеження
+            
+        Returns:
+            List[Dict]: timestamp (ISO, початок кошика), reputation (остання
+                        в кошику), entropy (середня), count - за зростанням часу
+        """
+        if resolution not in SERIES_RESOLUTIONS:
+            raise ValueError(f"Unknown resolution: {resolution} "
+                             f"(expected one of {list(SERIES_RESOLUTIONS)})")
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            SELECT bucket, reputation, entropy_sum, count FROM source_series
+            WHERE source = ? AND resolution = ? AND bucket >= ? AND bucket <= ?
+            ORDER BY bucket
+        """, (source, resolution,
+              float('-inf') if start is None else start,
+              float('inf') if end is None else end))
+        
+        return [{
+            'timestamp': datetime.fromtimestamp(row['bucket']).isoformat(),
+            'reputation': row['reputation'],
+            'entropy': round(row['entropy_sum'] / row['count'], 4),
+            'count': row['count']
+        } for row in cursor.fetchall()]
     
     def get_analysis_by_id(self, analysis_id: int) -> Optional[Dict]:
         """
@@ -225,10 +429,14 @@ class VeritasDatabase:
             return dict(row)
         return None
     
-    def get_all_sources(self) -> List[Dict]:
+    def get_all_sources(self, limit: Optional[int] = None) -> List[Dict]:
         """
         Отримує всі джерела з репутацією
         
+        Args:
+            limit: Кількість записів (всі якщо None); для великих баз -
+                   get_sources_page
+        
         Returns:
             List[Dict]: Список джерел
         """
@@ -236,10 +444,108 @@ class VeritasDatabase:
         cursor.execute("""
             SELECT * FROM source_reputation 
             ORDER BY reputation DESC
-        """)
+            LIMIT ?
+        """, (-1 if limit is None else limit,))
         
         return [dict(row) for row in cursor.fetchall()]
     
+    def get_sources_page(self, limit: int = 50, order: str = 'desc', cursor: Optional[str] = None,
+                         min_reputation: Optional[float] = None,
+                         max_reputation: Optional[float] = None) -> Dict:
+        """
+        Сторінка рейтингу джерел (top-K / bottom-K / діапазон репутації)
+        
+        Keyset-пагінація по індексу (reputation, source): вартість сторінки
+        не залежить ні від кількості джерел, ні від номера сторінки.
+        
+        Args:
+            limit: Розмір сторінки
+            order: 'desc' (top-K) або 'asc' (bottom-K)
+            cursor: next_cursor попередньої сторінки
+            min_reputation: Нижня межа репутації (включно)
+            max_reputation: Верхня межа репутації (включно)
+            
+        Returns:
+            Dict: sources - список джерел, next_cursor - курсор наступної
+                  сторінки або None
+        """
+        if order not in ('desc', 'asc'):
+            raise ValueError(f"Unknown order: {order} (expected 'desc' or 'asc')")
+        conditions = ["reputation >= ?", "reputation <= ?"]
+        params = [float('-inf') if min_reputation is None else min_reputation,
+                  float('inf') if max_reputation is None else max_reputation]
+        if cursor:
+            reputation, source = cursor.split(':', 1)
+            conditions.append("(reputation, source) < (?, ?)" if order == 'desc'
+                              else "(reputation, source) > (?, ?)")
+            params += [float(reputation), source]
+        direction = 'DESC' if order == 'desc' else 'ASC'
+        
+        db_cursor = self.conn.cursor()
+        db_cursor.execute(f"""
+            SELECT * FROM source_reputation
+            WHERE {' AND '.join(conditions)}
+            ORDER BY reputation {direction}, source {direction}
+            LIMIT ?
+        """, params + [limit])
+        sources = [dict(row) for row in db_cursor.fetchall()]
+        
+        next_cursor = None
+        if len(sources) == limit:
+            last = sources[-1]
+            next_cursor = f"{last['reputation']!r}:{last['source']}"
+        return {'sources': sources, 'next_cursor': next_cursor}
+    
+    def get_reputation_quantiles(self, quantiles: List[float]) -> Dict[float, Optional[float]]:
+        """
+        Квантилі репутації джерел
+        
+        Позиція квантиля шукається по гістограмі (до 1000 рядків), значення -
+        всередині одного кошика по індексу, без сканування всіх джерел.
+        
+        Args:
+            quantiles: Значення q у [0, 1]
+            
+        Returns:
+            Dict: {q: репутація на позиції floor(q * (n - 1)) за зростанням}
+        """
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            SELECT bucket, count FROM reputation_histogram
+            WHERE count > 0 ORDER BY bucket
+        """)
+        histogram = [(row['bucket'], row['count']) for row in cursor.fetchall()]
+        total = sum(count for _, count in histogram)
+        
+        result = {}
+        for q in quantiles:
+            if not total:
+                result[q] = None
+                continue
+            rank = int(min(max(q, 0.0), 1.0) * (total - 1))
+            for bucket, count in histogram:
+                if rank < count:
+                    break
+                rank -= count
+            low = REPUTATION_BOUNDS[bucket] if bucket else float('-inf')
+            high = REPUTATION_BOUNDS[bucket + 1] if bucket + 1 < len(REPUTATION_BOUNDS) else float('inf')
+            
+            cursor.execute("""
+                SELECT MIN(reputation) AS low, MAX(reputation) AS high FROM source_reputation
+                WHERE reputation >= ? AND reputation < ?
+            """, (low, high))
+            bounds = cursor.fetchone()
+            if bounds['low'] == bounds['high']:
+                result[q] = bounds['low']
+                continue
+            cursor.execute("""
+                SELECT reputation FROM source_reputation
+                WHERE reputation >= ? AND reputation < ?
+                ORDER BY reputation LIMIT 1 OFFSET ?
+            """, (low, high, rank))
+            result[q] = cursor.fetchone()['reputation']
+        return result
+    
     def get_statistics(self) -> Dict:
         """
         Отримує статистику по базі
@@ -3,8 +3,100 @@ Veritas News Analyzer - Multilingual Support (v2.0 - Calibrated)
 Покращена підтримка української та англійської мов
 """
 
-from typing import Dict, Set
+from collections import Counter
+from typing import Dict, Iterable, List, Set
+import hashlib
+import json
+import os
 import re
+import sys
+
+# Реєстр і профілювання - спільні модулі кореня репозиторію
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from veritas_profiling import NULL_TIMER
+from veritas_registry import ConcurrentRegistry, DecayingRegistry, ReputationIndex
+
+
+class MarkerAutomaton:
+    """
+    Автомат Ахо-Корасік для всіх класів маркерів одночасно.
+    
+    Семантика збігається з `any(m in w for m in markers)`: слово
+    зараховується до класу, якщо містить хоча б один маркер цього класу
+    як підрядок. Вартість перевірки слова лінійна від його довжини
+    і не залежить від розміру лексикону.
+    """
+    
+    def __init__(self, marker_classes: Dict[str, Iterable[str]]):
+        """
+        Args:
+            marker_classes: {'chaos': {...}, 'noise': {...}, 'signal': {...}}
+        """
+        self.classes = list(marker_classes)
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[int] = [0]
+        
+        for bit, name in enumerate(self.classes):
+            for marker in marker_classes[name]:
+                self._insert(marker, 1 << bit)
+        self._build_failure_links()
+    
+    def _insert(self, marker: str, mask: int):
+        state = 0
+        for char in marker:
+            nxt = self._goto[state].get(char)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][char] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(0)
+            state = nxt
+        self._out[state] |= mask
+    
+    def _build_failure_links(self):
+        """BFS: fail-посилання + злиття виходів уздовж них"""
+        goto, fail, out = self._goto, self._fail, self._out
+        queue = list(goto[0].values())
+        head = 0
+        while head < len(queue):
+            state = queue[head]
+            head += 1
+            for char, nxt in goto[state].items():
+                f = fail[state]
+                while f and char not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f].get(char, 0)
+                out[nxt] |= out[fail[nxt]]
+                queue.append(nxt)
+    
+    def match_mask(self, word: str) -> int:
+        """Бітова маска класів, маркери яких входять у слово"""
+        goto, fail, out = self._goto, self._fail, self._out
+        state = mask = 0
+        for char in word:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            mask |= out[state]
+        return mask
+    
+    def count_words(self, words: List[str]) -> Dict[str, int]:
+        """
+        Кількість слів, що містять маркер кожного класу.
+        Автомат проганяється лише по унікальних словах.
+        """
+        counts = dict.fromkeys(self.classes, 0)
+        for word, n in Counter(words).items():
+            mask = self.match_mask(word)
+            if not mask:
+                continue
+            for bit, name in enumerate(self.classes):
+                if mask >> bit & 1:
+                    counts[name] += n
+        return counts
 
 
 class LanguageDetector:
@@ -66,17 +158,23 @@ class LanguageDetector:
     # Характерні букви для визначення мови
     UKRAINIAN_CHARS = set('їієґ')
     
-    def detect_language(self, text: str) -> str:
+    def __init__(self):
+        # Скомпільовані автомати маркерів (по одному на мову)
+        self._automata: Dict[str, MarkerAutomaton] = {}
+    
+    def detect_language(self, text: str, text_lower: str = None) -> str:
         """
         Визначає мову тексту (uk або en)
         
         Args:
             text: Текст для аналізу
+            text_lower: Вже порахований text.lower() (опціонально)
             
         Returns:
             'uk' або 'en'
         """
-        text_lower = text.lower()
+        if text_lower is None:
+            text_lower = text.lower()
         
         # Перевірка на українські символи
         if any(char in text_lower for char in self.UKRAINIAN_CHARS):
@@ -99,16 +197,46 @@ class LanguageDetector:
         Returns:
             Dict з noise_markers, signal_markers, chaos_markers
         """
-        if language is None and text is not None:
-            language = self.detect_language(text)
-        elif language is None:
-            language = 'en'  # Default
+        language = self._resolve_language(language, text)
         
         return {
             'noise_markers': self.NOISE_MARKERS.get(language, self.NOISE_MARKERS['en']),
             'signal_markers': self.SIGNAL_MARKERS.get(language, self.SIGNAL_MARKERS['en']),
             'chaos_markers': self.CHAOS_MARKERS.get(language, self.CHAOS_MARKERS['en'])
         }
+    
+    def get_automaton(self, language: str = None, text: str = None) -> MarkerAutomaton:
+        """
+        Повертає автомат маркерів для мови (компілюється один раз)
+        
+        Args:
+            language: 'uk' або 'en' (опціонально)
+            text: Текст для автовизначення мови (якщо language не вказано)
+            
+        Returns:
+            MarkerAutomaton з класами chaos, noise, signal
+        """
+        language = self._resolve_language(language, text)
+        if language not in self.NOISE_MARKERS:
+            language = 'en'
+        
+        automaton = self._automata.get(language)
+        if automaton is None:
+            markers = self.get_markers(language=language)
+            automaton = MarkerAutomaton({
+                'chaos': markers['chaos_markers'],
+                'noise': markers['noise_markers'],
+                'signal': markers['signal_markers']
+            })
+            self._automata[language] = automaton
+        return automaton
+    
+    def _resolve_language(self, language: str = None, text: str = None) -> str:
+        if language is None and text is not None:
+            return self.detect_language(text)
+        elif language is None:
+            return 'en'  # Default
+        return language
 
 
 class MultilingualVeritasCore:
@@ -116,14 +244,45 @@ class MultilingualVeritasCore:
     Veritas Core з підтримкою множини мов (v2.0 - Calibrated)
     """
     
-    def __init__(self, config: Dict = None):
+    def __init__(self, config: Dict = None, cache=None, timer=None, registry=None):
+        """
+        Args:
+            config: Секція veritas з config.yaml
+            cache: Кеш чистих оцінок тексту (напр. veritas_cache.ResultCache);
+                   репутація оновлюється завжди, навіть при влучанні в кеш
+            timer: veritas_profiling.StageTimer для обліку часу по етапах
+            registry: Сховище репутацій, що переживає рестарт
+                      (напр. veritas_journal.JournaledRegistry); default - dict.
+                      Обгортається в ConcurrentRegistry: оновлення атомарні;
+                      з config['reputation_decay'] - у DecayingRegistry
+        """
         self.detector = LanguageDetector()
-        self.reputation_registry = {
-            "Unknown_Source": 0.5
-        }
+        self.cache = cache
+        self.timer = timer or NULL_TIMER
+        self.config = config or {}
+        self.default_reputation = self.config.get('default_reputation', 0.5)
+        decay = self.config.get('reputation_decay') or {}
+        if decay.get('half_life_days') and isinstance(registry, ConcurrentRegistry):
+            raise ValueError("reputation_decay needs a plain registry; "
+                             "pass DecayingRegistry(...) as registry instead")
+        
+        if registry is None:
+            registry = {
+                "Unknown_Source": self.default_reputation
+            }
+        else:
+            registry.setdefault("Unknown_Source", self.default_reputation)
+        # Згасання репутації до default_reputation (ліниво, при читанні)
+        if isinstance(registry, ConcurrentRegistry):
+            pass
+        elif decay.get('half_life_days'):
+            registry = DecayingRegistry(registry, half_life=decay['half_life_days'] * 86400,
+                                        default_reputation=self.default_reputation)
+        else:
+            registry = ConcurrentRegistry(registry, index=ReputationIndex())
+        self.reputation_registry = registry
         
         # Налаштування thresholds (можна перевизначити через config)
-        self.config = config or {}
         self.thresholds = self.config.get('thresholds', {
             'critical': 0.7,      # Було 0.6 - зробили суворіше
             'warning': 0.4,       # Було 0.4 - залишили
@@ -147,7 +306,10 @@ class MultilingualVeritasCore:
         """
         numbers = re.findall(r'\d+\.?\d*', text)
         words = text.split()
-        return len(numbers) / (len(words) + 1)
+        return self._number_factor(len(numbers), words)
+    
+    def _number_factor(self, number_count: int, words: List[str]) -> float:
+        return number_count / (len(words) + 1)
     
     def _count_caps_and_shouts(self, text: str) -> float:
         """
@@ -159,19 +321,16 @@ class MultilingualVeritasCore:
         Returns:
             float: Shout factor
         """
-        words = text.split()
+        return self._shout_factor(text.split(), text.count('!'), text.count('?'))
+    
+    def _shout_factor(self, words: List[str], exclamations: int, questions: int) -> float:
+        """Shout factor за словами split() та кількістю ! і ?"""
         if not words:
             return 0.0
         
-        # Вигуки
-        exclamations = text.count('!')
-        
         # КАПСЛОК слова (довжина > 2)
         caps_words = sum(1 for w in words if w.isupper() and len(w) > 2)
         
-        # Питання (надмірна кількість)
-        questions = text.count('?')
-        
         shout_factor = (exclamations * 2 + caps_words * 3 + questions) / (len(words) + 1)
         return min(shout_factor, 1.0)
     
@@ -190,23 +349,25 @@ class MultilingualVeritasCore:
         if not words:
             return 1.0
         
-        # Отримуємо маркери для відповідної мови
-        markers = self.detector.get_markers(language=language, text=text)
-        
+        # Усі три класи маркерів - один прохід автомата по словах
+        automaton = self.detector.get_automaton(language=language, text=text)
+        return self._entropy_from_counts(automaton.count_words(words),
+                                         self._count_numbers(text),
+                                         self._count_caps_and_shouts(text))
+    
+    def _entropy_from_counts(self, counts: Dict[str, int], number_factor: float,
+                             shout_factor: float) -> float:
+        """Формула ентропії за лічильниками маркерів, number та shout factor"""
         # 1. Перевірка на абсолютний хаос
-        chaos_count = sum(1 for w in words if any(m in w for m in markers['chaos_markers']))
-        if chaos_count > 0:
+        if counts['chaos'] > 0:
             return 0.99  # Максимальна ентропія
         
         # 2. Підрахунок шуму та сигналу
-        noise_count = sum(1 for w in words if any(m in w for m in markers['noise_markers']))
-        signal_count = sum(1 for w in words if any(m in w for m in markers['signal_markers']))
+        noise_count = counts['noise']
+        signal_count = counts['signal']
         
-        # 3. Number Factor (цифри знижують ентропію)
-        number_factor = self._count_numbers(text)
-        
-        # 4. Shout Factor (капслок і вигуки підвищують ентропію)
-        shout_factor = self._count_caps_and_shouts(text)
+        # 3-4. Number Factor (цифри знижують ентропію) і Shout Factor
+        # (капслок і вигуки підвищують ентропію) приходять аргументами
         
         # 5. Базова ентропія
         base_entropy = (noise_count + 1) / (signal_count + noise_count + 1)
@@ -230,42 +391,156 @@ class MultilingualVeritasCore:
         Returns:
             Dict з результатами аналізу
         """
-        # Визначаємо мову
-        detected_lang = self.detector.detect_language(text) if language is None else language
-        
-        # Розрахунок ентропії
-        entropy_score = self._calculate_entropy_coefficient(text, detected_lang)
-        
-        # Dynamic Slashing (з оновленими параметрами)
-        penalty = 0.0
-        if entropy_score > self.thresholds['warning']:
-            penalty = round(entropy_score * self.slashing['penalty_multiplier'], 2)
-        elif entropy_score < self.thresholds['trusted']:
-            penalty = -self.slashing['reward_bonus']
+        self.timer.record_size('evaluate_integrity', len(text))
+        with self.timer.stage('total'):
+            if self.cache is None:
+                return self.apply_score(source, self.score_text(text, language))
+            
+            score = self.cache.get_or_compute(
+                text, f"{self.version_tag()}/{language or 'auto'}",
+                lambda normalized: self.score_text(normalized, language)
+            )
+            return self.apply_score(source, score)
+    
+    def version_tag(self) -> str:
+        """Відбиток лексиконів, від яких залежить score_text (ключ кешу)"""
+        detector = self.detector
+        payload = json.dumps(
+            [detector.NOISE_MARKERS, detector.SIGNAL_MARKERS, detector.CHAOS_MARKERS],
+            sort_keys=True, ensure_ascii=False, default=sorted
+        )
+        return 'multilingual/' + hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+    
+    def score_text(self, text: str, language: str = None) -> Dict:
+        """
+        Чиста оцінка тексту без звернення до реєстру репутацій
+        (можна рахувати в іншому процесі або брати з кешу)
         
-        # Оновлення репутації
-        current_rep = self.reputation_registry.get(source, 0.5)
-        updated_rep = max(0.0, min(1.0, current_rep - penalty))
-        self.reputation_registry[source] = round(updated_rep, 2)
+        Args:
+            text: Текст новини
+            language: Мова (опціонально, автовизначення)
+            
+        Returns:
+            Dict з language, entropy_index та diagnostics
+        """
+        # Кожен примітив рахується один раз (раніше числа і крик рахувались
+        # двічі: для ентропії і для diagnostics)
+        with self.timer.stage('tokenization'):
+            text_lower = text.lower()
+            marker_words = text_lower.replace(",", "").replace(".", "").split()
+            split_words = text.split()
+        with self.timer.stage('numbers'):
+            number_count = len(re.findall(r'\d+\.?\d*', text))
+        
+        return self.score_primitives(text, text_lower, marker_words, split_words,
+                                     number_count, text.count('!'), text.count('?'), language)
+    
+    def score_primitives(self, text: str, text_lower: str, marker_words: List[str],
+                         split_words: List[str], number_count: int, exclamations: int,
+                         questions: int, language: str = None) -> Dict:
+        """
+        score_text з уже порахованих примітивів (спільний кеш ознак ансамблю)
         
-        # Визначення статусу (з оновленими thresholds)
-        status = self._get_status(entropy_score, updated_rep)
+        Args:
+            text: Текст новини
+            text_lower: text.lower()
+            marker_words: text.lower() без ком і крапок, split()
+            split_words: text.split()
+            number_count: Кількість чисел (\\d+\\.?\\d*)
+            exclamations, questions: Кількість '!' і '?'
+            language: Мова (опціонально, автовизначення)
+        """
+        timer = self.timer
+        with timer.stage('language'):
+            detected_lang = (self.detector.detect_language(text, text_lower)
+                             if language is None else language)
+        with timer.stage('number_density'):
+            number_factor = self._number_factor(number_count, split_words)
+        with timer.stage('shout'):
+            shout_factor = self._shout_factor(split_words, exclamations, questions)
+        
+        if marker_words:
+            with timer.stage('markers'):
+                counts = self.detector.get_automaton(language=detected_lang).count_words(marker_words)
+            with timer.stage('synthesis'):
+                entropy_score = self._entropy_from_counts(counts, number_factor, shout_factor)
+        else:
+            entropy_score = 1.0
         
         return {
-            "source": source,
             "language": detected_lang,
             "entropy_index": entropy_score,
-            "reputation": updated_rep,
-            "status": status,
-            "verdict": self._get_verdict(entropy_score, detected_lang),
-            "intervention_required": entropy_score >= self.thresholds['critical'] or updated_rep < 0.3,
-            # Додаткова діагностика
             "diagnostics": {
-                "number_factor": round(self._count_numbers(text), 3),
-                "shout_factor": round(self._count_caps_and_shouts(text), 3)
+                "number_factor": round(number_factor, 3),
+                "shout_factor": round(shout_factor, 3)
             }
         }
     
+    def apply_score(self, source: str, score: Dict) -> Dict:
+        """
+        Застосовує оцінку тексту (з score_text) до репутації джерела
+        
+        Args:
+            source: Джерело
+            score: Результат score_text
+            
+        Returns:
+            Dict з результатами аналізу (як evaluate_integrity)
+        """
+        return self.apply_scores(source, [score])[0]
+    
+    def apply_scores(self, source: str, scores: List[Dict]) -> List[Dict]:
+        """
+        Застосовує пакет оцінок одного джерела (у порядку) під одним
+        блокуванням реєстру - для документів, що прийшли разом
+        
+        Returns:
+            List[Dict]: результат apply_score для кожної оцінки
+        """
+        penalties = [self._penalty(score["entropy_index"]) for score in scores]
+        
+        # Атомарне оновлення репутації (read-modify-write під блокуванням джерела)
+        updates = self.reputation_registry.apply_updates(
+            source, [self._slash(penalty) for penalty in penalties], self.default_reputation
+        )
+        
+        results = []
+        for score, penalty, (current_rep, _) in zip(scores, penalties, updates):
+            detected_lang = score["language"]
+            entropy_score = score["entropy_index"]
+            updated_rep = max(0.0, min(1.0, current_rep - penalty))
+            
+            # Визначення статусу (з оновленими thresholds)
+            with self.timer.stage('status'):
+                status = self._get_status(entropy_score, updated_rep)
+                verdict = self._get_verdict(entropy_score, detected_lang)
+            
+            results.append({
+                "source": source,
+                "language": detected_lang,
+                "entropy_index": entropy_score,
+                "reputation": updated_rep,
+                "status": status,
+                "verdict": verdict,
+                "intervention_required": entropy_score >= self.thresholds['critical'] or updated_rep < 0.3,
+                # Додаткова діагностика
+                "diagnostics": dict(score["diagnostics"])
+            })
+        return results
+    
+    def _penalty(self, entropy_score: float) -> float:
+        """Dynamic Slashing (з оновленими параметрами)"""
+        penalty = 0.0
+        if entropy_score > self.thresholds['warning']:
+            penalty = round(entropy_score * self.slashing['penalty_multiplier'], 2)
+        elif entropy_score < self.thresholds['trusted']:
+            penalty = -self.slashing['reward_bonus']
+        return penalty
+    
+    @staticmethod
+    def _slash(penalty: float):
+        return lambda current_rep: round(max(0.0, min(1.0, current_rep - penalty)), 2)
+    
     def _get_status(self, entropy: float, reputation: float) -> str:
         """Визначає статус на основі ентропії та репутації"""
         # Якщо ентропія критична - одразу CRITICAL
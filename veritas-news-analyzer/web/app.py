@@ -87,15 +87,63 @@ def get_sources():
     return jsonify(sources)
 
 
+@app.route('/api/sources/ranking', methods=['GET'])
+def get_sources_ranking():
+    """
+    Рейтинг джерел посторінково
+    
+    Query: order (desc - top-K, asc - bottom-K), limit (до 500),
+           cursor (next_cursor попередньої сторінки), min/max - діапазон репутації
+    """
+    try:
+        page = db.get_sources_page(
+            limit=min(request.args.get('limit', 50, type=int), 500),
+            order=request.args.get('order', 'desc'),
+            cursor=request.args.get('cursor'),
+            min_reputation=request.args.get('min', type=float),
+            max_reputation=request.args.get('max', type=float)
+        )
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    return jsonify(page)
+
+
+@app.route('/api/sources/quantiles', methods=['GET'])
+def get_sources_quantiles():
+    """Квантилі репутації джерел; query: q=0.1,0.5,0.9"""
+    try:
+        quantiles = [float(q) for q in request.args.get('q', '0.1,0.25,0.5,0.75,0.9').split(',')]
+    except ValueError:
+        return jsonify({'error': 'q must be a comma-separated list of numbers'}), 400
+    result = db.get_reputation_quantiles(quantiles)
+    return jsonify({str(q): value for q, value in result.items()})
+
+
 @app.route('/api/source/<source_name>', methods=['GET'])
 def get_source_info(source_name):
-    """Отримати інформацію про конкретне джерело"""
+    """
+    Отримати інформацію про конкретне джерело
+    
+    Query: resolution (raw|hourly|daily, default hourly),
+           start/end - Unix-час меж тренду
+    """
     reputation = db.get_source_reputation(source_name)
     analyses = db.get_analyses_by_source(source_name, limit=5)
     
+    try:
+        trend = db.get_source_series(
+            source_name,
+            resolution=request.args.get('resolution', 'hourly'),
+            start=request.args.get('start', type=float),
+            end=request.args.get('end', type=float)
+        )
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
     return jsonify({
         'reputation': reputation,
-        'recent_analyses': analyses
+        'recent_analyses': analyses,
+        'trend': trend
     })
 
 
@@ -0,0 +1,274 @@
+"""
+Veritas Protocol - Scored Archive with Inverted Token Index
+Інкрементальне переоцінювання архіву після зміни лексиконів маркерів.
+
+Для кожного документа зберігаються сирі метрики VeritasCalibratedEngine,
+мова, оцінка і статус, а також інвертований індекс токен -> (документ,
+кількість). Патч лексикону (додати/прибрати слова з noise/signal/chaos)
+знаходить через індекс лише документи, що містять змінені слова,
+зсуває їхні лічильники маркерів і перераховує оцінку з метрик - без
+повторного читання текстів. Застосовані патчі зберігаються в архіві
+й накладаються на движок при відкритті, тож нові документи
+оцінюються з тим самим лексиконом.
+
+CLI:
+    python veritas_archive.py ingest cases/* --db archive.db
+    python veritas_archive.py apply-lexicon patch.json --db archive.db
+
+Формат патча:
+    {"add": {"noise": {"uk": ["слово"]}}, "remove": {"signal": {"en": ["rate"]}}}
+"""
+
+import argparse
+import json
+import sqlite3
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from veritas_calibrated_core import METRIC_COLUMNS, STATUS_LEVELS, VeritasCalibratedEngine
+
+MARKER_CLASSES = ('noise', 'signal', 'chaos')
+
+
+def _lexicon(engine: VeritasCalibratedEngine, marker_class: str) -> Dict:
+    return getattr(engine, f'{marker_class}_markers')
+
+
+class ScoredArchive:
+    """
+    Архів оцінених документів з інвертованим індексом токенів
+
+    Example:
+        >>> archive = ScoredArchive('archive.db')
+        >>> archive.add('case_01', text)
+        >>> archive.apply_lexicon_patch({'add': {'noise': {'en': ['outrage']}}})
+        {'tokens': 1, 'documents_touched': 12, 'scores_changed': 9, 'status_changed': 2}
+    """
+
+    def __init__(self, db_path: str = ':memory:', engine: Optional[VeritasCalibratedEngine] = None):
+        """
+        Args:
+            db_path: Файл SQLite (':memory:' - лише в пам'яті)
+            engine: Движок (на нього накладаються збережені патчі лексикону)
+        """
+        self.engine = engine or VeritasCalibratedEngine()
+        self.conn = sqlite3.connect(db_path)
+        metric_columns = ', '.join(f"{name} REAL NOT NULL" for name in METRIC_COLUMNS)
+        self.conn.executescript(f"""
+            CREATE TABLE IF NOT EXISTS documents (
+                doc_id TEXT PRIMARY KEY,
+                language TEXT NOT NULL,
+                word_count INTEGER NOT NULL,
+                char_count INTEGER NOT NULL,
+                {metric_columns},
+                entropy REAL NOT NULL,
+                status TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS postings (
+                token TEXT NOT NULL,
+                doc_id TEXT NOT NULL,
+                count INTEGER NOT NULL,
+                PRIMARY KEY (token, doc_id)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS idx_postings_doc ON postings(doc_id);
+            CREATE TABLE IF NOT EXISTS lexicon_patches (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                applied TEXT NOT NULL,
+                patch TEXT NOT NULL
+            );
+        """)
+        self.conn.commit()
+
+        for (patch,) in self.conn.execute("SELECT patch FROM lexicon_patches ORDER BY id"):
+            self._patch_engine(self._effective_changes(json.loads(patch)))
+
+    # === Наповнення ===
+
+    def add(self, doc_id: str, text: str) -> Optional[Dict]:
+        """
+        Аналізує документ і зберігає метрики та токени
+
+        Returns:
+            Dict з entropy і status або None для надто короткого тексту
+        """
+        if not text or len(text.strip()) < 10:
+            return None
+
+        features = self.engine.extract_features(text)
+        metrics = self.engine.compute_metrics(features)
+        entropy, status = self._score(metrics)
+
+        self.conn.execute("DELETE FROM postings WHERE doc_id = ?", (doc_id,))
+        self.conn.execute(
+            f"INSERT OR REPLACE INTO documents (doc_id, language, word_count, char_count, "
+            f"{', '.join(METRIC_COLUMNS)}, entropy, status) "
+            f"VALUES ({', '.join('?' for _ in range(len(METRIC_COLUMNS) + 6))})",
+            (doc_id, features.language, features.word_count, features.char_count,
+             *(float(metrics[name]) for name in METRIC_COLUMNS), entropy, status)
+        )
+        self.conn.executemany(
+            "INSERT INTO postings (token, doc_id, count) VALUES (?, ?, ?)",
+            ((token, doc_id, count) for token, count in features.token_counts.items())
+        )
+        self.conn.commit()
+        return {'entropy': entropy, 'status': status}
+
+    def _score(self, metrics: Dict) -> Tuple[float, str]:
+        """Оцінка з метрик (як analyze: хаос замикає на CRITICAL)"""
+        if metrics['chaos'] > 0:
+            return 0.99, 'CRITICAL'
+        final_entropy = self.engine._synthesize_entropy(metrics)
+        _, status, _ = STATUS_LEVELS[self.engine._status_level(final_entropy)]
+        return round(final_entropy, 3), status
+
+    # === Патчі лексикону ===
+
+    def _effective_changes(self, patch: Dict) -> List[Tuple[str, str, str, int]]:
+        """
+        Зміни, що реально міняють лексикон движка:
+        (клас, мова, слово, +1 додано / -1 прибрано)
+        """
+        unknown = set(patch) - {'add', 'remove'}
+        if unknown:
+            raise ValueError(f"Unknown patch sections: {sorted(unknown)}")
+
+        changes = []
+        for section, sign in (('add', 1), ('remove', -1)):
+            for marker_class, languages in patch.get(section, {}).items():
+                if marker_class not in MARKER_CLASSES:
+                    raise ValueError(f"Unknown marker class: {marker_class}")
+                lexicon = _lexicon(self.engine, marker_class)
+                for language, words in languages.items():
+                    current = lexicon.get(language, set())
+                    for word in dict.fromkeys(w.lower() for w in words):
+                        if (word in current) != (sign > 0):
+                            changes.append((marker_class, language, word, sign))
+        return changes
+
+    def _patch_engine(self, changes: List[Tuple[str, str, str, int]]):
+        for marker_class, language, word, sign in changes:
+            words = _lexicon(self.engine, marker_class).setdefault(language, set())
+            if sign > 0:
+                words.add(word)
+            else:
+                words.discard(word)
+
+    def apply_lexicon_patch(self, patch: Dict) -> Dict:
+        """
+        Застосовує патч лексикону до движка і до збережених оцінок
+
+        Через інвертований індекс зачіпаються лише документи, що містять
+        змінені слова (і мають відповідну мову); їхні лічильники маркерів
+        зсуваються, оцінка перераховується з метрик.
+
+        Returns:
+            Dict: tokens (реально змінені слова), documents_touched,
+                  scores_changed, status_changed
+        """
+        changes = self._effective_changes(patch)
+
+        # doc_id -> {клас: зсув лічильника}
+        deltas: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        for marker_class, language, word, sign in changes:
+            rows = self.conn.execute(
+                "SELECT p.doc_id, p.count FROM postings p JOIN documents d ON d.doc_id = p.doc_id "
+                "WHERE p.token = ? AND d.language = ?", (word, language)
+            )
+            for doc_id, count in rows:
+                deltas[doc_id][marker_class] += sign * count
+
+        self._patch_engine(changes)
+
+        scores_changed = status_changed = 0
+        updates = []
+        for doc_id, delta in deltas.items():
+            row = self.conn.execute(
+                f"SELECT {', '.join(METRIC_COLUMNS)}, entropy, status FROM documents WHERE doc_id = ?",
+                (doc_id,)
+            ).fetchone()
+            metrics = dict(zip(METRIC_COLUMNS, row))
+            for marker_class, shift in delta.items():
+                metrics[marker_class] += shift
+            old_entropy, old_status = row[-2], row[-1]
+            entropy, status = self._score(metrics)
+
+            scores_changed += entropy != old_entropy
+            status_changed += status != old_status
+            updates.append((metrics['noise'], metrics['signal'], metrics['chaos'],
+                            entropy, status, doc_id))
+
+        self.conn.executemany(
+            "UPDATE documents SET noise = ?, signal = ?, chaos = ?, entropy = ?, status = ? "
+            "WHERE doc_id = ?", updates
+        )
+        self.conn.execute(
+            "INSERT INTO lexicon_patches (applied, patch) VALUES (?, ?)",
+            (datetime.now().isoformat(), json.dumps(patch, ensure_ascii=False))
+        )
+        self.conn.commit()
+
+        return {
+            'tokens': len(changes),
+            'documents_touched': len(deltas),
+            'scores_changed': scores_changed,
+            'status_changed': status_changed
+        }
+
+    # === Читання ===
+
+    def get(self, doc_id: str) -> Optional[Dict]:
+        row = self.conn.execute(
+            "SELECT language, entropy, status FROM documents WHERE doc_id = ?", (doc_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        language, entropy, status = row
+        return {'doc_id': doc_id, 'language': language, 'entropy': entropy, 'status': status}
+
+    def documents_with(self, token: str) -> List[Tuple[str, int]]:
+        """Інвертований індекс: [(doc_id, кількість)] для токена"""
+        return self.conn.execute(
+            "SELECT doc_id, count FROM postings WHERE token = ? ORDER BY doc_id", (token.lower(),)
+        ).fetchall()
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+
+    def close(self):
+        self.conn.close()
+
+
+def main(argv: Optional[Iterable[str]] = None):
+    parser = argparse.ArgumentParser(description='Veritas Protocol - scored archive')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p_ingest = sub.add_parser('ingest', help='Оцінити і проіндексувати документи')
+    p_ingest.add_argument('paths', nargs='+')
+    p_ingest.add_argument('--db', default='veritas_archive.db')
+
+    p_apply = sub.add_parser('apply-lexicon', help='Застосувати патч лексикону до архіву')
+    p_apply.add_argument('patch', help='JSON {"add"|"remove": {клас: {мова: [слова]}}}')
+    p_apply.add_argument('--db', default='veritas_archive.db')
+
+    args = parser.parse_args(argv)
+    archive = ScoredArchive(args.db)
+    try:
+        if args.command == 'ingest':
+            stored = sum(1 for p in args.paths
+                         if archive.add(p, Path(p).read_text(encoding='utf-8')) is not None)
+            print(f"Indexed {stored} documents ({len(archive)} in {args.db})")
+        else:
+            patch = json.loads(Path(args.patch).read_text(encoding='utf-8'))
+            report = archive.apply_lexicon_patch(patch)
+            print(f"Lexicon changes: {report['tokens']} words")
+            print(f"Documents touched: {report['documents_touched']} of {len(archive)}")
+            print(f"Scores changed: {report['scores_changed']} "
+                  f"(status changed: {report['status_changed']})")
+    finally:
+        archive.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+"""
+Veritas Protocol - Content-Addressed Result Cache
+Кеш чистої оцінки тексту (без репутації) для всіх аналізаторів.
+
+Ключ = sha256(нормалізований текст) + тег версії движка/лексиконів,
+тож зміна маркерів чи порогів автоматично інвалідує старі записи.
+Витіснення: LRU + TTL + обмеження за байтами. Опціональний дисковий
+рівень (SQLite) переживає рестарт процесу.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional
+
+# Як часто (у записах) чистити прострочені рядки дискового рівня
+DISK_PRUNE_INTERVAL = 1000
+
+
+def normalize_text(text: str) -> str:
+    """
+    Нормалізація для ключа кешу.
+    Лише strip(): усі точки входу вже обрізають текст перед аналізом,
+    а будь-яка інша нормалізація змінила б гістограму символів і оцінку.
+    get_or_compute передає в обчислення саме нормалізований текст,
+    тож значення в кеші завжди відповідає своєму ключу.
+    """
+    return text.strip()
+
+
+def cache_key(text: str, version: str) -> str:
+    digest = hashlib.sha256(normalize_text(text).encode('utf-8')).hexdigest()
+    return f"{version}:{digest}"
+
+
+class ResultCache:
+    """
+    LRU + TTL кеш результатів з обмеженням розміру в байтах
+
+    Example:
+        >>> cache = ResultCache(max_bytes=32 * 1024 * 1024, ttl=3600)
+        >>> score = cache.get_or_compute(text, engine.version_tag(),
+        ...                              engine.score_text)
+        >>> result = engine.apply_score(source, score)
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, ttl: Optional[float] = 24 * 3600,
+                 disk_path: Optional[str] = None, clock: Callable[[], float] = time.time):
+        """
+        Args:
+            max_bytes: Ліміт пам'яті (розмір серіалізованих значень)
+            ttl: Час життя запису в секундах (None - без обмеження)
+            disk_path: Файл SQLite для дискового рівня (опціонально)
+            clock: Джерело часу (для тестів)
+        """
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.clock = clock
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self.evictions = 0
+        self._puts = 0
+
+        self._disk = None
+        if disk_path:
+            self._disk = sqlite3.connect(disk_path, check_same_thread=False)
+            self._disk.execute("""
+                CREATE TABLE IF NOT EXISTS result_cache (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    created REAL NOT NULL
+                )
+            """)
+            self._disk.commit()
+
+    def _expired(self, created: float) -> bool:
+        return self.ttl is not None and self.clock() - created > self.ttl
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Повертає копію збереженого значення або None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                payload, created, _ = entry
+                if not self._expired(created):
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return json.loads(payload)
+                self._remove(key)
+
+            payload = self._disk_get(key)
+            if payload is not None:
+                self.hits += 1
+                self.disk_hits += 1
+                return json.loads(payload)
+
+            self.misses += 1
+            return None
+
+    def put(self, key: str, value: Dict):
+        payload = json.dumps(value, ensure_ascii=False)
+        created = self.clock()
+        with self._lock:
+            self._store(key, payload, created)
+            if self._disk is not None:
+                self._disk.execute(
+                    "INSERT OR REPLACE INTO result_cache (key, value, created) VALUES (?, ?, ?)",
+                    (key, payload, created)
+                )
+                self._puts += 1
+                if self.ttl is not None and self._puts % DISK_PRUNE_INTERVAL == 0:
+                    self._disk.execute("DELETE FROM result_cache WHERE created < ?",
+                                       (created - self.ttl,))
+                self._disk.commit()
+
+    def get_or_compute(self, text: str, version: str, compute: Callable[[str], Dict]) -> Dict:
+        """
+        Повертає закешований результат для тексту або обчислює і зберігає його.
+        compute(normalized_text) має бути чистою функцією тексту
+        (без оновлення репутації).
+        """
+        normalized = normalize_text(text)
+        key = cache_key(normalized, version)
+        value = self.get(key)
+        if value is None:
+            value = compute(normalized)
+            self.put(key, value)
+        return value
+
+    def _store(self, key: str, payload: str, created: float):
+        size = len(payload.encode('utf-8'))
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (payload, created, size)
+        self._bytes += size
+        while self._bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def _remove(self, key: str):
+        _, _, size = self._entries.pop(key)
+        self._bytes -= size
+
+    def _disk_get(self, key: str) -> Optional[str]:
+        if self._disk is None:
+            return None
+        row = self._disk.execute(
+            "SELECT value, created FROM result_cache WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        payload, created = row
+        if self._expired(created):
+            self._disk.execute("DELETE FROM result_cache WHERE key = ?", (key,))
+            self._disk.commit()
+            return None
+        # Піднімаємо запис у пам'ять
+        self._store(key, payload, created)
+        return payload
+
+    def stats(self) -> Dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'disk_hits': self.disk_hits,
+                'hit_rate': round(self.hits / total, 3) if total else 0.0,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            if self._disk is not None:
+                self._disk.execute("DELETE FROM result_cache")
+                self._disk.commit()
+
+    def close(self):
+        if self._disk is not None:
+            self._disk.close()
+            self._disk = None
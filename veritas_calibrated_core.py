@@ -4,9 +4,235 @@ Synthesized from veritas_core.py + app/core.py
 Optimized for: Academic < 0.4, Wikipedia 0.5-0.65, Propaganda 0.85+
 """
 
+import hashlib
+import json
 import math
+import random
 import re
-from typing import Dict, Optional
+import time
+from bisect import bisect_right
+from collections import Counter
+from dataclasses import dataclass, field, replace
+from itertools import accumulate
+from statistics import NormalDist, stdev
+from typing import Dict, Iterable, List, Optional
+
+from veritas_entropy import char_histogram, histogram_entropy
+from veritas_profiling import NULL_TIMER
+from veritas_sketches import HyperLogLog
+
+try:
+    import numpy as np
+except ImportError:  # NumPy потрібен лише для пакетного API
+    np = None
+
+
+_WORD_RE = re.compile(r'\w+')
+_NUMBER_RE = re.compile(r'\d+\.?\d*')
+_LAST_SPACE_RE = re.compile(r'\s(?=\S*\Z)')
+_SPLIT_WORD_RE = re.compile(r'\S+')
+_SPACE_RE = re.compile(r'\s')
+# Характерні літери (в обох регістрах, бо гістограма рахується по сирому тексту)
+_UKRAINIAN_CHARS = 'їієґЇІЄҐ'
+# Стеля символів на "слово" для бюджету analyze_approximate: текст без
+# пробілів (CJK, мініфіковані блоки) інакше дав би вікно на весь probe
+MAX_CHARS_PER_WORD = 16
+# Найдовший перенос між фрагментами в StreamingFeatureExtractor
+MAX_CARRY = 64 * 1024
+
+
+
+def count_caps_words(text: str) -> int:
+    """КАПС-слова (>5 символів, щоб не чіпати абревіатури)"""
+    return count_caps_tokens(text.split())
+
+
+def count_caps_tokens(words: List[str]) -> int:
+    """count_caps_words для вже розбитого text.split()"""
+    return sum(n for w, n in Counter(words).items() if len(w) > 5 and w.isupper())
+
+
+def count_numbers(text: str) -> int:
+    """Числа та десяткові дроби (основа number density)"""
+    return len(_NUMBER_RE.findall(text))
+
+
+def t_quantile(confidence: float, df: int) -> float:
+    """
+    Двосторонній квантиль розподілу Стьюдента (розклад Корніша-Фішера
+    навколо нормального; похибка < 1% для df >= 3)
+    """
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    return (z + (z ** 3 + z) / (4 * df)
+            + (5 * z ** 5 + 16 * z ** 3 + 3 * z) / (96 * df ** 2)
+            + (3 * z ** 7 + 19 * z ** 5 + 17 * z ** 3 - 15 * z) / (384 * df ** 3))
+
+
+# Рівні статусу: (поріг з thresholds, статус, вердикт); останній - без порогу
+STATUS_LEVELS = [
+    ('trusted', 'TRUSTED', 'СТАБІЛЬНИЙ ЛОГІЧНИЙ СИГНАЛ'),
+    ('acceptable', 'ACCEPTABLE', 'ПРИЙНЯТНА СТРУКТУРОВАНА ІНФОРМАЦІЯ'),
+    ('suspicious', 'SUSPICIOUS', 'ПІДОЗРІЛА ЕМОЦІЙНА РИТОРИКА'),
+    ('critical', 'WARNING', 'ВИСОКИЙ РІВЕНЬ МАНІПУЛЯЦІЇ'),
+    (None, 'CRITICAL', 'КРИТИЧНИЙ ІНФОРМАЦІЙНИЙ ХАОС'),
+]
+
+# Колонки матриці метрик (порядок = ключі compute_metrics)
+METRIC_COLUMNS = (
+    'shannon', 'complexity', 'noise', 'signal', 'chaos',
+    'sanity_penalty', 'number_density', 'shout_factor'
+)
+
+
+@dataclass
+class TextFeatures:
+    """
+    Спільний запис ознак документа.
+    Формується один раз у VeritasCalibratedEngine.extract_features
+    і споживається всіма метриками.
+    """
+    char_count: int
+    char_hist: Counter
+    token_counts: Counter
+    word_count: int
+    unique_words: int
+    number_count: int
+    caps_words: int
+    exclamations: int
+    questions: int
+    ukrainian_chars: int
+    language: str = 'en'
+    markers: Dict = field(default_factory=dict)
+
+
+class StreamingFeatureExtractor:
+    """
+    Накопичує TextFeatures по фрагментах тексту з обмеженою пам'яттю.
+    
+    Хвіст фрагмента після останнього пробільного символу переноситься
+    в наступний: жоден токен (\\w+, split() чи число) не містить пробілів,
+    тож лічильники збігаються з обробкою цілого тексту.
+    Перенос без пробілів довший за MAX_CARRY символів обробляється як
+    окремий шматок (токен довший за 64 KB розріжеться на межі).
+    """
+    
+    def __init__(self, engine: 'VeritasCalibratedEngine', precision: int = 14):
+        self.engine = engine
+        self.vocabulary = engine.tracked_vocabulary()
+        self.char_hist = Counter()
+        self.token_counts = Counter()
+        self.distinct = HyperLogLog(precision)
+        self.word_count = 0
+        self.number_count = 0
+        self.caps_words = 0
+        self._carry = ''
+        self._leading = True
+        self._stripped = 0
+        self._pending_ws = 0
+    
+    def feed(self, chunk: str):
+        if not chunk:
+            return
+        self.char_hist.update(chunk)
+        self._track_strip(chunk)
+        
+        # Пробіл шукаємо лише в новому фрагменті - перенос не переглядається
+        cut = _LAST_SPACE_RE.search(chunk)
+        if cut is None:
+            self._carry += chunk
+            if len(self._carry) > MAX_CARRY:
+                self._scan(self._carry)
+                self._carry = ''
+            return
+        self._scan(self._carry + chunk[:cut.end()])
+        self._carry = chunk[cut.end():]
+    
+    def _track_strip(self, chunk: str):
+        """Довжина text.strip() без зберігання тексту"""
+        if self._leading:
+            stripped = chunk.lstrip()
+            if not stripped:
+                return
+            self._leading = False
+            chunk = stripped
+        body = chunk.rstrip()
+        if body:
+            self._stripped += self._pending_ws + len(body)
+            self._pending_ws = len(chunk) - len(body)
+        else:
+            self._pending_ws += len(chunk)
+    
+    def stripped_length(self) -> int:
+        return self._stripped
+    
+    def _scan(self, part: str):
+        tokens = _WORD_RE.findall(part.lower())
+        self.word_count += len(tokens)
+        counts = Counter(tokens)
+        self.distinct.update(counts)
+        for token in counts.keys() & self.vocabulary:
+            self.token_counts[token] += counts[token]
+        self.number_count += count_numbers(part)
+        self.caps_words += count_caps_words(part)
+    
+    def finish(self) -> TextFeatures:
+        if self._carry:
+            self._scan(self._carry)
+            self._carry = ''
+        
+        char_hist = self.char_hist
+        features = TextFeatures(
+            char_count=sum(char_hist.values()),
+            char_hist=char_hist,
+            token_counts=self.token_counts,
+            word_count=self.word_count,
+            unique_words=self.distinct.count(),
+            number_count=self.number_count,
+            caps_words=self.caps_words,
+            exclamations=char_hist['!'],
+            questions=char_hist['?'],
+            ukrainian_chars=sum(char_hist[c] for c in _UKRAINIAN_CHARS),
+        )
+        return self.engine._finalize_features(features)
+
+
+class RollingCharEntropy:
+    """
+    Гістограма символів вікна з O(1) оновленням ентропії.
+    
+    Тримає S = Σ c·log2(c), тоді H = log2(N) - S/N: додавання чи видалення
+    символу змінює лише один доданок.
+    """
+    
+    def __init__(self):
+        self.counts = Counter()
+        self.total = 0
+        self._s = 0.0
+    
+    @staticmethod
+    def _xlog(c: int) -> float:
+        return c * math.log2(c) if c > 1 else 0.0
+    
+    def add(self, chars: str):
+        self._shift(Counter(chars), 1)
+    
+    def remove(self, chars: str):
+        self._shift(Counter(chars), -1)
+    
+    def _shift(self, delta: Counter, sign: int):
+        # Один доданок S на кожен різний символ фрагмента
+        counts, xlog = self.counts, self._xlog
+        for ch, k in delta.items():
+            c = counts[ch]
+            self._s += xlog(c + sign * k) - xlog(c)
+            counts[ch] = c + sign * k
+            self.total += sign * k
+    
+    def entropy(self) -> float:
+        """Ентропія в бітах"""
+        if not self.total:
+            return 0.0
+        return max(0.0, math.log2(self.total) - self._s / self.total)
 
 
 class VeritasCalibratedEngine:
@@ -15,7 +241,14 @@ class VeritasCalibratedEngine:
     Синтез Shannon entropy + markers + sanity checks
     """
     
-    def __init__(self):
+    def __init__(self, timer=None):
+        """
+        Args:
+            timer: veritas_profiling.StageTimer для обліку часу по етапах
+                   (за замовчуванням - вимкнений NULL_TIMER)
+        """
+        self.timer = timer or NULL_TIMER
+        
         # Калібровані пороги
         self.thresholds = {
             'trusted': 0.35,      # Academic papers, pure logic
@@ -24,6 +257,24 @@ class VeritasCalibratedEngine:
             'critical': 0.85      # Propaganda, chaos
         }
         
+        # Ваги синтезу ентропії (_synthesize_entropy / score_columns)
+        self.weights = {
+            'shannon': 0.6,             # Base: Shannon
+            'complexity': 0.4,          # Base: Complexity
+            'marker_mix': 0.3,          # Частка marker ratio у змішуванні з base
+            'number_density': 0.25,     # Цифри знижують ентропію
+            'shout_factor': 0.15,       # Крик підвищує ентропію
+            'sanity_penalty': 0.3,      # Несумісні концепти
+            'academic_discount': 0.75   # Множник для академічних текстів
+        }
+        
+        # Каскадний режим (analyze_cascade): ранні рівні рішень
+        self.cascade = {
+            'shannon_ceiling': 0.75,       # Рівень 0: припущення про Shannon до гістограми
+            'signal_min': 3,               # Рівень 0: мінімум сигнальних маркерів
+            'signal_density': 0.02         # Рівень 0: мінімум сигнальних маркерів на слово
+        }
+        
         # Маркери шуму (емоційна риторика)
         self.noise_markers = {
             'uk': {
@@ -81,49 +332,115 @@ class VeritasCalibratedEngine:
             {'магія', 'криптовалюта', 'сметана', 'magic', 'crypto', 'blockchain'}
         ]
 
+    def version_tag(self) -> str:
+        """
+        Відбиток лексиконів, порогів і ваг: змінюється при будь-якій їх зміні
+        (ключ кешу результатів, див. veritas_cache)
+        """
+        payload = json.dumps(
+            [self.thresholds, self.weights, self.noise_markers, self.signal_markers,
+             self.chaos_markers, self.incompatible_clusters],
+            sort_keys=True, ensure_ascii=False, default=sorted
+        )
+        return 'calibrated/' + hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
     def detect_language(self, text: str) -> str:
         """Визначення мови тексту"""
-        ukrainian_chars = re.findall(r'[їієґ]', text.lower())
-        return 'uk' if len(ukrainian_chars) > 3 else 'en'
+        ukrainian_chars = sum(text.count(c) for c in _UKRAINIAN_CHARS)
+        return 'uk' if ukrainian_chars > 3 else 'en'
+
+    def _language_from_features(self, features: TextFeatures) -> str:
+        return 'uk' if features.ukrainian_chars > 3 else 'en'
 
-    def _shannon_entropy(self, text: str) -> float:
+    def extract_features(self, text: str) -> TextFeatures:
+        """
+        Єдиний етап токенізації / виділення ознак.
+        Усі шість метрик читають цей запис, тож текст обходиться один раз
+        на кожен примітив (гістограма символів, токени, числа, КАПС).
+        """
+        timer = self.timer
+        with timer.stage('tokenization'):
+            char_hist = char_histogram(text)
+            token_counts = Counter(_WORD_RE.findall(text.lower()))
+        with timer.stage('numbers'):
+            number_count = count_numbers(text)
+        with timer.stage('caps'):
+            caps_words = count_caps_words(text)
+        
+        return self.build_features(
+            char_count=len(text),
+            char_hist=char_hist,
+            token_counts=token_counts,
+            number_count=number_count,
+            caps_words=caps_words,
+        )
+
+    def build_features(self, char_count: int, char_hist: Counter, token_counts: Counter,
+                       number_count: int, caps_words: int) -> TextFeatures:
+        """
+        Запис ознак з уже порахованих примітивів
+        (extract_features або спільний кеш ознак ансамблю)
+        """
+        features = TextFeatures(
+            char_count=char_count,
+            char_hist=char_hist,
+            token_counts=token_counts,
+            word_count=sum(token_counts.values()),
+            unique_words=len(token_counts),
+            number_count=number_count,
+            caps_words=caps_words,
+            exclamations=char_hist['!'],
+            questions=char_hist['?'],
+            ukrainian_chars=sum(char_hist[c] for c in _UKRAINIAN_CHARS),
+        )
+        return self._finalize_features(features)
+
+    def _finalize_features(self, features: TextFeatures) -> TextFeatures:
+        """Мова та маркери - залежать від уже зібраних лічильників"""
+        with self.timer.stage('language'):
+            features.language = self._language_from_features(features)
+        with self.timer.stage('markers'):
+            features.markers = self._count_markers(features, features.language)
+        return features
+
+    def tracked_vocabulary(self) -> set:
+        """
+        Усі токени, які впливають на маркери чи sanity check
+        (для потокового режиму, що не зберігає повний словник)
+        """
+        vocabulary = set()
+        for lexicon in (self.noise_markers, self.signal_markers, self.chaos_markers):
+            for markers in lexicon.values():
+                vocabulary |= markers
+        for cluster in self.incompatible_clusters:
+            vocabulary |= cluster
+        return vocabulary
+
+    def _shannon_entropy(self, features: TextFeatures) -> float:
         """
         Розрахунок ентропії Шеннона
         Вимірює інформаційну випадковість на рівні символів
         """
-        if not text:
-            return 0.0
-        
-        # Частоти символів
-        char_freq = {}
-        for char in text:
-            char_freq[char] = char_freq.get(char, 0) + 1
-        
-        # Shannon entropy: H = -Σ(p_i * log2(p_i))
-        entropy = 0.0
-        text_len = len(text)
-        
-        for count in char_freq.values():
-            p = count / text_len
-            if p > 0:
-                entropy -= p * math.log2(p)
+        # Shannon entropy: H = -Σ(p_i * log2(p_i)), векторно по гістограмі.
+        # Нормуємо на суму гістограми (для повторно використаних записів
+        # вона може не збігатися з char_count нового тексту)
+        entropy = histogram_entropy(features.char_hist.values())
         
         # Нормалізація до 0-1 (max entropy для ASCII ≈ 8 bits)
         normalized = min(1.0, entropy / 8.0)
         
         return normalized
 
-    def _calculate_complexity(self, text: str) -> float:
+    def _calculate_complexity(self, features: TextFeatures) -> float:
         """
         Linguistic complexity (vocabulary diversity)
         Низька різноманітність = висока складність (repetitive)
         """
-        words = re.findall(r'\w+', text.lower())
-        if not words:
+        if not features.word_count:
             return 1.0
         
-        unique_words = len(set(words))
-        total_words = len(words)
+        unique_words = features.unique_words
+        total_words = features.word_count
         
         # Vocabulary diversity ratio
         diversity = unique_words / total_words
@@ -139,11 +456,20 @@ class VeritasCalibratedEngine:
         
         return complexity
 
-    def _count_markers(self, words: list, lang: str) -> Dict:
-        """Підрахунок маркерів шуму/сигналу/хаосу"""
-        noise_count = sum(1 for w in words if w in self.noise_markers.get(lang, set()))
-        signal_count = sum(1 for w in words if w in self.signal_markers.get(lang, set()))
-        chaos_count = sum(1 for w in words if w in self.chaos_markers.get(lang, set()))
+    def _count_markers(self, features: TextFeatures, lang: str) -> Dict:
+        """Підрахунок маркерів шуму/сигналу/хаосу (один прохід по унікальних токенах)"""
+        noise = self.noise_markers.get(lang, set())
+        signal = self.signal_markers.get(lang, set())
+        chaos = self.chaos_markers.get(lang, set())
+        
+        noise_count = signal_count = chaos_count = 0
+        for word, n in features.token_counts.items():
+            if word in noise:
+                noise_count += n
+            if word in signal:
+                signal_count += n
+            if word in chaos:
+                chaos_count += n
         
         return {
             'noise': noise_count,
@@ -151,12 +477,12 @@ class VeritasCalibratedEngine:
             'chaos': chaos_count
         }
 
-    def _check_sanity(self, words: list) -> float:
+    def _check_sanity(self, features: TextFeatures) -> float:
         """
         Sanity check: виявлення несумісних концептів
         Returns: 0.0 (sane) to 1.0 (insane)
         """
-        word_set = set(words)
+        word_set = features.token_counts.keys()
         
         for cluster in self.incompatible_clusters:
             matches = cluster & word_set
@@ -166,31 +492,31 @@ class VeritasCalibratedEngine:
         
         return 0.0  # Все нормально
 
-    def _calculate_number_density(self, text: str, word_count: int) -> float:
+    def _calculate_number_density(self, features: TextFeatures) -> float:
         """
         Number density: наявність цифр/статистики
         Високий number density знижує ентропію (факти, дані)
         """
-        if word_count == 0:
+        if features.word_count == 0:
             return 0.0
         
-        numbers = re.findall(r'\d+\.?\d*', text)
-        return len(numbers) / (word_count + 1)
+        return features.number_count / (features.word_count + 1)
 
-    def _calculate_shout_factor(self, text: str, word_count: int) -> float:
+    def _calculate_shout_factor(self, features: TextFeatures) -> float:
         """
         Shout factor: КАПС, знаки оклику
         Високий shout factor підвищує ентропію (емоційна маніпуляція)
         """
+        word_count = features.word_count
         if word_count == 0:
             return 0.0
         
         # CAPS words (>5 chars щоб не чіпати абревіатури)
-        caps_words = len([w for w in text.split() if w.isupper() and len(w) > 5])
+        caps_words = features.caps_words
         
         # Exclamations
-        exclamations = text.count('!')
-        questions = text.count('?')
+        exclamations = features.exclamations
+        questions = features.questions
         
         shout = (exclamations * 2 + caps_words * 3 + questions) / (word_count + 1)
         
@@ -213,111 +539,655 @@ class VeritasCalibratedEngine:
         if not text or len(text.strip()) < 10:
             return {'error': 'Text too short'}
         
-        # Базова обробка
-        lang = self.detect_language(text)
-        words = re.findall(r'\w+', text.lower())
-        word_count = len(words)
+        self.timer.record_size('analyze', len(text))
+        with self.timer.stage('total'):
+            return self.analyze_features(self.extract_features(text))
+
+    def analyze_stream(self, chunks: Iterable[str]) -> Dict:
+        """
+        Потоковий аналіз документа, що не вміщується в пам'ять.
+        
+        Приймає ітератор фрагментів тексту; слова на межах фрагментів
+        склеюються коректно. Пам'ять обмежена: гістограма символів,
+        лічильники маркерів і HyperLogLog для унікальних слів.
+        Результат має ту ж форму, що й analyze(); complexity для
+        дуже великих текстів базується на оцінці HyperLogLog.
+        """
+        extractor = StreamingFeatureExtractor(self)
+        for chunk in chunks:
+            extractor.feed(chunk)
         
-        # 1. Shannon entropy (0-1)
-        shannon = self._shannon_entropy(text)
+        if extractor.stripped_length() < 10:
+            return {'error': 'Text too short'}
         
-        # 2. Complexity (0-1)
-        complexity = self._calculate_complexity(text)
+        return self.analyze_features(extractor.finish())
+
+    def analyze_features(self, features: TextFeatures) -> Dict:
+        """
+        Аналіз за готовим записом ознак (див. extract_features)
+        """
+        metrics = self.compute_metrics(features)
         
-        # 3. Markers
-        markers = self._count_markers(words, lang)
+        # === INSTANT CHAOS CHECK ===
+        if metrics['chaos'] > 0:
+            return self._chaos_result(features, metrics)
         
-        # 4. Sanity check
-        sanity_penalty = self._check_sanity(words)
+        with self.timer.stage('synthesis'):
+            final_entropy = self._synthesize_entropy(metrics)
+        with self.timer.stage('status'):
+            return self._build_result(features, metrics, final_entropy)
+
+    def compute_metrics(self, features: TextFeatures) -> Dict:
+        """Сирі значення шести метрик для запису ознак"""
+        timer = self.timer
+        markers = features.markers
         
+        # 1. Shannon entropy (0-1)
+        with timer.stage('shannon'):
+            shannon = self._shannon_entropy(features)
+        # 2. Complexity (0-1)
+        with timer.stage('complexity'):
+            complexity = self._calculate_complexity(features)
+        # 4. Sanity check
+        with timer.stage('sanity'):
+            sanity_penalty = self._check_sanity(features)
         # 5. Number density (knowledge-reducing factor)
-        number_density = self._calculate_number_density(text, word_count)
-        
+        with timer.stage('number_density'):
+            number_density = self._calculate_number_density(features)
         # 6. Shout factor (entropy-increasing factor)
-        shout_factor = self._calculate_shout_factor(text, word_count)
+        with timer.stage('shout'):
+            shout_factor = self._calculate_shout_factor(features)
         
-        # === INSTANT CHAOS CHECK ===
-        if markers['chaos'] > 0:
-            return {
-                'entropy': 0.99,
-                'status': 'CRITICAL',
-                'verdict': 'КОНСПІРОЛОГІЯ / CHAOS DETECTED',
-                'language': lang.upper(),
-                'diagnostics': {
-                    'chaos_markers': markers['chaos'],
-                    'shannon_entropy': round(shannon, 3),
-                    'word_count': word_count
-                }
-            }
+        return {
+            'shannon': shannon,
+            'complexity': complexity,
+            # 3. Markers (пораховані в _finalize_features)
+            'noise': markers['noise'],
+            'signal': markers['signal'],
+            'chaos': markers['chaos'],
+            'sanity_penalty': sanity_penalty,
+            'number_density': number_density,
+            'shout_factor': shout_factor
+        }
+
+    def _synthesize_entropy(self, metrics: Dict) -> float:
+        """
+        Синтез фінальної ентропії з метрик.
+        Векторизований двійник - score_columns; зміни формули вносити в обидва.
+        """
+        shannon = metrics['shannon']
+        number_density = metrics['number_density']
+        shout_factor = metrics['shout_factor']
+        weights = self.weights
         
         # === СИНТЕЗ ЕНТРОПІЇ ===
         
         # Base: Shannon (0.6 weight) + Complexity (0.4 weight)
         # Але для академічних текстів complexity не є проблемою
-        base_entropy = (shannon * 0.6) + (complexity * 0.4)
+        base_entropy = (shannon * weights['shannon']) + (metrics['complexity'] * weights['complexity'])
         
         # Marker ratio (noise vs signal)
-        if markers['signal'] + markers['noise'] > 0:
-            marker_ratio = markers['noise'] / (markers['signal'] + markers['noise'] + 1)
+        if metrics['signal'] + metrics['noise'] > 0:
+            marker_ratio = metrics['noise'] / (metrics['signal'] + metrics['noise'] + 1)
             # Змішуємо з base
-            base_entropy = (base_entropy * 0.7) + (marker_ratio * 0.3)
+            marker_mix = weights['marker_mix']
+            base_entropy = (base_entropy * (1 - marker_mix)) + (marker_ratio * marker_mix)
         
         # Number density: більше цифр = менше ентропії
-        base_entropy *= (1.0 - number_density * 0.25)
+        base_entropy *= (1.0 - number_density * weights['number_density'])
         
         # Shout factor: більше крику = більше ентропії
-        base_entropy += shout_factor * 0.15
+        base_entropy += shout_factor * weights['shout_factor']
         
         # Sanity penalty
-        base_entropy += sanity_penalty * 0.3
+        base_entropy += metrics['sanity_penalty'] * weights['sanity_penalty']
         
         # Фінальне обмеження
         final_entropy = min(0.99, max(0.0, base_entropy))
         
         # === КАЛІБРУВАННЯ РЕЗУЛЬТАТУ ===
         # Спеціальна корекція для академічних текстів
-        if (markers['signal'] > markers['noise'] * 2 and 
+        if (metrics['signal'] > metrics['noise'] * 2 and 
             number_density > 0.05 and 
             shout_factor < 0.1):
             # Це схоже на академічний текст
-            final_entropy *= 0.75  # Знижуємо ентропію на 25%
+            final_entropy *= weights['academic_discount']  # Знижуємо ентропію на 25%
         
+        return final_entropy
+
+    def _status_level(self, final_entropy: float) -> int:
+        """Індекс у STATUS_LEVELS за порогами"""
+        for level, (threshold, _, _) in enumerate(STATUS_LEVELS[:-1]):
+            if final_entropy < self.thresholds[threshold]:
+                return level
+        return len(STATUS_LEVELS) - 1
+
+    def _chaos_result(self, features: TextFeatures, metrics: Dict) -> Dict:
+        diagnostics = {'chaos_markers': metrics['chaos']}
+        # Каскад рівня 0 не рахує Shannon
+        if 'shannon' in metrics:
+            diagnostics['shannon_entropy'] = round(metrics['shannon'], 3)
+        diagnostics['word_count'] = features.word_count
+        return {
+            'entropy': 0.99,
+            'status': 'CRITICAL',
+            'verdict': 'КОНСПІРОЛОГІЯ / CHAOS DETECTED',
+            'language': features.language.upper(),
+            'diagnostics': diagnostics
+        }
+
+    def _build_result(self, features: TextFeatures, metrics: Dict,
+                      final_entropy: float, level: Optional[int] = None) -> Dict:
         # === ВИЗНАЧЕННЯ СТАТУСУ ===
-        if final_entropy < self.thresholds['trusted']:
-            status = 'TRUSTED'
-            verdict = 'СТАБІЛЬНИЙ ЛОГІЧНИЙ СИГНАЛ'
-        elif final_entropy < self.thresholds['acceptable']:
-            status = 'ACCEPTABLE'
-            verdict = 'ПРИЙНЯТНА СТРУКТУРОВАНА ІНФОРМАЦІЯ'
-        elif final_entropy < self.thresholds['suspicious']:
-            status = 'SUSPICIOUS'
-            verdict = 'ПІДОЗРІЛА ЕМОЦІЙНА РИТОРИКА'
-        elif final_entropy < self.thresholds['critical']:
-            status = 'WARNING'
-            verdict = 'ВИСОКИЙ РІВЕНЬ МАНІПУЛЯЦІЇ'
-        else:
-            status = 'CRITICAL'
-            verdict = 'КРИТИЧНИЙ ІНФОРМАЦІЙНИЙ ХАОС'
+        if level is None:
+            level = self._status_level(final_entropy)
+        _, status, verdict = STATUS_LEVELS[level]
         
         return {
             'entropy': round(final_entropy, 3),
             'status': status,
             'verdict': verdict,
-            'language': lang.upper(),
+            'language': features.language.upper(),
             'diagnostics': {
-                'shannon_entropy': round(shannon, 3),
-                'complexity': round(complexity, 3),
-                'noise_markers': markers['noise'],
-                'signal_markers': markers['signal'],
-                'chaos_markers': markers['chaos'],
-                'number_density': round(number_density, 3),
-                'shout_factor': round(shout_factor, 3),
-                'sanity_penalty': round(sanity_penalty, 3),
-                'word_count': word_count,
-                'char_count': len(text)
+                'shannon_entropy': round(metrics['shannon'], 3),
+                'complexity': round(metrics['complexity'], 3),
+                'noise_markers': metrics['noise'],
+                'signal_markers': metrics['signal'],
+                'chaos_markers': metrics['chaos'],
+                'number_density': round(metrics['number_density'], 3),
+                'shout_factor': round(metrics['shout_factor'], 3),
+                'sanity_penalty': round(metrics['sanity_penalty'], 3),
+                'word_count': features.word_count,
+                'char_count': features.char_count
             }
         }
 
+    # === CASCADE API ===
+
+    def analyze_cascade(self, text: str) -> Dict:
+        """
+        Каскадний аналіз: дешеві рівні вирішують очевидні документи,
+        повний аналіз - лише для неоднозначної середини.
+        
+        - рівень 0: токени + маркери (+ complexity і sanity з того ж лічильника)
+          і shout factor (КАПС-слова, знаки оклику й питання).
+          Хаос-маркери -> CRITICAL (як analyze); явний сигнал (без шуму, досить
+          сигнальних маркерів, оцінка з криком і без чисел < trusted) -> TRUSTED
+        - рівень 1: гістограма символів - точний Shannon, а кількість цифр
+          обмежує number density зверху; якщо обидва краї інтервалу ентропії
+          дають один статус - рішення
+        - рівень 2: числа (найдорожчий прохід); результат = analyze(text)
+        
+        Рішення рівня 1 не відрізняються від analyze за статусом; рівень 0
+        для явного сигналу - евристика (припускає Shannon <= cascade['shannon_ceiling']).
+        
+        Returns:
+            Dict як analyze() з ключем tier (рівень, що ухвалив рішення);
+            рівні 0-1 (крім хаосу) повертають entropy як середину інтервалу
+            entropy_bounds, а diagnostics - лише пораховані метрики
+        """
+        if not text or len(text.strip()) < 10:
+            return {'error': 'Text too short'}
+        
+        timer = self.timer
+        timer.record_size('analyze_cascade', len(text))
+        with timer.stage('total'):
+            # === Рівень 0: маркери ===
+            with timer.stage('tier0'):
+                token_counts = Counter(_WORD_RE.findall(text.lower()))
+                features = TextFeatures(
+                    char_count=len(text),
+                    char_hist=None,
+                    token_counts=token_counts,
+                    word_count=sum(token_counts.values()),
+                    unique_words=len(token_counts),
+                    number_count=0,
+                    caps_words=count_caps_words(text),
+                    exclamations=text.count('!'),
+                    questions=text.count('?'),
+                    ukrainian_chars=sum(text.count(c) for c in _UKRAINIAN_CHARS),
+                )
+                features.language = self._language_from_features(features)
+                features.markers = markers = self._count_markers(features, features.language)
+                metrics = {
+                    'complexity': self._calculate_complexity(features),
+                    **markers,
+                    'sanity_penalty': self._check_sanity(features),
+                    'number_density': 0.0,
+                    'shout_factor': self._calculate_shout_factor(features)
+                }
+                if markers['chaos'] > 0:
+                    return {**self._chaos_result(features, metrics), 'tier': 0}
+                
+                if (markers['noise'] == 0 and not metrics['sanity_penalty']
+                        and markers['signal'] >= self.cascade['signal_min']
+                        and markers['signal'] >= self.cascade['signal_density'] * features.word_count):
+                    ceiling = min(self.cascade['shannon_ceiling'],
+                                  math.log2(features.char_count) / 8.0)
+                    estimate = self._synthesize_entropy({**metrics, 'shannon': ceiling})
+                    if estimate < self.thresholds['trusted']:
+                        return self._cascade_result(features, metrics, (0.0, estimate), 0, tier=0)
+            
+            # === Рівень 1: гістограма символів ===
+            with timer.stage('tier1'):
+                char_hist = features.char_hist = char_histogram(text)
+                metrics['shannon'] = self._shannon_entropy(features)
+                
+                # Кожне число містить цифру: кількість цифр обмежує number density.
+                # Ентропія спадає з number density (академічна знижка лише
+                # додатково знижує нижній край), тож досить двох крайніх точок
+                digits = sum(n for ch, n in char_hist.items() if ch.isdecimal())
+                low = self._synthesize_entropy({
+                    **metrics,
+                    'number_density': self._calculate_number_density(replace(features, number_count=digits))
+                })
+                high = self._synthesize_entropy({**metrics, 'number_density': 0.0})
+                level = self._status_level(low)
+                if level == self._status_level(high):
+                    return self._cascade_result(features, metrics, (low, high), level, tier=1)
+            
+            # === Рівень 2: числа (найдорожчий прохід) ===
+            with timer.stage('tier2'):
+                features.number_count = count_numbers(text)
+                return {**self.analyze_features(features), 'tier': 2}
+
+    def _cascade_result(self, features: TextFeatures, metrics: Dict, bounds,
+                        level: int, tier: int) -> Dict:
+        _, status, verdict = STATUS_LEVELS[level]
+        low, high = bounds
+        # Лише точно пораховані метрики (number density рахує рівень 2)
+        diagnostics = {}
+        if 'shannon' in metrics:
+            diagnostics['shannon_entropy'] = round(metrics['shannon'], 3)
+        diagnostics.update({
+            'complexity': round(metrics['complexity'], 3),
+            'noise_markers': metrics['noise'],
+            'signal_markers': metrics['signal'],
+            'chaos_markers': metrics['chaos'],
+            'sanity_penalty': round(metrics['sanity_penalty'], 3),
+            'shout_factor': round(metrics['shout_factor'], 3),
+            'word_count': features.word_count,
+            'char_count': features.char_count
+        })
+        
+        return {
+            'entropy': round((low + high) / 2, 3),
+            'entropy_bounds': [round(low, 3), round(high, 3)],
+            'status': status,
+            'verdict': verdict,
+            'language': features.language.upper(),
+            'tier': tier,
+            'diagnostics': diagnostics
+        }
+
+    # === APPROXIMATE API ===
+
+    def analyze_approximate(self, text: str, token_budget: int = 20000,
+                            time_budget: Optional[float] = None, window: int = 200,
+                            groups: int = 10, confidence: float = 0.95, seed: int = 0) -> Dict:
+        """
+        Наближений аналіз дуже великих текстів за вибіркою вікон.
+        
+        Текст ділиться на рівні страти, з кожної береться одне вікно
+        (~window слів, межі - по пробілах) у випадковій позиції; сумарно
+        ~token_budget слів, тож робота не залежить від розміру тексту.
+        Вікна розкладаються на `groups` перемежованих підвибірок, кожна
+        з яких покриває весь текст. Оцінка рахується на всіх вікнах разом,
+        довірчий інтервал - з розкиду оцінок підвибірок (t-інтервал).
+        
+        Лічильники масштабуються на весь текст; кількість унікальних слів
+        екстраполюється за законом Хіпса (показник - з росту словника
+        між половиною і всією вибіркою). Хаос-маркери шукаються лише у вибірці.
+        
+        Args:
+            text: Текст
+            token_budget: Скільки слів аналізувати (не більше
+                          token_budget * MAX_CHARS_PER_WORD символів)
+            time_budget: Ліміт часу в секундах (перевіряється після кожної
+                         підвибірки; щонайменше дві обробляються завжди)
+            window: Розмір вікна в словах
+            groups: Кількість підвибірок для довірчого інтервалу
+            confidence: Рівень довіри інтервалу
+            seed: Зерно вибору позицій вікон (відтворюваність)
+        
+        Returns:
+            Dict як analyze() плюс approximate, entropy_interval, confidence
+            і sample (windows, groups, sampled_chars, fraction); текст, що
+            вміщується в бюджет, аналізується точно (approximate=False)
+        """
+        if not text or len(text.strip()) < 10:
+            return {'error': 'Text too short'}
+        
+        # Символів на слово - з початку тексту; бюджет діє і в символах
+        probe = text[:4096]
+        chars_per_word = min(MAX_CHARS_PER_WORD, len(probe) / max(1, len(probe.split())))
+        window_chars = max(1, int(window * chars_per_word))
+        windows = max(groups, -(-token_budget // window))
+        windows = -(-windows // groups) * groups
+        
+        if len(text) <= windows * window_chars:
+            result = self.analyze(text)
+            return {**result, 'approximate': False,
+                    'entropy_interval': [result['entropy'], result['entropy']],
+                    'confidence': confidence}
+        
+        started = time.perf_counter()
+        rnd = random.Random(seed)
+        stratum = len(text) / windows
+        group_samples = []
+        for g in range(groups):
+            sample = {'char_hist': Counter(), 'token_counts': Counter(), 'chars': 0,
+                      'numbers': 0, 'caps': 0, 'windows': 0}
+            # Підвибірка g - страти g, g + groups, ...: рівномірно по тексту
+            for i in range(g, windows, groups):
+                chunk = self._sample_window(text, int(i * stratum), int((i + 1) * stratum),
+                                            window_chars, rnd)
+                if not chunk:
+                    continue
+                sample['char_hist'].update(char_histogram(chunk))
+                sample['token_counts'].update(_WORD_RE.findall(chunk.lower()))
+                sample['numbers'] += count_numbers(chunk)
+                sample['caps'] += count_caps_words(chunk)
+                sample['chars'] += len(chunk)
+                sample['windows'] += 1
+            group_samples.append(sample)
+            if (time_budget is not None and len(group_samples) >= 2
+                    and time.perf_counter() - started > time_budget):
+                break
+        
+        # Закон Хіпса U ~ n^beta: показник з першої половини підвибірок і всіх
+        pooled = self._pool_samples(group_samples)
+        half = self._pool_samples(group_samples[:max(1, len(group_samples) // 2)])
+        n_all, n_half = sum(pooled['token_counts'].values()), sum(half['token_counts'].values())
+        beta = 1.0
+        if n_half and n_all > n_half and len(half['token_counts']):
+            beta = math.log(len(pooled['token_counts']) / len(half['token_counts'])) / math.log(n_all / n_half)
+            beta = min(1.0, max(0.0, beta))
+        
+        result = self._approximate_result(pooled, len(text), beta)
+        estimates = [self._approximate_result(sample, len(text), beta)['entropy']
+                     for sample in group_samples if sample['chars']]
+        if len(estimates) >= 2:
+            half_width = t_quantile(confidence, len(estimates) - 1) * stdev(estimates) / math.sqrt(len(estimates))
+        else:
+            half_width = 0.99
+        
+        return {
+            **result,
+            'approximate': True,
+            'entropy_interval': [round(max(0.0, result['entropy'] - half_width), 3),
+                                 round(min(0.99, result['entropy'] + half_width), 3)],
+            'confidence': confidence,
+            'sample': {
+                'windows': pooled['windows'],
+                'groups': len(group_samples),
+                'sampled_chars': pooled['chars'],
+                'fraction': round(pooled['chars'] / len(text), 4)
+            }
+        }
+
+    @staticmethod
+    def _sample_window(text: str, lo: int, hi: int, window_chars: int, rnd: random.Random) -> str:
+        """
+        Вікно з випадковою позицією в страті [lo, hi), обрізане до цілих слів;
+        якщо після обрізання нічого не лишилось (немає пробілів) - сирі
+        window_chars символів
+        """
+        start = lo + rnd.randrange(max(1, hi - lo - window_chars))
+        raw = text[start:start + window_chars + 1]
+        chunk = raw
+        # Недорізане слово на початку
+        if start > 0 and not text[start - 1].isspace():
+            cut = _SPACE_RE.search(chunk)
+            chunk = chunk[cut.end():] if cut else ''
+        # ... і в кінці
+        if chunk and start + len(raw) < len(text):
+            cut = _LAST_SPACE_RE.search(chunk)
+            chunk = chunk[:cut.start()] if cut else ''
+        if not _WORD_RE.search(chunk):
+            return raw[:window_chars]
+        return chunk
+
+    @staticmethod
+    def _pool_samples(samples: List[Dict]) -> Dict:
+        pooled = {'char_hist': Counter(), 'token_counts': Counter(), 'chars': 0,
+                  'numbers': 0, 'caps': 0, 'windows': 0}
+        for sample in samples:
+            pooled['char_hist'].update(sample['char_hist'])
+            pooled['token_counts'].update(sample['token_counts'])
+            for key in ('chars', 'numbers', 'caps', 'windows'):
+                pooled[key] += sample[key]
+        return pooled
+
+    def _approximate_result(self, sample: Dict, char_count: int, beta: float) -> Dict:
+        """Результат analyze для вибірки, відмасштабованої на char_count символів"""
+        scale = char_count / sample['chars'] if sample['chars'] else 0.0
+        sampled_words = sum(sample['token_counts'].values())
+        word_count = round(sampled_words * scale)
+        token_counts = Counter({token: round(n * scale) for token, n in sample['token_counts'].items()})
+        char_hist = sample['char_hist']
+        
+        features = TextFeatures(
+            char_count=char_count,
+            char_hist=char_hist,
+            token_counts=token_counts,
+            word_count=word_count,
+            unique_words=min(word_count, round(len(sample['token_counts']) * scale ** beta)),
+            number_count=round(sample['numbers'] * scale),
+            caps_words=round(sample['caps'] * scale),
+            exclamations=round(char_hist['!'] * scale),
+            questions=round(char_hist['?'] * scale),
+            ukrainian_chars=round(sum(char_hist[c] for c in _UKRAINIAN_CHARS) * scale),
+        )
+        return self.analyze_features(self._finalize_features(features))
+
+    # === PROFILE API ===
+
+    def entropy_profile(self, text: str, window: int = 200, stride: int = 50) -> List[Dict]:
+        """
+        Профіль тексту по ковзних вікнах: яка частина статті тягне оцінку вгору.
+        
+        Вікно - це `window` слів (text.split()) зі зсувом `stride`; зріз вікна
+        text[start:end] починається першим і закінчується останнім словом.
+        Жоден токен (\\w+, число, КАПС-слово) не містить пробілів, тож лічильники
+        слів рахуються один раз на слово і сумуються префіксними сумами,
+        а гістограма символів оновлюється при зсуві (додаються/видаляються
+        лише символи на краях). Загальна вартість O(n), значення збігаються
+        з analyze(text[start:end]).
+        
+        Args:
+            text: Текст статті
+            window: Розмір вікна в словах
+            stride: Зсув вікна в словах
+            
+        Returns:
+            List[Dict]: start, end (символьні зміщення), language, shannon_entropy,
+                        marker_density, noise/signal/chaos_markers, shout_factor, word_count
+        """
+        if window < 1 or stride < 1:
+            raise ValueError("window and stride must be positive")
+        
+        spans = [m.span() for m in _SPLIT_WORD_RE.finditer(text)]
+        if not spans:
+            return []
+        
+        # Лічильники на слово: \w+ токени, КАПС, числа, маркери обох мов.
+        # Посимвольні ознаки (!, ?, українські літери) беруться з гістограми вікна.
+        n = len(spans)
+        per_word = {key: [0] * n for key in ('tokens', 'caps', 'numbers')}
+        marker_keys: Dict[str, List] = {}
+        for lang in ('en', 'uk'):
+            for kind, lexicon in (('noise', self.noise_markers),
+                                  ('signal', self.signal_markers),
+                                  ('chaos', self.chaos_markers)):
+                per_word[(lang, kind)] = [0] * n
+                for marker in lexicon.get(lang, ()):
+                    marker_keys.setdefault(marker, []).append((lang, kind))
+        
+        tokens_per_word, caps_per_word = per_word['tokens'], per_word['caps']
+        for i, (start, end) in enumerate(spans):
+            word = text[start:end]
+            tokens = _WORD_RE.findall(word.lower())
+            tokens_per_word[i] = len(tokens)
+            if len(word) > 5 and word.isupper():
+                caps_per_word[i] = 1
+            for token in tokens:
+                for key in marker_keys.get(token, ()):
+                    per_word[key][i] += 1
+        
+        # Числа не перетинають пробіли: прив'язуємо кожне до слова за позицією
+        word_starts = [start for start, _ in spans]
+        numbers_per_word = per_word['numbers']
+        for match in _NUMBER_RE.finditer(text):
+            numbers_per_word[bisect_right(word_starts, match.start()) - 1] += 1
+        
+        prefix = {key: [0, *accumulate(values)] for key, values in per_word.items()}
+        
+        starts = list(range(0, max(n - window, 0) + 1, stride))
+        if starts[-1] + window < n:
+            starts.append(n - window)  # Останнє вікно - до кінця тексту
+        
+        rolling = RollingCharEntropy()
+        lo = hi = 0
+        profile = []
+        for first in starts:
+            last = min(first + window, n)
+            begin, end = spans[first][0], spans[last - 1][1]
+            
+            # Зсув гістограми: прибираємо лівий край, додаємо правий
+            if begin >= hi:
+                rolling = RollingCharEntropy()
+                rolling.add(text[begin:end])
+            else:
+                rolling.remove(text[lo:begin])
+                rolling.add(text[hi:end])
+            lo, hi = begin, end
+            
+            sums = {key: values[last] - values[first] for key, values in prefix.items()}
+            char_hist = rolling.counts
+            ukrainian_chars = sum(char_hist[c] for c in _UKRAINIAN_CHARS)
+            word_count = sums['tokens']
+            lang = 'uk' if ukrainian_chars > 3 else 'en'
+            noise = sums[(lang, 'noise')]
+            signal = sums[(lang, 'signal')]
+            chaos = sums[(lang, 'chaos')]
+            
+            features = TextFeatures(
+                char_count=end - begin,
+                char_hist=Counter(),
+                token_counts=Counter(),
+                word_count=word_count,
+                unique_words=0,
+                number_count=sums['numbers'],
+                caps_words=sums['caps'],
+                exclamations=char_hist['!'],
+                questions=char_hist['?'],
+                ukrainian_chars=ukrainian_chars,
+                language=lang,
+            )
+            shannon = min(1.0, rolling.entropy() / 8.0)
+            
+            profile.append({
+                'start': begin,
+                'end': end,
+                'language': lang.upper(),
+                'shannon_entropy': round(shannon, 3),
+                'marker_density': round((noise + signal + chaos) / word_count, 3) if word_count else 0.0,
+                'noise_markers': noise,
+                'signal_markers': signal,
+                'chaos_markers': chaos,
+                'shout_factor': round(self._calculate_shout_factor(features), 3),
+                'word_count': word_count
+            })
+        return profile
+
+    # === BATCH API ===
+
+    def analyze_batch(self, texts: List[str]) -> List[Dict]:
+        """
+        Пакетний аналіз: ознаки збираються в колонкову матрицю,
+        формула ентропії, академічна корекція та пороги статусів
+        застосовуються векторно (NumPy) до всього пакета.
+        
+        Результат ідентичний [self.analyze(t) for t in texts].
+        Без NumPy - падає назад на скалярний шлях.
+        """
+        if np is None:
+            return [self.analyze(text) for text in texts]
+        
+        results: List[Optional[Dict]] = [None] * len(texts)
+        rows = []
+        for i, text in enumerate(texts):
+            if not text or len(text.strip()) < 10:
+                results[i] = {'error': 'Text too short'}
+                continue
+            features = self.extract_features(text)
+            rows.append((i, features, self.compute_metrics(features)))
+        
+        if not rows:
+            return results
+        
+        columns = self.feature_columns([metrics for _, _, metrics in rows])
+        final_entropy, levels = self.score_columns(columns)
+        
+        for (i, features, metrics), entropy, level in zip(rows, final_entropy.tolist(), levels.tolist()):
+            if metrics['chaos'] > 0:
+                results[i] = self._chaos_result(features, metrics)
+            else:
+                results[i] = self._build_result(features, metrics, entropy, level)
+        return results
+
+    def feature_columns(self, metrics_rows: List[Dict]) -> Dict[str, 'np.ndarray']:
+        """Колонкова матриця метрик: {назва метрики: float64 масив}"""
+        return {
+            name: np.fromiter((m[name] for m in metrics_rows), dtype=np.float64, count=len(metrics_rows))
+            for name in METRIC_COLUMNS
+        }
+
+    def score_columns(self, columns: Dict[str, 'np.ndarray'], weights: Optional[Dict] = None,
+                      thresholds: Optional[Dict] = None):
+        """
+        Векторизований двійник _synthesize_entropy + _status_level.
+        
+        weights / thresholds (за замовчуванням - self.weights / self.thresholds)
+        можуть містити масиви: форми транслюються з колонками, тож форма
+        (P, 1) проти колонок (D,) дає оцінки P комбінацій параметрів x D документів
+        за один прохід (див. veritas_calibration).
+        
+        Returns:
+            (final_entropy, levels) - масиви float64 та індексів STATUS_LEVELS
+        """
+        weights = self.weights if weights is None else {**self.weights, **weights}
+        thresholds = self.thresholds if thresholds is None else {**self.thresholds, **thresholds}
+        
+        noise = columns['noise']
+        signal = columns['signal']
+        number_density = columns['number_density']
+        shout_factor = columns['shout_factor']
+        
+        base_entropy = (columns['shannon'] * weights['shannon']) + (columns['complexity'] * weights['complexity'])
+        
+        marker_ratio = noise / (signal + noise + 1)
+        marker_mix = weights['marker_mix']
+        base_entropy = np.where(signal + noise > 0,
+                                (base_entropy * (1 - marker_mix)) + (marker_ratio * marker_mix),
+                                base_entropy)
+        
+        base_entropy = base_entropy * (1.0 - number_density * weights['number_density'])
+        base_entropy = base_entropy + shout_factor * weights['shout_factor']
+        base_entropy = base_entropy + columns['sanity_penalty'] * weights['sanity_penalty']
+        
+        final_entropy = np.minimum(0.99, np.maximum(0.0, base_entropy))
+        
+        academic = (signal > noise * 2) & (number_density > 0.05) & (shout_factor < 0.1)
+        final_entropy = np.where(academic, final_entropy * weights['academic_discount'], final_entropy)
+        
+        # Рівень = кількість порогів, не вищих за ентропію (пороги зростають)
+        levels = sum((final_entropy >= thresholds[name]).astype(np.int64)
+                     for name, _, _ in STATUS_LEVELS[:-1])
+        
+        return final_entropy, levels
+
 
 # Standalone testing
 if __name__ == "__main__":
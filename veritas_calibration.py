@@ -0,0 +1,306 @@
+"""
+Veritas Protocol - Calibration Feature Store & Sweep
+Калібрування порогів і ваг VeritasCalibratedEngine без повторного читання текстів.
+
+- FeatureStore: SQLite з сирими метриками кожного документа
+  (shannon, complexity, маркери, sanity, number_density, shout_factor) і міткою
+- sweep(): тисячі комбінацій ваг/порогів як NumPy-трансляція
+  (комбінації x документи) через VeritasCalibratedEngine.score_columns,
+  з матрицею помилок для кожної комбінації
+
+Метрики залежать лише від лексиконів, тож після зміни маркерів
+сховище треба наповнити заново; ваги й пороги можна міняти вільно.
+
+CLI:
+    python veritas_calibration.py ingest labels.csv --store calibration.db
+    python veritas_calibration.py sweep --store calibration.db \\
+        --param trusted=0.25:0.45:0.02 --param shout_factor=0.1:0.3:0.05 --top 5
+"""
+
+import argparse
+import csv
+import json
+import sqlite3
+import time
+from itertools import product
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # NumPy потрібен для FeatureStore.load і sweep
+    np = None
+
+from veritas_calibrated_core import METRIC_COLUMNS, STATUS_LEVELS, VeritasCalibratedEngine
+
+STATUSES = [status for _, status, _ in STATUS_LEVELS]
+CRITICAL_LEVEL = len(STATUS_LEVELS) - 1
+
+# Максимум клітинок (комбінації x документи) в одному проході sweep
+SWEEP_CELLS_LIMIT = 1 << 21
+
+
+class FeatureStore:
+    """
+    Персистентне сховище метрик документів
+
+    Example:
+        >>> store = FeatureStore('calibration.db')
+        >>> store.add('case_01', text, label='TRUSTED')
+        >>> doc_ids, labels, columns = store.load()
+    """
+
+    def __init__(self, db_path: str = ':memory:', engine: Optional[VeritasCalibratedEngine] = None):
+        """
+        Args:
+            db_path: Файл SQLite (':memory:' - лише в пам'яті)
+            engine: Движок для обчислення метрик (створюється, якщо не передано)
+        """
+        if np is None:
+            raise ImportError("FeatureStore requires numpy (pip install numpy)")
+        self.engine = engine or VeritasCalibratedEngine()
+        self.conn = sqlite3.connect(db_path)
+        columns = ', '.join(f"{name} REAL NOT NULL" for name in METRIC_COLUMNS)
+        self.conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS features (
+                doc_id TEXT PRIMARY KEY,
+                label TEXT,
+                {columns}
+            )
+        """)
+        self.conn.commit()
+
+    def add(self, doc_id: str, text: str, label: Optional[str] = None) -> Optional[Dict]:
+        """
+        Рахує і зберігає метрики документа
+
+        Returns:
+            Dict метрик або None для надто короткого тексту
+        """
+        if not text or len(text.strip()) < 10:
+            return None
+        if label is not None and label not in STATUSES:
+            raise ValueError(f"Unknown label: {label} (expected one of {STATUSES})")
+
+        metrics = self.engine.compute_metrics(self.engine.extract_features(text))
+        placeholders = ', '.join('?' for _ in range(len(METRIC_COLUMNS) + 2))
+        self.conn.execute(
+            f"INSERT OR REPLACE INTO features (doc_id, label, {', '.join(METRIC_COLUMNS)}) "
+            f"VALUES ({placeholders})",
+            (doc_id, label, *(float(metrics[name]) for name in METRIC_COLUMNS))
+        )
+        self.conn.commit()
+        return metrics
+
+    def load(self, labelled_only: bool = True) -> Tuple[List[str], 'np.ndarray', Dict[str, 'np.ndarray']]:
+        """
+        Колонки метрик для sweep
+
+        Returns:
+            (doc_ids, labels, columns): labels - індекси STATUS_LEVELS (-1 без мітки),
+            columns - {метрика: float64 масив}
+        """
+        query = f"SELECT doc_id, label, {', '.join(METRIC_COLUMNS)} FROM features"
+        if labelled_only:
+            query += " WHERE label IS NOT NULL"
+        rows = self.conn.execute(query + " ORDER BY doc_id").fetchall()
+
+        doc_ids = [row[0] for row in rows]
+        labels = np.array([STATUSES.index(row[1]) if row[1] else -1 for row in rows], dtype=np.int64)
+        matrix = np.array([row[2:] for row in rows], dtype=np.float64).reshape(len(rows), len(METRIC_COLUMNS))
+        columns = {name: matrix[:, i] for i, name in enumerate(METRIC_COLUMNS)}
+        return doc_ids, labels, columns
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM features").fetchone()[0]
+
+    def close(self):
+        self.conn.close()
+
+
+def parameter_grid(grid: Dict[str, Sequence[float]]) -> Dict[str, 'np.ndarray']:
+    """
+    Декартів добуток значень параметрів
+
+    Returns:
+        {параметр: масив довжини P} - P комбінацій
+    """
+    names = list(grid)
+    combos = np.array(list(product(*(grid[name] for name in names))), dtype=np.float64)
+    return {name: combos[:, i] for i, name in enumerate(names)}
+
+
+def confusion_matrices(labels: 'np.ndarray', predicted: 'np.ndarray') -> 'np.ndarray':
+    """
+    Матриці помилок для всіх комбінацій одним bincount
+
+    Args:
+        labels: (D,) індекси справжніх статусів
+        predicted: (P, D) передбачені індекси
+
+    Returns:
+        (P, S, S): [комбінація, справжній статус, передбачений статус]
+    """
+    n = len(STATUSES)
+    combos = predicted.shape[0]
+    cells = labels[None, :] * n + predicted + (np.arange(combos) * n * n)[:, None]
+    return np.bincount(cells.ravel(), minlength=combos * n * n).reshape(combos, n, n)
+
+
+def sweep(columns: Dict[str, 'np.ndarray'], labels: 'np.ndarray', grid: Dict[str, Sequence[float]],
+          engine: Optional[VeritasCalibratedEngine] = None, top: int = 10) -> Dict:
+    """
+    Оцінює всі комбінації ваг/порогів із grid на збережених метриках
+
+    Args:
+        columns: Колонки метрик (FeatureStore.load)
+        labels: Індекси справжніх статусів
+        grid: {назва ваги чи порогу: значення}; решта параметрів - з движка
+        engine: Движок (його weights/thresholds - базові значення)
+        top: Скільки найкращих комбінацій повернути
+
+    Returns:
+        Dict: combinations, evaluated (без комбінацій зі спадними порогами),
+              seconds, baseline (поточні параметри), best (top-N з матрицями помилок)
+    """
+    if np is None:
+        raise ImportError("sweep requires numpy (pip install numpy)")
+    engine = engine or VeritasCalibratedEngine()
+    unknown = set(grid) - set(engine.weights) - set(engine.thresholds)
+    if unknown:
+        raise ValueError(f"Unknown parameters: {sorted(unknown)}")
+
+    start = time.perf_counter()
+    params = parameter_grid(grid)
+    total = len(next(iter(params.values()))) if params else 1
+
+    # Пороги мусять зростати, інакше статус не визначений
+    threshold_names = [name for name, _, _ in STATUS_LEVELS[:-1]]
+    bounds = np.array([np.broadcast_to(params.get(name, engine.thresholds[name]), (total,))
+                       for name in threshold_names])
+    valid = np.all(np.diff(bounds, axis=0) > 0, axis=0)
+    params = {name: values[valid] for name, values in params.items()}
+    combos = int(valid.sum())
+
+    chaos = columns['chaos'] > 0
+    docs = len(labels)
+    accuracy = np.zeros(combos)
+    confusion = np.zeros((combos, len(STATUSES), len(STATUSES)), dtype=np.int64)
+
+    step = max(1, SWEEP_CELLS_LIMIT // max(docs, 1))
+    for lo in range(0, combos, step):
+        hi = min(lo + step, combos)
+        part = {name: values[lo:hi, None] for name, values in params.items()}
+        _, levels = engine.score_columns(
+            columns,
+            weights={k: v for k, v in part.items() if k in engine.weights},
+            thresholds={k: v for k, v in part.items() if k in engine.thresholds}
+        )
+        levels = np.broadcast_to(levels, (hi - lo, docs))
+        # Хаос-маркери замикають результат на CRITICAL незалежно від формули
+        levels = np.where(chaos, CRITICAL_LEVEL, levels)
+        accuracy[lo:hi] = (levels == labels).mean(axis=1) if docs else 0.0
+        confusion[lo:hi] = confusion_matrices(labels, levels)
+
+    _, base_levels = engine.score_columns(columns)
+    base_levels = np.where(chaos, CRITICAL_LEVEL, base_levels)
+
+    order = np.argsort(-accuracy, kind='stable')[:top]
+    return {
+        'combinations': total,
+        'evaluated': combos,
+        'documents': docs,
+        'seconds': round(time.perf_counter() - start, 3),
+        'baseline': {
+            'accuracy': round(float((base_levels == labels).mean()) if docs else 0.0, 4),
+            'confusion': confusion_matrices(labels, base_levels[None, :])[0].tolist()
+        },
+        'best': [
+            {
+                'params': {name: round(float(values[i]), 6) for name, values in params.items()},
+                'accuracy': round(float(accuracy[i]), 4),
+                'confusion': confusion[i].tolist()
+            }
+            for i in order
+        ]
+    }
+
+
+def parse_range(spec: str) -> Tuple[str, List[float]]:
+    """'name=start:stop:step' або 'name=v1,v2,v3' -> (name, значення)"""
+    name, _, values = spec.partition('=')
+    if ':' in values:
+        start, stop, step = (float(v) for v in values.split(':'))
+        count = int(round((stop - start) / step)) + 1
+        return name, [round(start + i * step, 6) for i in range(count)]
+    return name, [float(v) for v in values.split(',')]
+
+
+def ingest(store: FeatureStore, labels_csv: str) -> int:
+    """
+    Наповнює сховище з CSV (path,label): шляхи - відносно CSV-файлу
+
+    Returns:
+        int: Кількість збережених документів
+    """
+    base = Path(labels_csv).parent
+    stored = 0
+    with open(labels_csv, encoding='utf-8', newline='') as f:
+        for row in csv.DictReader(f):
+            path = base / row['path']
+            if store.add(row['path'], path.read_text(encoding='utf-8'), row.get('label') or None):
+                stored += 1
+    return stored
+
+
+def format_confusion(matrix: List[List[int]]) -> str:
+    width = max(len(s) for s in STATUSES)
+    lines = [' ' * width + ' ' + ' '.join(f"{s[:4]:>5}" for s in STATUSES)]
+    for status, row in zip(STATUSES, matrix):
+        lines.append(f"{status:>{width}} " + ' '.join(f"{n:>5}" for n in row))
+    return '\n'.join(lines)
+
+
+def main(argv: Optional[Iterable[str]] = None):
+    parser = argparse.ArgumentParser(description='Veritas Protocol - calibration sweep')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p_ingest = sub.add_parser('ingest', help='Порахувати метрики розмічених текстів')
+    p_ingest.add_argument('labels', help='CSV з колонками path,label')
+    p_ingest.add_argument('--store', default='calibration.db')
+
+    p_sweep = sub.add_parser('sweep', help='Перебір ваг/порогів по збережених метриках')
+    p_sweep.add_argument('--store', default='calibration.db')
+    p_sweep.add_argument('--grid', help='JSON {параметр: [значення]}')
+    p_sweep.add_argument('--param', action='append', default=[],
+                         help='name=start:stop:step або name=v1,v2 (можна повторювати)')
+    p_sweep.add_argument('--top', type=int, default=5)
+    p_sweep.add_argument('--json', action='store_true', help='Вивести результат як JSON')
+
+    args = parser.parse_args(argv)
+    store = FeatureStore(args.store)
+
+    if args.command == 'ingest':
+        print(f"Stored {ingest(store, args.labels)} documents ({len(store)} in {args.store})")
+        return
+
+    grid = json.loads(Path(args.grid).read_text(encoding='utf-8')) if args.grid else {}
+    grid.update(parse_range(spec) for spec in args.param)
+    _, labels, columns = store.load()
+    report = sweep(columns, labels, grid, store.engine, top=args.top)
+
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+        return
+
+    print(f"{report['evaluated']}/{report['combinations']} combinations x "
+          f"{report['documents']} documents in {report['seconds']}s")
+    print(f"\nbaseline accuracy {report['baseline']['accuracy']}")
+    print(format_confusion(report['baseline']['confusion']))
+    for rank, entry in enumerate(report['best'], 1):
+        print(f"\n#{rank} accuracy {entry['accuracy']} {entry['params']}")
+        print(format_confusion(entry['confusion']))
+
+
+if __name__ == "__main__":
+    main()
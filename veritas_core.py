@@ -1,15 +1,48 @@
+import hashlib
+import json
 import math
 
+from veritas_registry import ConcurrentRegistry, DecayingRegistry, ReputationIndex
+
 class VeritasCore:
     """
     Veritas Protocol - Core Engine (LAC-7.2/Final)
     Центральний механізм Logic Authenticity Check (LAC) та управління станами.
     Ref: etrij-2026-0035
     """
-    def __init__(self, initial_state="INITIALIZING"):
+    # Абсолютні маркери хаосу (Елементи ентропії IV рівня)
+    CHAOS_MARKERS = {"рептилоїди", "lizard", "magic", "таємний", "змова", "плоска"}
+    # Максимальна ентропія (хаос)
+    CHAOS_ENTROPY = 0.99
+    # Маркери 'шуму' (ентропія)
+    NOISE_MARKERS = {
+        "етично", "необхідно", "важливо", "неприпустимо", "історично",
+        "фундаментально", "занепокоєння", "перемога", "збитки", "довіра"
+    }
+    # Маркери 'сигналу' (ламінарність)
+    SIGNAL_MARKERS = {
+        "якщо", "тоді", "тому", "внаслідок", "дорівнює", "факт",
+        "ресурс", "чип", "наказ", "координати", "результат"
+    }
+
+    def __init__(self, initial_state="INITIALIZING", registry=None, half_life=None):
+        """
+        Args:
+            initial_state: Початковий стан
+            registry: Сховище репутацій (напр. veritas_journal.JournaledRegistry);
+                      за замовчуванням - dict у пам'яті. Обгортається в
+                      ConcurrentRegistry: оновлення репутації атомарні
+            half_life: Період напівзгасання репутації до 0.5 в секундах
+                       (None - без згасання); з ConcurrentRegistry - ValueError
+        """
+        if half_life is not None and isinstance(registry, ConcurrentRegistry):
+            # Обгортка зламала б атомарність оновлень самого реєстру
+            # (напр. міжпроцесне блокування SharedReputationTable)
+            raise ValueError("half_life needs a plain registry; "
+                             "pass DecayingRegistry(...) as registry instead")
         self.initial_state = initial_state
         # Початкова репутація ключових вузлів (0.0 to 1.0)
-        self.reputation_registry = {
+        initial_nodes = {
             "Ethical_Council_UA": 0.95,
             "Prosecutor_Council_UA": 0.42,
             "Davos_Global_Rhetoric": 0.38,
@@ -17,6 +50,19 @@ class VeritasCore:
             "NBC_News_Greenland": 0.50,
             "Taiwan_Semi_Official": 0.85
         }
+        if registry is None:
+            registry = initial_nodes
+        else:
+            # Збережена репутація має пріоритет над початковою
+            for node, value in initial_nodes.items():
+                registry.setdefault(node, value)
+        # ReputationIndex - top-K і квантилі без сортування всього реєстру
+        # (лише без згасання: індекс не бачить згаслих значень)
+        if half_life is not None and not isinstance(registry, ConcurrentRegistry):
+            registry = DecayingRegistry(registry, half_life=half_life, default_reputation=0.5)
+        elif not isinstance(registry, ConcurrentRegistry):
+            registry = ConcurrentRegistry(registry, index=ReputationIndex())
+        self.reputation_registry = registry
 
     def _calculate_entropy_coefficient(self, text):
         """
@@ -24,27 +70,21 @@ class VeritasCore:
         Вимірює співвідношення демагогічного шуму до логічного сигналу.
         """
         words = text.lower().replace(",", "").replace(".", "").split()
+        return self.entropy_from_words(words)
+
+    def entropy_from_words(self, words):
+        """
+        Індекс ентропії за вже розбитими словами
+        (lower, без ком і крапок, split) - для спільного кешу ознак.
+        """
         if not words:
             return 1.0
             
-        # Абсолютні маркери хаосу (Елементи ентропії IV рівня)
-        chaos_markers = {"рептилоїди", "lizard", "magic", "таємний", "змова", "плоска"}
-        if any(w in chaos_markers for w in words):
-            return 0.99  # Максимальна ентропія (хаос)
-
-        # Маркери 'шуму' (ентропія)
-        noise_markers = {
-            "етично", "необхідно", "важливо", "неприпустимо", "історично", 
-            "фундаментально", "занепокоєння", "перемога", "збитки", "довіра"
-        }
-        # Маркери 'сигналу' (ламінарність)
-        signal_markers = {
-            "якщо", "тоді", "тому", "внаслідок", "дорівнює", "факт", 
-            "ресурс", "чип", "наказ", "координати", "результат"
-        }
-        
-        noise_count = sum(1 for w in words if w in noise_markers)
-        signal_count = sum(1 for w in words if w in signal_markers)
+        if any(w in self.CHAOS_MARKERS for w in words):
+            return self.CHAOS_ENTROPY
+
+        noise_count = sum(1 for w in words if w in self.NOISE_MARKERS)
+        signal_count = sum(1 for w in words if w in self.SIGNAL_MARKERS)
         
         # Формула ламінарності: чим більше сигналу, тим вищий індекс
         laminar_index = (signal_count + 1) / (noise_count + signal_count + 1)
@@ -56,8 +96,46 @@ class VeritasCore:
         Використовує динамічний Slashing на основі ентропії.
         """
         # 1. Розрахунок ентропії тексту
-        entropy_score = self._calculate_entropy_coefficient(text)
-        
+        return self.apply_score(source, self.score_text(text))
+
+    def score_text(self, text):
+        """
+        Чиста оцінка тексту (не залежить від реєстру, можна кешувати).
+        """
+        return {"entropy_index": self._calculate_entropy_coefficient(text)}
+
+    def apply_score(self, source, score):
+        """
+        Застосовує оцінку тексту до репутації вузла.
+        """
+        return self.apply_scores(source, [score])[0]
+
+    def apply_scores(self, source, scores):
+        """
+        Застосовує пакет оцінок одного вузла (у порядку) під одним блокуванням реєстру.
+        """
+        penalties = [self._penalty(score["entropy_index"]) for score in scores]
+
+        # 3. Атомарне оновлення репутації вузла в реєстрі
+        updates = self.reputation_registry.apply_updates(
+            source, [self._slash(penalty) for penalty in penalties], 0.5
+        )
+
+        results = []
+        for score, penalty, (current_rep, _) in zip(scores, penalties, updates):
+            updated_rep = max(0.0, min(1.0, current_rep - penalty))
+            # 4. Формування результату
+            results.append({
+                "node": source,
+                "entropy_index": score["entropy_index"],
+                "new_reputation": updated_rep,
+                "status": "REJECTED" if updated_rep < 0.4 else "STABLE",
+                "intervention_required": updated_rep < 0.3
+            })
+        return results
+
+    @staticmethod
+    def _penalty(entropy_score):
         # 2. Розрахунок штрафу/бонусу (Dynamic Slashing)
         penalty = 0.0
         if entropy_score > 0.4:
@@ -66,22 +144,24 @@ class VeritasCore:
         elif entropy_score < 0.2:
             # Нагорода за надвисоку чіткість сигналу
             penalty = -0.05
-            
-        # 3. Оновлення репутації вузла в реєстрі
-        current_rep = self.reputation_registry.get(source, 0.5)
-        updated_rep = max(0.0, min(1.0, current_rep - penalty))
-        self.reputation_registry[source] = round(updated_rep, 2)
-        
-        # 4. Формування результату
-        return {
-            "node": source,
-            "entropy_index": entropy_score,
-            "new_reputation": updated_rep,
-            "status": "REJECTED" if updated_rep < 0.4 else "STABLE",
-            "intervention_required": updated_rep < 0.3
-        }
+        return penalty
+
+    @staticmethod
+    def _slash(penalty):
+        return lambda current_rep: round(max(0.0, min(1.0, current_rep - penalty)), 2)
+
+    def version_tag(self):
+        """
+        Відбиток лексиконів і ваг, від яких залежить score_text
+        (ключ кешу результатів, див. veritas_cache)
+        """
+        payload = json.dumps(
+            [self.CHAOS_MARKERS, self.CHAOS_ENTROPY, self.NOISE_MARKERS, self.SIGNAL_MARKERS],
+            sort_keys=True, ensure_ascii=False, default=sorted
+        )
+        return 'veritas_core/' + hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
 
-        def get_system_state(self, node_name: str):
+    def get_system_state(self, node_name: str):
         """
         Визначає стан системи на основі репутації вузла.
         """
@@ -0,0 +1,228 @@
+"""
+Veritas Protocol - Parallel Corpus Runner
+Розподіляє документи архіву по ProcessPoolExecutor.
+
+- один екземпляр движка на процес (initializer), а не на задачу
+- задачі подаються чанками, у польоті тримається обмежена кількість чанків
+- чиста оцінка тексту рахується у воркерах; оновлення репутації
+  (evaluate_integrity) застосовуються в батьківському процесі у порядку
+  вхідних документів, тож реєстр ідентичний послідовному прогону
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'veritas-news-analyzer', 'app'))
+
+
+def make_engine(kind: str, config: Optional[Dict] = None):
+    """
+    Створює движок за назвою
+
+    Args:
+        kind: 'calibrated' (VeritasCalibratedEngine) або 'multilingual' (MultilingualVeritasCore)
+        config: Конфігурація для MultilingualVeritasCore (секція veritas з config.yaml)
+    """
+    if kind == 'calibrated':
+        from veritas_calibrated_core import VeritasCalibratedEngine
+        return VeritasCalibratedEngine()
+    if kind == 'multilingual':
+        from translator import MultilingualVeritasCore
+        return MultilingualVeritasCore(config)
+    raise ValueError(f"Unknown engine: {kind}")
+
+
+# Кінець потоку джерел (next з default)
+_END = object()
+
+
+# === Воркер ===
+
+_worker_engine = None
+_worker_kind = None
+
+
+def _init_worker(kind: str, config: Optional[Dict]):
+    """Ініціалізація процесу: один движок на весь час життя воркера"""
+    global _worker_engine, _worker_kind
+    _worker_engine = make_engine(kind, config)
+    _worker_kind = kind
+
+
+def _score_chunk(chunk: List[Tuple[int, str]]) -> List[Tuple[int, Dict]]:
+    """Чиста (без репутації) оцінка чанка документів"""
+    indices = [i for i, _ in chunk]
+    texts = [text for _, text in chunk]
+    if _worker_kind == 'calibrated':
+        scores = _worker_engine.analyze_batch(texts)
+    else:
+        scores = [_worker_engine.score_text(text) for text in texts]
+    return list(zip(indices, scores))
+
+
+def _chunked(items: Iterator, size: int) -> Iterator[List]:
+    while True:
+        chunk = list(islice(items, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+# === Батьківський процес ===
+
+class CorpusRunner:
+    """
+    Паралельний прогін корпусу через VeritasCalibratedEngine / MultilingualVeritasCore
+
+    Example:
+        >>> runner = CorpusRunner('multilingual', workers=8)
+        >>> results = list(runner.run(texts, sources))
+        >>> runner.reputation_registry
+    """
+
+    def __init__(self, kind: str = 'calibrated', workers: Optional[int] = None,
+                 chunk_size: int = 64, config: Optional[Dict] = None):
+        self.kind = kind
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.config = config
+        # Батьківський движок - власник реєстру репутацій
+        self.engine = make_engine(kind, config)
+
+    @property
+    def reputation_registry(self) -> Dict[str, float]:
+        return getattr(self.engine, 'reputation_registry', {})
+
+    def run(self, texts: Iterable[str], sources: Optional[Iterable[str]] = None,
+            ordered: bool = True) -> Iterator:
+        """
+        Аналізує корпус
+
+        Args:
+            texts: Тексти (будь-який ітерований потік)
+            sources: Джерела для evaluate_integrity (лише 'multilingual'),
+                     по одному на текст - інакше ValueError
+            ordered: True - результати у вхідному порядку;
+                     False - (index, score) по мірі готовності чанків
+
+        Yields:
+            ordered=True: результат analyze / evaluate_integrity для кожного документа
+            ordered=False: (index, score) - чиста оцінка тексту без полів репутації;
+                           реєстр при цьому все одно оновлюється у вхідному порядку
+        """
+        if sources is not None and self.kind != 'multilingual':
+            raise ValueError("sources are only supported by the 'multilingual' engine")
+        if sources is not None and hasattr(texts, '__len__') and hasattr(sources, '__len__') \
+                and len(texts) != len(sources):
+            raise ValueError(f"Got {len(texts)} texts but {len(sources)} sources")
+
+        source_iter = iter(sources) if sources is not None else None
+        pending_sources: Dict[int, str] = {}
+
+        def documents():
+            # Для потоків довжини звіряються по ходу
+            i = -1
+            for i, text in enumerate(texts):
+                if source_iter is not None:
+                    source = next(source_iter, _END)
+                    if source is _END:
+                        raise ValueError(f"Sources ran out after {i} texts")
+                    pending_sources[i] = source
+                yield i, text
+            if source_iter is not None and next(source_iter, _END) is not _END:
+                raise ValueError(f"More sources than texts ({i + 1})")
+
+        chunks = _chunked(documents(), self.chunk_size)
+        ready: Dict[int, Dict] = {}
+        next_index = 0
+
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                 initargs=(self.kind, self.config)) as pool:
+            in_flight = {pool.submit(_score_chunk, chunk)
+                         for chunk in islice(chunks, self.workers * 2)}
+
+            while in_flight:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    for chunk in islice(chunks, 1):
+                        in_flight.add(pool.submit(_score_chunk, chunk))
+
+                    for index, score in future.result():
+                        ready[index] = score
+                        if not ordered:
+                            yield index, score
+
+                    # Детерміноване злиття: комітимо лише неперервний префікс
+                    while next_index in ready:
+                        result = self._commit(next_index, ready.pop(next_index), pending_sources)
+                        next_index += 1
+                        if ordered:
+                            yield result
+
+    def _commit(self, index: int, score: Dict, pending_sources: Dict[int, str]) -> Dict:
+        source = pending_sources.pop(index, None)
+        if source is None:
+            return score
+        return self.engine.apply_score(source, score)
+
+
+def throughput_report(texts: List[str], kind: str = 'calibrated',
+                      worker_counts: Iterable[int] = (1, 2, 4, 8),
+                      chunk_size: int = 64, sources: Optional[List[str]] = None) -> List[Dict]:
+    """
+    Вимірює пропускну здатність для кількох значень workers
+
+    Returns:
+        List[Dict]: workers, seconds, docs_per_sec, speedup, efficiency
+    """
+    report = []
+    baseline = None
+    total_bytes = sum(len(t.encode('utf-8')) for t in texts)
+    for workers in worker_counts:
+        runner = CorpusRunner(kind, workers=workers, chunk_size=chunk_size)
+        start = time.perf_counter()
+        for _ in runner.run(texts, sources):
+            pass
+        elapsed = time.perf_counter() - start
+        docs_per_sec = len(texts) / elapsed
+        baseline = baseline or docs_per_sec / workers
+        report.append({
+            'workers': workers,
+            'seconds': round(elapsed, 3),
+            'docs_per_sec': round(docs_per_sec, 1),
+            'mb_per_sec': round(total_bytes / elapsed / 1e6, 2),
+            'speedup': round(docs_per_sec / baseline, 2),
+            'efficiency': round(docs_per_sec / baseline / workers, 2)
+        })
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Veritas Protocol - parallel corpus runner')
+    parser.add_argument('paths', nargs='*', help='Файли корпусу (default: cases/)')
+    parser.add_argument('--engine', choices=['calibrated', 'multilingual'], default='calibrated')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--chunk-size', type=int, default=64)
+    parser.add_argument('--repeat', type=int, default=200,
+                        help='Скільки разів повторити корпус (для стабільних вимірів)')
+    args = parser.parse_args()
+
+    paths = [Path(p) for p in args.paths] or sorted((Path(__file__).parent / 'cases').glob('*'))
+    texts = [p.read_text(encoding='utf-8') for p in paths] * args.repeat
+
+    print(f"{len(texts)} documents, engine={args.engine}")
+    print(f"{'workers':>8} {'seconds':>9} {'docs/s':>10} {'MB/s':>7} {'speedup':>8} {'eff.':>6}")
+    for row in throughput_report(texts, args.engine, args.workers, args.chunk_size):
+        print(f"{row['workers']:>8} {row['seconds']:>9} {row['docs_per_sec']:>10} "
+              f"{row['mb_per_sec']:>7} {row['speedup']:>8} {row['efficiency']:>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+"""
+Veritas Protocol - Near-Duplicate Index
+Повторне використання ознак для синдикованих копій статей.
+
+Передрук агентської новини відрізняється заголовком, підписом чи
+"Read more" в кінці, тож точний кеш (veritas_cache) промахується.
+Індекс будує bottom-k MinHash по біграмах слів (text.split(), без
+regex-токенізації); якщо схожість за Жаккаром з уже оціненим документом
+не нижча за поріг, береться його запис ознак (гістограма символів,
+токени, маркери, числа), а заново рахуються лише дешеві дельти:
+довжина, кількість слів і чисел, КАПС, знаки оклику/питання. Заголовок чи
+підпис передруку зазвичай змінюють саме їх. Результат для передруку
+наближений: гістограма символів і маркери беруться з оригіналу.
+"""
+
+import heapq
+import time
+from collections import Counter, OrderedDict
+from dataclasses import replace
+from itertools import chain, count
+from typing import Callable, Dict, List, Optional, Tuple
+
+from veritas_calibrated_core import (TextFeatures, VeritasCalibratedEngine, count_caps_tokens,
+                                     count_numbers)
+
+
+def minhash_sketch(words: List[str], size: int = 64) -> List[int]:
+    """
+    Bottom-k MinHash по біграмах слів (для коротких текстів - по словах).
+    Використовує вбудований hash(): індекс живе в пам'яті одного процесу.
+    """
+    shingles = set(zip(words, words[1:])) if len(words) > 1 else set(words)
+    return sorted(heapq.nsmallest(size, map(hash, shingles)))
+
+
+def sketch_similarity(a: List[int], b: List[int], size: int = 64) -> float:
+    """Оцінка схожості Жаккара за двома bottom-k ескізами"""
+    if not a or not b:
+        return 0.0
+    a_set, b_set = set(a), set(b)
+    union = sorted(a_set | b_set)[:size]
+    shared = sum(1 for h in union if h in a_set and h in b_set)
+    return shared / len(union)
+
+
+class NearDuplicateIndex:
+    """
+    MinHash-індекс перед VeritasCalibratedEngine.analyze
+
+    Example:
+        >>> index = NearDuplicateIndex(VeritasCalibratedEngine(), threshold=0.8)
+        >>> result = index.analyze(text)
+        >>> index.stats()['saved']
+    """
+
+    def __init__(self, engine: Optional[VeritasCalibratedEngine] = None, threshold: float = 0.8,
+                 sketch_size: int = 64, ttl: Optional[float] = 6 * 3600,
+                 max_entries: int = 100000, clock: Callable[[], float] = time.time):
+        """
+        Args:
+            engine: Движок (створюється, якщо не передано)
+            threshold: Мінімальна схожість Жаккара для повторного використання
+            sketch_size: Розмір bottom-k ескізу
+            ttl: Скільки секунд запис лишається в індексі (None - без обмеження)
+            max_entries: Межа кількості документів в індексі
+            clock: Джерело часу (для тестів)
+        """
+        self.engine = engine or VeritasCalibratedEngine()
+        self.threshold = threshold
+        self.sketch_size = sketch_size
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.clock = clock
+
+        # doc_id -> (ескіз, ознаки, кількість слів split(), час додавання);
+        # порядок = порядок вставки
+        self._docs: "OrderedDict[int, Tuple[List[int], TextFeatures, int, float]]" = OrderedDict()
+        # значення MinHash -> doc_id (інвертований індекс кандидатів)
+        self._postings: Dict[int, set] = {}
+        self._ids = count()
+
+        self.analyses = 0
+        self.saved = 0
+        self.expired = 0
+
+    def analyze(self, text: str) -> Dict:
+        """Аналіз з повторним використанням ознак майже-дубліката"""
+        if not text or len(text.strip()) < 10:
+            return {'error': 'Text too short'}
+
+        self._expire()
+        words = text.split()
+        sketch = minhash_sketch(words, self.sketch_size)
+
+        match = self._best_match(sketch)
+        if match is not None:
+            self.saved += 1
+            return self.engine.analyze_features(self._delta_features(*match, text, words))
+
+        self.analyses += 1
+        features = self.engine.extract_features(text)
+        self._insert(sketch, features, len(words))
+        return self.engine.analyze_features(features)
+
+    def _best_match(self, sketch: List[int]) -> Optional[Tuple[TextFeatures, int]]:
+        postings = self._postings
+        candidates = Counter(chain.from_iterable(postings.get(h, ()) for h in sketch))
+        # Схожість >= threshold майже завжди дає щонайменше стільки спільних мінхешів
+        min_shared = self.threshold * len(sketch) / 2
+
+        # Перевіряємо кандидатів у порядку спадання спільних мінхешів
+        for doc_id, shared in candidates.most_common(8):
+            if shared < min_shared:
+                break
+            stored_sketch, features, split_words, _ = self._docs[doc_id]
+            if sketch_similarity(sketch, stored_sketch, self.sketch_size) >= self.threshold:
+                return features, split_words
+        return None
+
+    def _delta_features(self, stored: TextFeatures, split_words: int,
+                        text: str, words: List[str]) -> TextFeatures:
+        """
+        Ознаки з запису-оригіналу + дешеві метрики нового тексту.
+        Кількість слів зсувається на різницю split()-слів, числа рахуються
+        заново: від них залежить поріг академічного тексту, а він різкий.
+        """
+        return replace(
+            stored,
+            char_count=len(text),
+            word_count=max(1, stored.word_count + len(words) - split_words),
+            number_count=count_numbers(text),
+            caps_words=count_caps_tokens(words),
+            exclamations=text.count('!'),
+            questions=text.count('?'),
+        )
+
+    def _insert(self, sketch: List[int], features: TextFeatures, split_words: int):
+        doc_id = next(self._ids)
+        self._docs[doc_id] = (sketch, features, split_words, self.clock())
+        for h in sketch:
+            self._postings.setdefault(h, set()).add(doc_id)
+        while len(self._docs) > self.max_entries:
+            self._evict_oldest()
+
+    def _expire(self):
+        if self.ttl is None:
+            return
+        deadline = self.clock() - self.ttl
+        while self._docs:
+            _, (_, _, _, created) = next(iter(self._docs.items()))
+            if created >= deadline:
+                break
+            self._evict_oldest()
+            self.expired += 1
+
+    def _evict_oldest(self):
+        doc_id, (sketch, _, _, _) = self._docs.popitem(last=False)
+        for h in sketch:
+            posting = self._postings.get(h)
+            if posting is not None:
+                posting.discard(doc_id)
+                if not posting:
+                    del self._postings[h]
+
+    def stats(self) -> Dict:
+        total = self.analyses + self.saved
+        return {
+            'full_analyses': self.analyses,
+            'saved': self.saved,
+            'saved_rate': round(self.saved / total, 3) if total else 0.0,
+            'indexed': len(self._docs),
+            'expired': self.expired
+        }
+
+    def __len__(self) -> int:
+        return len(self._docs)
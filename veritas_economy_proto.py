@@ -1,5 +1,29 @@
 # Veritas Protocol: Secure Circular Economy
-# Version: 1.2 - Anti-Sybil & Identity Protection
+# Version: 1.3 - Anti-Sybil & Identity Protection, Vectorized Epoch Ledger
+
+from typing import Dict, Iterable, List, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # NumPy потрібен лише для VeritasLedger
+    np = None
+
+HYPE_MARKERS = ["historic", "incredible", "massive"]
+TRUST_GAIN = 0.05       # score > 7
+TRUST_LOSS = 0.2        # score < 4
+IDENTITY_THRESHOLD = 0.2
+IDENTITY_PENALTY = 50.0
+SLASH_THRESHOLD = 5
+SLASH_PENALTY = 150.0
+REWARD_RATE = 0.3       # частка пулу, доступна для винагород
+
+
+def score_text(text: str) -> int:
+    """Логічна оцінка поста (10 - 3 за кожен хайп-маркер)"""
+    words = text.lower().split()
+    e_count = sum(1 for w in words if any(m in w for m in HYPE_MARKERS))
+    return 10 - (e_count * 3)
+
 
 class VeritasSecureEconomy:
     def __init__(self):
@@ -14,53 +38,239 @@ class VeritasSecureEconomy:
 
     def verify_identity(self, entity):
         # Якщо рівень довіри менше 0.2 - доступ до винагород заблоковано
-        if self.registry[entity]["trust"] < 0.2:
+        if self.registry[entity]["trust"] < IDENTITY_THRESHOLD:
             return False
         return True
 
     def update_trust(self, entity, score):
         # Рівень довіри зростає від хороших постів і падає від поганих
         if score > 7:
-            self.registry[entity]["trust"] = min(1.0, self.registry[entity]["trust"] + 0.05)
+            self.registry[entity]["trust"] = min(1.0, self.registry[entity]["trust"] + TRUST_GAIN)
         elif score < 4:
-            self.registry[entity]["trust"] = max(0.0, self.registry[entity]["trust"] - 0.2)
+            self.registry[entity]["trust"] = max(0.0, self.registry[entity]["trust"] - TRUST_LOSS)
 
     def process_cycle(self, entity, text):
         # 1. Рахуємо якість тексту
-        hype_markers = ["historic", "incredible", "massive"]
-        words = text.lower().split()
-        e_count = sum(1 for w in words if any(m in w for m in hype_markers))
-        score = 10 - (e_count * 3)
-        
+        score = score_text(text)
+
         # 2. Оновлюємо репутацію
         self.update_trust(entity, score)
-        
+
         # 3. Перевіряємо, чи має право на гроші
         if not self.verify_identity(entity):
-            penalty = 50.0 # Штраф за спробу бот-активності
+            penalty = IDENTITY_PENALTY # Штраф за спробу бот-активності
             self.registry[entity]["balance"] -= penalty
             self.reward_pool += penalty
             return f"ACCESS DENIED: Entity {entity} flagged as LOW TRUST. Penalty applied."
 
         # 4. Економіка (Slashing/Reward)
-        if score < 5:
-            penalty = 150.0
+        if score < SLASH_THRESHOLD:
+            penalty = SLASH_PENALTY
             self.registry[entity]["balance"] -= penalty
             self.reward_pool += penalty
             return f"Slashed {entity}: -150 (Reason: Low Logic Score)"
         else:
-            reward = (score / 10) * (self.reward_pool * 0.3)
+            reward = (score / 10) * (self.reward_pool * REWARD_RATE)
             self.registry[entity]["balance"] += reward
             self.reward_pool -= reward
             return f"Rewarded {entity}: +{reward:.2f} (Trust Level: {self.registry[entity]['trust']:.2f})"
 
-# --- ТЕСТ АНТИ-БОТА ---
-v_sys = VeritasSecureEconomy()
 
-# Бот намагається вкинути хайп
-print(v_sys.process_cycle("Bot_Net_001", "Incredible massive news!")) 
-# Бот знову намагається - і його банять!
-print(v_sys.process_cycle("Bot_Net_001", "Shocking historic move!"))
+class VeritasLedger:
+    """
+    Колонковий реєстр економіки з розрахунком епохами
+
+    balance, trust, is_bot - масиви NumPy, індекс - id сутності (entity_id).
+    settle_epoch обробляє пакет постів у фіксованому порядку фаз:
+
+        1. Довіра: чиста зміна за епоху (+0.05 за score > 7, -0.2 за
+           score < 4) додається один раз і обрізається до [0, 1]
+        2. Ідентичність: пост перевіряється за меншою з довіри після
+           фази 1 і довіри до епохи плюс зміна від самого поста; нижче
+           0.2 - штраф 50 і без винагород. Хороші пости в пакеті не
+           відкривають доступ іншим постам тієї ж сутності
+        3. Slashing: інші пости зі score < 5 - штраф 150
+        4. Винагороди: з пулу, поповненого штрафами цієї епохи; пост
+           претендує на score/10 від 30% пулу, а якщо сума претензій
+           перевищує 1 - частки зменшуються пропорційно
+
+    Результат не залежить від порядку постів у пакеті (винагороди - з
+    точністю до округлення сум float). Епоха з одного
+    поста збігається з process_cycle; для більших пакетів відмінності -
+    обрізання довіри в межах епохи, перевірка ідентичності (фаза 2) і
+    розподіл пулу між постами.
+
+    Example:
+        >>> ledger = VeritasLedger.from_registry(VeritasSecureEconomy().registry)
+        >>> ledger.settle_epoch(ledger.encode_posts([("BBC_News", "The data shows growth.")]))
+    """
+
+    def __init__(self, capacity: int = 1024):
+        if np is None:
+            raise ImportError("VeritasLedger requires numpy")
+        self.ids: Dict[str, int] = {}
+        self.names: List[str] = []
+        self._balance = np.zeros(capacity, dtype=np.float64)
+        self._trust = np.zeros(capacity, dtype=np.float64)
+        self._is_bot = np.zeros(capacity, dtype=bool)
+        self.reward_pool = 0.0
+        self.epoch = 0
+
+    @classmethod
+    def from_registry(cls, registry: Dict[str, Dict], reward_pool: float = 0.0) -> 'VeritasLedger':
+        """Реєстр з VeritasSecureEconomy.registry"""
+        ledger = cls(max(len(registry), 1))
+        for name, entry in registry.items():
+            ledger.add_entity(name, entry["balance"], entry["trust"], entry.get("is_bot", False))
+        ledger.reward_pool = reward_pool
+        return ledger
+
+    # === Сутності ===
+
+    def add_entity(self, name: str, balance: float = 0.0, trust: float = 0.5,
+                   is_bot: bool = False) -> int:
+        """
+        Реєструє сутність
+
+        Returns:
+            int: entity_id
+        """
+        if name in self.ids:
+            raise ValueError(f"Entity already registered: {name}")
+        entity_id = len(self.names)
+        if entity_id == len(self._balance):
+            self._grow(2 * entity_id)
+        self.ids[name] = entity_id
+        self.names.append(name)
+        self._balance[entity_id] = balance
+        self._trust[entity_id] = trust
+        self._is_bot[entity_id] = is_bot
+        return entity_id
+
+    def _grow(self, capacity: int):
+        for attr in ('_balance', '_trust', '_is_bot'):
+            column = getattr(self, attr)
+            grown = np.zeros(capacity, dtype=column.dtype)
+            grown[:len(column)] = column
+            setattr(self, attr, grown)
+
+    @property
+    def balance(self) -> 'np.ndarray':
+        return self._balance[:len(self.names)]
+
+    @property
+    def trust(self) -> 'np.ndarray':
+        return self._trust[:len(self.names)]
+
+    @property
+    def is_bot(self) -> 'np.ndarray':
+        return self._is_bot[:len(self.names)]
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def entity(self, name: str) -> Dict:
+        """Запис у форматі VeritasSecureEconomy.registry"""
+        i = self.ids[name]
+        return {"balance": float(self._balance[i]), "trust": float(self._trust[i]),
+                "is_bot": bool(self._is_bot[i])}
+
+    def to_registry(self) -> Dict[str, Dict]:
+        return {name: self.entity(name) for name in self.names}
+
+    # === Епохи ===
+
+    def encode_posts(self, posts: Iterable[Tuple[str, str]]) -> Tuple['np.ndarray', 'np.ndarray']:
+        """
+        (сутність, текст) -> (entity_ids, scores) для settle_epoch
+
+        Невідома сутність - KeyError, як у process_cycle.
+        """
+        ids, scores = [], []
+        for name, text in posts:
+            ids.append(self.ids[name])
+            scores.append(score_text(text))
+        return np.array(ids, dtype=np.int64), np.array(scores, dtype=np.float64)
+
+    def settle_epoch(self, posts: Tuple[Iterable[int], Iterable[float]]) -> Dict:
+        """
+        Розрахунок епохи для пакета постів
+
+        Args:
+            posts: (entity_ids, scores) - масиви однакової довжини
+                   (encode_posts або вже пораховані оцінки)
+
+        Returns:
+            Dict: підсумок епохи (кількості постів за результатом, суми
+                  штрафів і винагород, пул після розрахунку)
+        """
+        entity_ids, scores = posts
+        entity_ids = np.asarray(entity_ids, dtype=np.int64)
+        scores = np.asarray(scores, dtype=np.float64)
+        if entity_ids.shape != scores.shape:
+            raise ValueError("entity_ids and scores must have the same length")
+        n = len(self.names)
+        if len(entity_ids) and (entity_ids.min() < 0 or entity_ids.max() >= n):
+            raise IndexError("Post refers to an unknown entity")
+
+        # 1. Довіра (лічильники цілі - зміна не залежить від порядку постів)
+        gains = np.bincount(entity_ids, weights=scores > 7, minlength=n)
+        losses = np.bincount(entity_ids, weights=scores < 4, minlength=n)
+        delta = gains * TRUST_GAIN - losses * TRUST_LOSS
+        touched = np.bincount(entity_ids, minlength=n) > 0
+        trust = self.trust
+        own = np.where(scores > 7, TRUST_GAIN, np.where(scores < 4, -TRUST_LOSS, 0.0))
+        gate = np.clip(trust[entity_ids] + own, 0.0, 1.0)
+        trust[touched] = np.clip(trust[touched] + delta[touched], 0.0, 1.0)
+
+        # 2-3. Ідентичність і slashing
+        denied = np.minimum(gate, trust[entity_ids]) < IDENTITY_THRESHOLD
+        slashed = ~denied & (scores < SLASH_THRESHOLD)
+        penalties = denied * IDENTITY_PENALTY + slashed * SLASH_PENALTY
+        self.balance[:] -= np.bincount(entity_ids, weights=penalties, minlength=n)
+        collected = float(penalties.sum())
+        self.reward_pool += collected
+
+        # 4. Винагороди
+        rewarded = ~denied & ~slashed
+        claims = np.where(rewarded, scores / 10, 0.0)
+        total_claims = float(claims.sum())
+        paid = 0.0
+        if total_claims > 0:
+            rewards = claims * (self.reward_pool * REWARD_RATE / max(1.0, total_claims))
+            self.balance[:] += np.bincount(entity_ids, weights=rewards, minlength=n)
+            paid = float(rewards.sum())
+            self.reward_pool -= paid
+
+        self.epoch += 1
+        return {
+            "epoch": self.epoch,
+            "posts": len(entity_ids),
+            "denied": int(denied.sum()),
+            "slashed": int(slashed.sum()),
+            "rewarded": int(rewarded.sum()),
+            "penalties": collected,
+            "rewards": paid,
+            "reward_pool": self.reward_pool
+        }
+
+
+if __name__ == "__main__":
+    # --- ТЕСТ АНТИ-БОТА ---
+    v_sys = VeritasSecureEconomy()
+
+    # Бот намагається вкинути хайп
+    print(v_sys.process_cycle("Bot_Net_001", "Incredible massive news!"))
+    # Бот знову намагається - і його банять!
+    print(v_sys.process_cycle("Bot_Net_001", "Shocking historic move!"))
+
+    # Чесний аналітик отримує капітал бота
+    print(v_sys.process_cycle("BBC_News", "The data shows consistent growth in the sector."))
 
-# Чесний аналітик отримує капітал бота
-print(v_sys.process_cycle("BBC_News", "The data shows consistent growth in the sector."))
+    # --- ТА САМА ЕПОХА У ВЕКТОРНОМУ РЕЄСТРІ ---
+    ledger = VeritasLedger.from_registry(VeritasSecureEconomy().registry)
+    print(ledger.settle_epoch(ledger.encode_posts([
+        ("Bot_Net_001", "Incredible massive news!"),
+        ("Bot_Net_001", "Shocking historic move!"),
+        ("BBC_News", "The data shows consistent growth in the sector.")
+    ])))
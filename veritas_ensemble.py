@@ -0,0 +1,210 @@
+"""
+Veritas Protocol - Ensemble Runner
+Запуск будь-якої підмножини движків над документом зі спільним кешем ознак.
+
+Движки:
+- core          - VeritasCore (veritas_core.py)
+- calibrated    - VeritasCalibratedEngine (veritas_calibrated_core.py)
+- multilingual  - MultilingualVeritasCore (app/translator.py)
+- analyzer      - VeritasAnalyzer + VeritasEngine (app/analyzer.py, app/core.py)
+
+Кожен примітив (lower, split, \\w+ токени, речення, гістограма символів,
+числа, КАПС) рахується один раз на документ і лише тоді, коли його
+попросив хоча б один движок. Оцінки чисті - реєстри репутацій не змінюються.
+"""
+
+import os
+import re
+import sys
+from collections import Counter
+from functools import cached_property
+from typing import Dict, Iterable, List, Optional
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'veritas-news-analyzer', 'app'))
+
+from veritas_calibrated_core import count_caps_tokens, count_numbers
+from veritas_entropy import char_histogram
+
+ENGINE_NAMES = ('core', 'calibrated', 'multilingual', 'analyzer')
+
+_WORD_RE = re.compile(r'\w+')
+_SENTENCE_RE = re.compile(r'[.!?]+')
+
+
+class DocumentFeatures:
+    """
+    Лінивий кеш ознак одного документа (кожна властивість рахується один раз)
+
+    Example:
+        >>> doc = DocumentFeatures(text)
+        >>> doc.split_words, doc.char_hist['!']
+        >>> doc.computed()
+        ['split_words', 'char_hist']
+    """
+
+    def __init__(self, text: str):
+        self.text = text
+
+    @cached_property
+    def lower(self) -> str:
+        return self.text.lower()
+
+    @cached_property
+    def split_words(self) -> List[str]:
+        """text.split()"""
+        return self.text.split()
+
+    @cached_property
+    def marker_words(self) -> List[str]:
+        """Слова для словникових маркерів: lower, без ком і крапок, split()"""
+        return self.lower.replace(",", "").replace(".", "").split()
+
+    @cached_property
+    def tokens(self) -> List[str]:
+        """\\w+ токени сирого тексту (регістр збережено)"""
+        return _WORD_RE.findall(self.text)
+
+    @cached_property
+    def lower_token_counts(self) -> Counter:
+        """Лічильник \\w+ токенів text.lower()"""
+        return Counter(_WORD_RE.findall(self.lower))
+
+    @cached_property
+    def sentences(self) -> List[str]:
+        return [s.strip() for s in _SENTENCE_RE.split(self.text) if len(s.strip()) > 2]
+
+    @cached_property
+    def char_hist(self) -> Counter:
+        return char_histogram(self.text)
+
+    @cached_property
+    def number_count(self) -> int:
+        return count_numbers(self.text)
+
+    @cached_property
+    def caps_words(self) -> int:
+        """КАПС-слова за визначенням VeritasCalibratedEngine (>5 символів)"""
+        return count_caps_tokens(self.split_words)
+
+    def computed(self) -> List[str]:
+        """Які примітиви вже пораховані"""
+        return [name for name in self.__dict__ if name != 'text']
+
+
+class EnsembleRunner:
+    """
+    Ансамбль движків зі спільним кешем ознак і злитою оцінкою
+
+    Example:
+        >>> ensemble = EnsembleRunner(['calibrated', 'multilingual'])
+        >>> result = ensemble.analyze(text)
+        >>> result['entropy'], result['fused_entropy']
+    """
+
+    def __init__(self, engines: Iterable[str] = ENGINE_NAMES,
+                 weights: Optional[Dict[str, float]] = None, config: Optional[Dict] = None):
+        """
+        Args:
+            engines: Движки за замовчуванням (підмножина ENGINE_NAMES)
+            weights: Ваги для злитої оцінки (за замовчуванням рівні)
+            config: Секція veritas з config.yaml (для multilingual / analyzer)
+        """
+        self.engines = self._check_names(engines)
+        self.weights = weights or {}
+        self.config = config or {}
+        self._instances: Dict[str, object] = {}
+
+    @staticmethod
+    def _check_names(engines: Iterable[str]) -> tuple:
+        engines = tuple(engines)
+        unknown = set(engines) - set(ENGINE_NAMES)
+        if unknown:
+            raise ValueError(f"Unknown engines: {sorted(unknown)}")
+        return engines
+
+    def engine(self, name: str):
+        """Екземпляр движка (створюється при першому зверненні)"""
+        if name not in self._instances:
+            if name == 'core':
+                from veritas_core import VeritasCore
+                self._instances[name] = VeritasCore()
+            elif name == 'calibrated':
+                from veritas_calibrated_core import VeritasCalibratedEngine
+                self._instances[name] = VeritasCalibratedEngine()
+            elif name == 'multilingual':
+                from translator import MultilingualVeritasCore
+                self._instances[name] = MultilingualVeritasCore(self.config)
+            elif name == 'analyzer':
+                from analyzer import VeritasAnalyzer
+                from core import VeritasEngine
+                self._instances[name] = (VeritasAnalyzer(self.config), VeritasEngine(self.config))
+            else:
+                raise ValueError(f"Unknown engine: {name}")
+        return self._instances[name]
+
+    def analyze(self, text, engines: Optional[Iterable[str]] = None) -> Dict:
+        """
+        Оцінка документа кількома движками
+
+        Args:
+            text: Текст або вже створений DocumentFeatures
+            engines: Підмножина движків (за замовчуванням - з конструктора)
+
+        Returns:
+            Dict: scores (повний результат кожного движка), entropy (індекс
+                  ентропії кожного движка, 0-1), fused_entropy (зважене середнє)
+        """
+        doc = text if isinstance(text, DocumentFeatures) else DocumentFeatures(text)
+        if not doc.text or len(doc.text.strip()) < 10:
+            return {'error': 'Text too short'}
+
+        names = self.engines if engines is None else self._check_names(engines)
+        scores = {}
+        entropy = {}
+        for name in names:
+            scores[name], entropy[name] = getattr(self, f'_score_{name}')(doc)
+
+        total_weight = sum(self.weights.get(name, 1.0) for name in names)
+        fused = (sum(entropy[name] * self.weights.get(name, 1.0) for name in names) / total_weight
+                 if total_weight else 0.0)
+
+        return {
+            'scores': scores,
+            'entropy': entropy,
+            'fused_entropy': round(fused, 3)
+        }
+
+    def analyze_many(self, texts: Iterable[str], engines: Optional[Iterable[str]] = None) -> List[Dict]:
+        return [self.analyze(text, engines) for text in texts]
+
+    # === Адаптери: движок <- спільні ознаки ===
+
+    def _score_core(self, doc: DocumentFeatures):
+        entropy_index = self.engine('core').entropy_from_words(doc.marker_words)
+        return {'entropy_index': entropy_index}, entropy_index
+
+    def _score_calibrated(self, doc: DocumentFeatures):
+        engine = self.engine('calibrated')
+        features = engine.build_features(
+            char_count=len(doc.text),
+            char_hist=doc.char_hist,
+            token_counts=doc.lower_token_counts,
+            number_count=doc.number_count,
+            caps_words=doc.caps_words,
+        )
+        result = engine.analyze_features(features)
+        return result, result['entropy']
+
+    def _score_multilingual(self, doc: DocumentFeatures):
+        result = self.engine('multilingual').score_primitives(
+            doc.text, doc.lower, doc.marker_words, doc.split_words,
+            doc.number_count, doc.char_hist['!'], doc.char_hist['?']
+        )
+        return result, result['entropy_index']
+
+    def _score_analyzer(self, doc: DocumentFeatures):
+        analyzer, engine = self.engine('analyzer')
+        metrics = analyzer.analyze_tokens(doc.tokens, doc.sentences, doc.lower)
+        score = engine.calculate_veritas_score(metrics)
+        return {**metrics, 'score': score, 'status': engine.get_status(score)}, score
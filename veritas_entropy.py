@@ -0,0 +1,130 @@
+"""
+Veritas Protocol - Shannon Entropy Kernel
+Ентропія Шеннона по закодованому буферу тексту (NumPy bincount).
+
+Два алфавіти:
+- exact=True  - кодові точки Unicode (семантика Counter(text), як у движку)
+- exact=False - байти UTF-8 (256 кошиків, найдешевший варіант)
+
+Без NumPy все рахується через collections.Counter - результат той самий
+з точністю до порядку підсумовування float.
+"""
+
+import math
+from collections import Counter
+from typing import Iterable, List, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # Без NumPy - скалярний шлях через Counter
+    np = None
+
+# Максимум кошиків (документів x алфавіт) в одній матриці пакетного режиму
+BATCH_BINS_LIMIT = 1 << 24
+
+
+def _code_points(text: str) -> 'np.ndarray':
+    return np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32)
+
+
+def char_histogram(text: str) -> Counter:
+    """
+    Гістограма кодових точок - те саме, що Counter(text),
+    але лічильники рахує np.bincount по UTF-32 буферу.
+    """
+    if np is None or not text:
+        return Counter(text)
+    counts = np.bincount(_code_points(text))
+    present = np.flatnonzero(counts)
+    return Counter(dict(zip(map(chr, present.tolist()), counts[present].tolist())))
+
+
+def histogram_entropy(counts: Iterable[int]) -> float:
+    """
+    Ентропія Шеннона в бітах за лічильниками символів: H = -Σ(p_i * log2(p_i))
+    """
+    if np is None:
+        counts = [c for c in counts if c > 0]
+        total = sum(counts)
+        if not total:
+            return 0.0
+        return -sum(c / total * math.log2(c / total) for c in counts)
+
+    if not isinstance(counts, np.ndarray):
+        counts = np.fromiter(counts, dtype=np.float64)
+    counts = counts[counts > 0].astype(np.float64)
+    total = counts.sum()
+    if not total:
+        return 0.0
+    p = counts / total
+    return float(-(p * np.log2(p)).sum())
+
+
+def shannon_entropy(text: str, exact: bool = True) -> float:
+    """
+    Ентропія тексту в бітах
+
+    Args:
+        text: Текст
+        exact: True - по кодових точках, False - по байтах UTF-8
+    """
+    if not text:
+        return 0.0
+    if np is None:
+        return histogram_entropy(Counter(text if exact else text.encode('utf-8')).values())
+    if exact:
+        return histogram_entropy(np.bincount(_code_points(text)))
+    return histogram_entropy(np.bincount(np.frombuffer(text.encode('utf-8'), dtype=np.uint8)))
+
+
+def batch_shannon_entropy(texts: Sequence[str], exact: bool = True) -> List[float]:
+    """
+    Ентропія для пакета документів одним викликом
+
+    Усі документи склеюються в один буфер; пара (документ, символ)
+    кодується одним індексом, тож лічильники для всього пакета дає
+    один np.bincount, а -Σp·log2(p) рахується по матриці документ x алфавіт.
+
+    Returns:
+        List[float]: Ентропія в бітах для кожного тексту (у вхідному порядку)
+    """
+    if np is None:
+        return [shannon_entropy(text, exact) for text in texts]
+
+    if exact:
+        buffers = [_code_points(text) for text in texts]
+    else:
+        buffers = [np.frombuffer(text.encode('utf-8'), dtype=np.uint8) for text in texts]
+    if not buffers:
+        return []
+
+    lengths = np.fromiter((len(b) for b in buffers), dtype=np.int64, count=len(buffers))
+    symbols = np.concatenate(buffers).astype(np.int64)
+
+    # Стискаємо алфавіт пакета до щільних рангів 0..V-1
+    present = np.bincount(symbols) if len(symbols) else np.zeros(1, dtype=np.int64)
+    alphabet = np.flatnonzero(present)
+    rank = np.zeros(len(present), dtype=np.int64)
+    rank[alphabet] = np.arange(len(alphabet))
+    symbols = rank[symbols]
+    width = max(len(alphabet), 1)
+
+    # Ділимо пакет на частини, щоб матриця документ x алфавіт лишалась обмеженою
+    rows_per_part = max(1, BATCH_BINS_LIMIT // width)
+    offsets = np.concatenate(([0], np.cumsum(lengths)))
+    result = np.zeros(len(buffers), dtype=np.float64)
+
+    for start in range(0, len(buffers), rows_per_part):
+        stop = min(start + rows_per_part, len(buffers))
+        part = symbols[offsets[start]:offsets[stop]]
+        part_lengths = lengths[start:stop]
+        rows = np.repeat(np.arange(stop - start), part_lengths)
+        counts = np.bincount(rows * width + part, minlength=(stop - start) * width)
+        counts = counts.reshape(stop - start, width).astype(np.float64)
+
+        totals = np.maximum(part_lengths, 1).astype(np.float64)[:, None]
+        p = counts / totals
+        log_p = np.log2(p, out=np.zeros_like(p), where=p > 0)
+        result[start:stop] = -(p * log_p).sum(axis=1)
+
+    return result.tolist()
@@ -0,0 +1,486 @@
+"""
+Veritas Protocol - Persistent Reputation Journal
+Довговічний реєстр репутацій: журнал оновлень + знімки.
+
+- кожне присвоєння registry[source] = value дописується в бінарний
+  журнал (append-only) разом із часом оновлення
+- записи групуються в кадри (group commit): один write + fsync на кадр,
+  кадр скидається за розміром (group_size) або таймером (group_interval),
+  тож на запит немає синхронного fsync
+- знімок (snapshot) - повний стан реєстру одним кадром; після нього
+  старі журнали й знімки видаляються (компакція). Автоматичний знімок
+  JournaledRegistry пишеться у фоновому потоці: запис, що перейшов поріг,
+  лише запускає його, а записувачі чекають тільки копіювання колонок
+- старт = останній повний знімок + хвіст журналу; обірваний останній
+  кадр (падіння під час запису) відкидається
+
+Формат кадру (і журналу, і знімка) колонковий, щоб відновлення йшло
+зі швидкістю C-коду, а не циклу по записах:
+    заголовок '<4sIII': magic, кількість записів, довжина блоку імен, crc32
+    імена UTF-8 через '\\0' | масив float64 [значення, час] x кількість
+
+Файли в каталозі: snapshot-<gen>.vrj (знімок на початку покоління),
+journal-<gen>.vrj (оновлення після нього).
+"""
+
+import os
+import re
+import struct
+import threading
+import time
+import zlib
+from array import array
+from collections.abc import MutableMapping
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+MAGIC = b'VRJ1'
+_HEADER = struct.Struct('<4sIII')
+_FILE_RE = re.compile(r'^(snapshot|journal)-(\d{8})\.vrj$')
+# Значення-надгробок для видаленого ключа
+_DELETED = float('nan')
+
+# Кадр: імена і array('d') пар [значення, час]
+Frame = Tuple[List[str], array]
+
+SYNC_MODES = ('group', 'always', 'none')
+
+
+def encode_frame(names: List[str], values: array) -> bytes:
+    """
+    Кадр з імен і пар [значення, час]
+
+    Args:
+        names: Імена джерел (без '\\0')
+        values: array('d') довжини 2 * len(names)
+    """
+    blob = '\0'.join(names).encode('utf-8')
+    payload = blob + values.tobytes()
+    return _HEADER.pack(MAGIC, len(names), len(blob), zlib.crc32(payload)) + payload
+
+
+def read_frames(path: Path) -> Tuple[List[Frame], int]:
+    """
+    Читає кадри файлу до першого неповного чи пошкодженого
+
+    Returns:
+        (кадри [(імена, значення)], кількість байтів цілих кадрів)
+    """
+    data = path.read_bytes()
+    frames = []
+    offset = 0
+    while offset + _HEADER.size <= len(data):
+        magic, count, blob_len, crc = _HEADER.unpack_from(data, offset)
+        end = offset + _HEADER.size + blob_len + 16 * count
+        if magic != MAGIC or end > len(data):
+            break
+        payload = data[offset + _HEADER.size:end]
+        if zlib.crc32(payload) != crc:
+            break
+        names = payload[:blob_len].decode('utf-8').split('\0') if count else []
+        values = array('d')
+        values.frombytes(payload[blob_len:])
+        frames.append((names, values))
+        offset = end
+    return frames, offset
+
+
+class ReputationJournal:
+    """
+    Журнал оновлень репутації з груповим комітом і знімками
+
+    Example:
+        >>> journal = ReputationJournal('data/reputation')
+        >>> snapshot, frames = journal.recover()
+        >>> journal.append('BBC', 0.62)
+        >>> journal.close()
+    """
+
+    def __init__(self, directory: str, sync: str = 'group', group_interval: float = 0.05,
+                 group_size: int = 4096, clock: Callable[[], float] = time.time):
+        """
+        Args:
+            directory: Каталог журналу (створюється)
+            sync: 'group' - fsync на кадр (за розміром або таймером),
+                  'always' - кадр і fsync на кожне оновлення,
+                  'none' - кадри без fsync (лише буфер ОС)
+            group_interval: Максимальна затримка кадру в секундах (режим 'group')
+            group_size: Максимальна кількість оновлень у кадрі
+            clock: Джерело часу оновлень (для тестів)
+        """
+        if sync not in SYNC_MODES:
+            raise ValueError(f"Unknown sync mode: {sync} (expected one of {SYNC_MODES})")
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.sync = sync
+        self.group_interval = group_interval
+        self.group_size = group_size
+        self.clock = clock
+
+        self.generation = 0
+        self.journal_bytes = 0
+        self._file = None
+        self._names: List[str] = []
+        self._values = array('d')
+        self._lock = threading.Lock()
+        self._io_lock = threading.Lock()
+        self._snapshot_lock = threading.Lock()
+        self._closed = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+
+    # === Відновлення ===
+
+    def _files(self, kind: str) -> Dict[int, Path]:
+        found = {}
+        for path in self.directory.iterdir():
+            match = _FILE_RE.match(path.name)
+            if match and match.group(1) == kind:
+                found[int(match.group(2))] = path
+        return found
+
+    def _path(self, kind: str, generation: int) -> Path:
+        return self.directory / f"{kind}-{generation:08d}.vrj"
+
+    def recover(self) -> Tuple[Optional[Frame], List[Frame]]:
+        """
+        Останній знімок і кадри журналів після нього (у порядку застосування);
+        відкриває журнал на запис
+
+        Returns:
+            (кадр знімка або None, кадри журналу); кадр - (імена,
+            array('d') пар [значення, час]), NaN - видалення
+        """
+        snapshots = self._files('snapshot')
+        base = max(snapshots, default=0)
+        snapshot = None
+        if snapshots:
+            loaded = read_frames(snapshots[base])[0]
+            snapshot = loaded[0] if loaded else ([], array('d'))
+        frames = []
+
+        journals = sorted(gen for gen in self._files('journal') if gen >= base)
+        for gen in journals:
+            path = self._path('journal', gen)
+            tail, valid = read_frames(path)
+            frames.extend(tail)
+            if valid < path.stat().st_size:
+                # Обірваний хвіст - відкидаємо, щоб дописувати після цілих кадрів
+                with open(path, 'r+b') as f:
+                    f.truncate(valid)
+
+        # Знімок, не дописаний до кінця (без rename)
+        for tmp in self.directory.glob('*.tmp'):
+            tmp.unlink()
+
+        self.generation = max(journals + [base])
+        self._open_journal()
+        return snapshot, frames
+
+    def _open_journal(self):
+        path = self._path('journal', self.generation)
+        self._file = open(path, 'ab')
+        self.journal_bytes = self._file.tell()
+        if self.sync == 'group' and self._flusher is None:
+            self._flusher = threading.Thread(target=self._flush_loop, name='reputation-journal',
+                                             daemon=True)
+            self._flusher.start()
+
+    # === Запис ===
+
+    def append(self, name: str, value: float, timestamp: Optional[float] = None):
+        """Додає оновлення в поточний кадр (NaN - видалення)"""
+        if '\0' in name:
+            raise ValueError("Source name must not contain NUL characters")
+        with self._lock:
+            self._check_open()
+            self._names.append(name)
+            self._values.append(value)
+            self._values.append(self.clock() if timestamp is None else timestamp)
+            full = len(self._names) >= self.group_size or self.sync == 'always'
+        if full:
+            self.flush()
+
+    def flush(self):
+        """Записує накопичений кадр (з fsync, крім режиму 'none')"""
+        with self._io_lock:
+            with self._lock:
+                self._check_open()
+                if not self._names:
+                    return
+                names, values = self._names, self._values
+                self._names, self._values = [], array('d')
+            frame = encode_frame(names, values)
+            self._file.write(frame)
+            self._file.flush()
+            if self.sync != 'none':
+                os.fsync(self._file.fileno())
+            self.journal_bytes += len(frame)
+
+    def _check_open(self):
+        if self._file is None:
+            raise ValueError("journal is closed")
+
+    def _flush_loop(self):
+        while not self._closed.wait(self.group_interval):
+            if self._names:
+                self.flush()
+
+    # === Знімки ===
+
+    def snapshot(self, state: Callable[[], Frame]):
+        """
+        Знімок стану і компакція
+
+        Межа поколінь береться під блокуванням запису: усе, що потрапило
+        в журнал до неї, входить у знімок, решта - у новий журнал.
+
+        Args:
+            state: Викликається на межі поколінь; повертає копію стану
+                   (імена, array('d') пар [значення, час])
+        """
+        with self._snapshot_lock:
+            with self._io_lock:
+                with self._lock:
+                    self._check_open()
+                    pending = self._names, self._values
+                    self._names, self._values = [], array('d')
+                    names, values = state()
+                if pending[0]:
+                    self._file.write(encode_frame(*pending))
+                self._file.flush()
+                os.fsync(self._file.fileno())
+                self._file.close()
+                self.generation += 1
+                self._open_journal()
+
+            target = self._path('snapshot', self.generation)
+            tmp = target.with_suffix('.tmp')
+            with open(tmp, 'wb') as f:
+                f.write(encode_frame(names, values))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, target)
+
+            for kind in ('snapshot', 'journal'):
+                for gen, path in self._files(kind).items():
+                    if gen < self.generation:
+                        path.unlink()
+
+    def close(self):
+        if self._file is None:
+            return
+        self._closed.set()
+        if self._flusher is not None:
+            self._flusher.join()
+        with self._io_lock:
+            # Останній кадр і закриття під одним блокуванням: append після
+            # цього отримує ValueError, а не губиться в буфері
+            with self._lock:
+                file, self._file = self._file, None
+                names, values = self._names, self._values
+                self._names, self._values = [], array('d')
+            if names:
+                frame = encode_frame(names, values)
+                file.write(frame)
+                file.flush()
+                if self.sync != 'none':
+                    os.fsync(file.fileno())
+                self.journal_bytes += len(frame)
+            file.close()
+
+
+class JournaledRegistry(MutableMapping):
+    """
+    Реєстр репутацій (dict-сумісний), що переживає рестарт процесу
+
+    Движки читають get() і присвоюють registry[source] = value -
+    кожне присвоєння потрапляє в журнал. Усередині - індекс ім'я -> слот
+    і колонки array('d') значень та часу оновлення: знімок на 10M джерел
+    відновлюється одним побудовою індексу, без поелементного розбору.
+
+    Example:
+        >>> registry = JournaledRegistry('data/reputation')
+        >>> engine = VeritasCore(registry=registry)
+        >>> engine.evaluate_integrity(text, 'BBC')
+        >>> registry.close()
+    """
+
+    def __init__(self, directory: str, snapshot_bytes: Optional[int] = 64 * 1024 * 1024,
+                 **journal_options):
+        """
+        Args:
+            directory: Каталог журналу
+            snapshot_bytes: Автоматичний (фоновий) знімок, коли журнал
+                            перевищує цей розмір (None - лише вручну)
+            journal_options: sync, group_interval, group_size, clock (ReputationJournal)
+        """
+        self.journal = ReputationJournal(directory, **journal_options)
+        self.snapshot_bytes = snapshot_bytes
+        self._slots: Dict[str, int] = {}
+        self._names: List[str] = []
+        self._values = array('d')
+        self._updated = array('d')
+        self._deleted = 0
+        # Виділення слотів і лічильник видалених; RMW по ключу - ConcurrentRegistry
+        self._lock = threading.Lock()
+        self._snapshotter: Optional[threading.Thread] = None
+
+        snapshot, frames = self.journal.recover()
+        if snapshot is not None:
+            # Знімок компактний (без видалених і повторів): колонки беруться цілими масивами
+            names, pairs = snapshot
+            self._slots = dict(zip(names, range(len(names))))
+            self._names = names
+            self._values, self._updated = pairs[0::2], pairs[1::2]
+        for names, pairs in frames:
+            for name, value, timestamp in zip(names, pairs[0::2], pairs[1::2]):
+                self._store(name, value, timestamp)
+
+    def _store(self, name: str, value: float, timestamp: float):
+        slot = self._slots.get(name)
+        if slot is None:
+            if value != value:
+                return
+            self._slots[name] = len(self._names)
+            self._names.append(name)
+            self._values.append(value)
+            self._updated.append(timestamp)
+            return
+        old = self._values[slot]
+        self._deleted += (value != value) - (old != old)
+        self._values[slot] = value
+        self._updated[slot] = timestamp
+
+    def __getitem__(self, name: str) -> float:
+        value = self._values[self._slots[name]]
+        if value != value:
+            raise KeyError(name)
+        return value
+
+    def get(self, name: str, default=None):
+        slot = self._slots.get(name)
+        if slot is None:
+            return default
+        value = self._values[slot]
+        return default if value != value else value
+
+    def updated_at(self, name: str) -> Optional[float]:
+        """Час останнього оновлення джерела"""
+        return self._updated[self._slots[name]] if name in self else None
+
+    def __setitem__(self, name: str, value: float):
+        self.store(name, value)
+
+    def store(self, name: str, value: float, timestamp: Optional[float] = None):
+        """Присвоєння з явним часом оновлення (default - clock журналу)"""
+        # Спершу пам'ять, потім журнал: знімок на межі поколінь може вже
+        # містити значення, а запис у новому журналі лише повторить його
+        if timestamp is None:
+            timestamp = self.journal.clock()
+        with self._lock:
+            self._store(name, value, timestamp)
+        self.journal.append(name, value, timestamp)
+        if self.snapshot_bytes and self.journal.journal_bytes > self.snapshot_bytes:
+            self._snapshot_in_background()
+
+    def _snapshot_in_background(self):
+        """
+        Автоматичний знімок без I/O у потоці записувача (той може тримати
+        блокування ConcurrentRegistry); поки знімок пишеться, нові не
+        запускаються
+        """
+        with self._lock:
+            if self._snapshotter is not None and self._snapshotter.is_alive():
+                return
+            self._snapshotter = threading.Thread(target=self.snapshot, name='reputation-snapshot',
+                                                 daemon=True)
+            self._snapshotter.start()
+
+    def wait_snapshot(self):
+        """Чекає завершення фонового знімка"""
+        snapshotter = self._snapshotter
+        if snapshotter is not None:
+            snapshotter.join()
+
+    def __delitem__(self, name: str):
+        if name not in self:
+            raise KeyError(name)
+        timestamp = self.journal.clock()
+        with self._lock:
+            self._store(name, _DELETED, timestamp)
+        self.journal.append(name, _DELETED, timestamp)
+
+    def __iter__(self) -> Iterator[str]:
+        return (name for name, value in zip(self._names, self._values) if value == value)
+
+    def __len__(self) -> int:
+        return len(self._names) - self._deleted
+
+    def __contains__(self, name) -> bool:
+        slot = self._slots.get(name)
+        return slot is not None and self._values[slot] == self._values[slot]
+
+    def __repr__(self) -> str:
+        return f"JournaledRegistry({dict(self)!r})"
+
+    def columns(self) -> Tuple[List[str], array, array]:
+        """
+        Узгоджена копія колонок (для векторних операцій)
+
+        Returns:
+            (імена, значення, час оновлення); видалені - зі значенням NaN
+        """
+        with self._lock:
+            return list(self._names), array('d', self._values), array('d', self._updated)
+
+    def _state(self) -> Frame:
+        """Копія стану для знімка: (імена, пари [значення, час]) без видалених"""
+        names, values, updated = self.columns()
+        if self._deleted:
+            live = [i for i, value in enumerate(values) if value == value]
+            names = [names[i] for i in live]
+            values = array('d', (values[i] for i in live))
+            updated = array('d', (updated[i] for i in live))
+        pairs = array('d', bytes(16 * len(names)))
+        pairs[0::2] = values
+        pairs[1::2] = updated
+        return names, pairs
+
+    def snapshot(self):
+        """Повний знімок і видалення старих журналів"""
+        self.journal.snapshot(self._state)
+
+    def replace(self, values: Dict[str, float], timestamp: Optional[float] = None):
+        """
+        Замінює весь реєстр одним знімком (перебудова з veritas_replay)
+
+        Атомарно: до os.replace знімка відновлення дає старий стан, після -
+        новий. Паралельні записи під час заміни не впорядковуються з нею.
+
+        Args:
+            values: Джерело -> репутація
+            timestamp: Час оновлення (default - clock журналу)
+        """
+        if timestamp is None:
+            timestamp = self.journal.clock()
+        names = list(values)
+        pairs = array('d', bytes(16 * len(names)))
+        pairs[0::2] = array('d', (float(values[name]) for name in names))
+        pairs[1::2] = array('d', [timestamp]) * len(names)
+
+        def state() -> Frame:
+            with self._lock:
+                self._slots = dict(zip(names, range(len(names))))
+                self._names = list(names)
+                self._values, self._updated = pairs[0::2], pairs[1::2]
+                self._deleted = 0
+            return names, pairs
+
+        self.journal.snapshot(state)
+
+    def flush(self):
+        self.journal.flush()
+
+    def close(self):
+        self.wait_snapshot()
+        self.journal.close()
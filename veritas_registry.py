@@ -0,0 +1,489 @@
+"""
+Veritas Protocol - Concurrent Reputation Registry
+Потокобезпечний реєстр репутацій для багатопотокових серверів
+(Flask threaded у api.py і web/app.py).
+
+evaluate_integrity робить read-modify-write (get -> штраф -> set); два
+паралельні запити по одному джерелу без блокування губили одне з
+оновлень. Тут RMW атомарний у межах ключа:
+- блокування розщеплені на смуги (lock striping): ключ -> hash % stripes,
+  тож запити по різних джерелах майже не конкурують
+- update(name, fn) - атомарне оновлення, compare_and_set - CAS
+- apply_updates(name, fns) - пакет оновлень одного джерела під одним
+  захопленням блокування
+- читання (get, [], in) без блокувань: значення в сховищі замінюється
+  цілком, тож читач бачить або старе, або нове
+
+Сховище - будь-який MutableMapping (dict або
+veritas_journal.JournaledRegistry).
+
+ReputationIndex - інкрементний індекс значень для top-K, діапазонів і
+квантилів без сортування всього реєстру.
+
+DecayingRegistry додає ліниве експоненційне згасання репутації до
+default_reputation: у сховищі лежить значення на момент останнього
+оновлення, а згасання рахується при читанні й оновленні - без фонових
+проходів по мільйонах джерел.
+"""
+
+import math
+import threading
+import time
+from bisect import bisect_left, bisect_right, insort
+from collections.abc import MutableMapping
+from itertools import accumulate, islice
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # Без NumPy - поелементне згасання в decayed()
+    np = None
+
+DEFAULT_STRIPES = 64
+_MISSING = object()
+
+
+class _SortedKeys:
+    """
+    Відсортований список ключів (значення, ім'я) шматками до 2 * LOAD
+
+    Вставка і видалення - бісекція плюс зсув у межах одного шматка, тож
+    кошик, у якому лежить майже весь реєстр (репутація 0.5 за
+    замовчуванням), не переписується цілком на кожне оновлення.
+    """
+
+    LOAD = 512
+
+    def __init__(self):
+        self._chunks: List[List[Tuple[float, str]]] = []
+        self._maxes: List[Tuple[float, str]] = []
+        self._len = 0
+        self._prefix: Optional[List[int]] = None
+
+    def __len__(self) -> int:
+        return self._len
+
+    def add(self, key: Tuple[float, str]):
+        if not self._chunks:
+            self._chunks.append([key])
+            self._maxes.append(key)
+        else:
+            i = bisect_left(self._maxes, key)
+            if i == len(self._maxes):
+                i -= 1
+                self._chunks[i].append(key)
+                self._maxes[i] = key
+            else:
+                insort(self._chunks[i], key)
+            chunk = self._chunks[i]
+            if len(chunk) > 2 * self.LOAD:
+                self._chunks[i:i + 1] = [chunk[:self.LOAD], chunk[self.LOAD:]]
+                self._maxes[i:i + 1] = [chunk[self.LOAD - 1], chunk[-1]]
+        self._len += 1
+        self._prefix = None
+
+    def remove(self, key: Tuple[float, str]):
+        i = bisect_left(self._maxes, key)
+        chunk = self._chunks[i]
+        del chunk[bisect_left(chunk, key)]
+        if chunk:
+            self._maxes[i] = chunk[-1]
+        else:
+            del self._chunks[i]
+            del self._maxes[i]
+        self._len -= 1
+        self._prefix = None
+
+    def _offsets(self) -> List[int]:
+        if self._prefix is None:
+            self._prefix = list(accumulate(map(len, self._chunks)))
+        return self._prefix
+
+    def bisect_left(self, key: Tuple) -> int:
+        """Позиція першого ключа >= key"""
+        i = bisect_left(self._maxes, key)
+        if i == len(self._maxes):
+            return self._len
+        return (self._offsets()[i - 1] if i else 0) + bisect_left(self._chunks[i], key)
+
+    def islice(self, start: int, stop: int) -> Iterator[Tuple[float, str]]:
+        """Ключі на позиціях [start, stop)"""
+        if start >= stop:
+            return
+        offsets = self._offsets()
+        i = bisect_right(offsets, start)
+        position = start - (offsets[i - 1] if i else 0)
+        remaining = stop - start
+        while remaining > 0 and i < len(self._chunks):
+            taken = self._chunks[i][position:position + remaining]
+            yield from taken
+            remaining -= len(taken)
+            i, position = i + 1, 0
+
+    def __getitem__(self, index: int) -> Tuple[float, str]:
+        return next(self.islice(index, index + 1))
+
+
+class ReputationIndex:
+    """
+    Індекс репутацій у [0, 1]: кошики фіксованої ширини, у кожному -
+    відсортовані ключі (значення, ім'я)
+
+    Оновлення O(log n); сторінка top-K, діапазону чи квантиль - лічильники
+    кошиків плюс бісекція в кошиках на краях сторінки, без сортування.
+
+    Значення - ті, що записані в реєстр: з DecayingRegistry індекс не
+    використовується (згасання змінює значення і порядок без записів).
+
+    Example:
+        >>> registry = ConcurrentRegistry(index=ReputationIndex())
+        >>> registry.index.top_k(10)
+        [('Dr_Snizhok', 1.0), ...]
+    """
+
+    def __init__(self, buckets: int = 1000):
+        self.buckets = buckets
+        self._values: Dict[str, float] = {}
+        self._bins: List[_SortedKeys] = [_SortedKeys() for _ in range(buckets)]
+        self._lock = threading.Lock()
+
+    def _bin(self, value: float) -> int:
+        if value <= 0.0:
+            return 0
+        if value >= 1.0:
+            return self.buckets - 1
+        return min(int(value * self.buckets), self.buckets - 1)
+
+    def update(self, name: str, value: float):
+        with self._lock:
+            old = self._values.get(name)
+            if old is not None:
+                self._bins[self._bin(old)].remove((old, name))
+            self._values[name] = value
+            self._bins[self._bin(value)].add((value, name))
+
+    def remove(self, name: str):
+        with self._lock:
+            old = self._values.pop(name, None)
+            if old is not None:
+                self._bins[self._bin(old)].remove((old, name))
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    @staticmethod
+    def _descending(bucket: _SortedKeys, lo: int, hi: int, offset: int) -> Iterator[Tuple[str, float]]:
+        """
+        Ключі bucket[lo:hi] за (-значення, ім'я), починаючи з offset:
+        серії рівних значень ідуть назад, ім'я всередині серії - вперед
+        """
+        r = hi - 1 - offset
+        while r >= lo:
+            value = bucket[r][0]
+            first = bucket.bisect_left((value,))
+            end = bucket.bisect_left((math.nextafter(value, math.inf),))
+            for value, name in bucket.islice(first + end - 1 - r, end):
+                yield name, value
+            r = first - 1
+
+    def _walk(self, descending: bool, offset: int, limit: int,
+              low: float = -math.inf, high: float = math.inf) -> List[Tuple[str, float]]:
+        order = range(self._bin(high), self._bin(low) - 1, -1) if descending \
+            else range(self._bin(low), self._bin(high) + 1)
+        result = []
+        with self._lock:
+            for index in order:
+                if len(result) >= limit:
+                    break
+                bucket = self._bins[index]
+                if not bucket:
+                    continue
+                lo, hi = 0, len(bucket)
+                if index in (self._bin(low), self._bin(high)):
+                    lo = bucket.bisect_left((low,))
+                    hi = bucket.bisect_left((math.nextafter(high, math.inf),))
+                if offset >= hi - lo:
+                    # Кошик цілком до сторінки - пропускаємо за лічильником
+                    offset -= max(0, hi - lo)
+                    continue
+                need = limit - len(result)
+                if descending:
+                    result.extend(islice(self._descending(bucket, lo, hi, offset), need))
+                else:
+                    result.extend((name, value) for value, name
+                                  in bucket.islice(lo + offset, min(hi, lo + offset + need)))
+                offset = 0
+        return result
+
+    def top_k(self, k: int, offset: int = 0) -> List[Tuple[str, float]]:
+        """k найвищих (значення за спаданням, ім'я за зростанням)"""
+        return self._walk(True, offset, k)
+
+    def bottom_k(self, k: int, offset: int = 0) -> List[Tuple[str, float]]:
+        """k найнижчих"""
+        return self._walk(False, offset, k)
+
+    def range(self, low: float, high: float, offset: int = 0,
+              limit: int = 100) -> List[Tuple[str, float]]:
+        """Джерела з low <= репутація <= high, за зростанням"""
+        return self._walk(False, offset, limit, low, high)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Значення на позиції floor(q * (n - 1)) у порядку зростання"""
+        with self._lock:
+            if not self._values:
+                return None
+            rank = int(min(max(q, 0.0), 1.0) * (len(self._values) - 1))
+            for bucket in self._bins:
+                if rank < len(bucket):
+                    return bucket[rank][0]
+                rank -= len(bucket)
+        return None
+
+
+class ConcurrentRegistry(MutableMapping):
+    """
+    Реєстр репутацій з розщепленими блокуваннями
+
+    Example:
+        >>> registry = ConcurrentRegistry({'BBC': 0.6})
+        >>> registry.update('BBC', lambda rep: round(rep - 0.1, 2), 0.5)
+        (0.6, 0.5)
+    """
+
+    def __init__(self, data: Optional[MutableMapping] = None, stripes: int = DEFAULT_STRIPES,
+                 index: Optional[ReputationIndex] = None):
+        """
+        Args:
+            data: Сховище (default - новий dict); використовується без копіювання
+            stripes: Кількість смуг блокувань
+            index: ReputationIndex, що оновлюється з кожним записом
+        """
+        if stripes < 1:
+            raise ValueError("stripes must be >= 1")
+        self.data = {} if data is None else data
+        self._locks = [threading.Lock() for _ in range(stripes)]
+        self.index = index
+        if index is not None:
+            for name, value in list(self.data.items()):
+                index.update(name, value)
+
+    def lock_for(self, name: str) -> threading.Lock:
+        """Блокування смуги, до якої належить ключ"""
+        return self._locks[hash(name) % len(self._locks)]
+
+    # === Атомарні оновлення ===
+
+    def update(self, name: str, fn: Callable[[float], float],
+               default: Optional[float] = None) -> Tuple[float, float]:
+        """
+        Атомарно замінює значення на fn(поточне)
+
+        Args:
+            name: Джерело
+            fn: Нове значення з поточного (без побічних ефектів і блокувань)
+            default: Поточне значення для відсутнього ключа
+
+        Returns:
+            (старе значення, нове значення)
+        """
+        with self.lock_for(name):
+            old = self._read(name, default)
+            new = fn(old)
+            self._write(name, new)
+        return old, new
+
+    def apply_updates(self, name: str, fns: Iterable[Callable[[float], float]],
+                      default: Optional[float] = None) -> List[Tuple[float, float]]:
+        """
+        Послідовно застосовує пакет оновлень одного джерела під одним блокуванням
+
+        Returns:
+            [(старе, нове)] для кожного оновлення у вхідному порядку
+        """
+        results = []
+        with self.lock_for(name):
+            current = self._read(name, default)
+            for fn in fns:
+                new = fn(current)
+                results.append((current, new))
+                current = new
+            if results:
+                self._write(name, current)
+        return results
+
+    def compare_and_set(self, name: str, expected: Optional[float], value: float) -> bool:
+        """Записує value, лише якщо поточне значення == expected (None - ключ відсутній)"""
+        with self.lock_for(name):
+            if self._read(name, None) != expected:
+                return False
+            self._write(name, value)
+            return True
+
+    def setdefault(self, name: str, default: Optional[float] = None) -> Optional[float]:
+        with self.lock_for(name):
+            if name in self:
+                return self._read(name, None)
+            self._write(name, default)
+            return default
+
+    # === Сховище (перевизначається в DecayingRegistry) ===
+
+    def _read(self, name: str, default: Optional[float]) -> Optional[float]:
+        return self.data.get(name, default)
+
+    def _write(self, name: str, value: float):
+        self.data[name] = value
+        if self.index is not None:
+            self.index.update(name, value)
+
+    # === Mapping ===
+
+    def __getitem__(self, name: str) -> float:
+        value = self._read(name, _MISSING)
+        if value is _MISSING:
+            raise KeyError(name)
+        return value
+
+    def get(self, name: str, default=None):
+        return self._read(name, default)
+
+    def __setitem__(self, name: str, value: float):
+        with self.lock_for(name):
+            self._write(name, value)
+
+    def __delitem__(self, name: str):
+        with self.lock_for(name):
+            del self.data[name]
+            if self.index is not None:
+                self.index.remove(name)
+
+    def __iter__(self) -> Iterator[str]:
+        # Знімок ключів: ітерація не падає, якщо паралельно додаються джерела
+        return iter(list(self.data))
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __contains__(self, name) -> bool:
+        return name in self.data
+
+    def __repr__(self) -> str:
+        return f"ConcurrentRegistry({dict(self.items())!r})"
+
+
+class DecayingRegistry(ConcurrentRegistry):
+    """
+    Реєстр, у якому репутація згасає до default_reputation з часом
+
+    value(t) = default + (value - default) * 2 ** (-(t - updated) / half_life)
+
+    Згасання застосовується при кожному читанні (get, [], update), тож
+    states.calculate_state_from_reputation і get_system_state отримують
+    уже згаслу репутацію. Оновлення (update, apply_updates) стартують від
+    згаслого значення і записують результат з поточним часом.
+
+    Example:
+        >>> registry = DecayingRegistry({'RT': 0.1}, half_life=30 * 86400)
+        >>> registry['RT']  # через 30 днів -> 0.3
+    """
+
+    def __init__(self, data: Optional[MutableMapping] = None, half_life: float = 30 * 86400,
+                 default_reputation: float = 0.5, clock: Callable[[], float] = time.time,
+                 stripes: int = DEFAULT_STRIPES):
+        """
+        ReputationIndex не підтримується: індекс тримав би значення на момент
+        запису, а читання повертають згаслі. Для рейтингів - decayed()
+        (одне векторне обчислення) і heapq.nlargest.
+
+        Args:
+            data: Сховище. JournaledRegistry зберігає час оновлення сам
+                  (і переживає рестарт); для dict час ведеться тут, а наявні
+                  значення вважаються оновленими в момент створення
+            half_life: Період напівзгасання в секундах
+            default_reputation: Рівноважна репутація
+            clock: Джерело часу (для тестів)
+            stripes: Кількість смуг блокувань
+        """
+        if half_life <= 0:
+            raise ValueError("half_life must be positive")
+        super().__init__(data, stripes)
+        self.half_life = half_life
+        self.default_reputation = default_reputation
+        self.clock = clock
+        self._rate = math.log(2) / half_life
+        self._timestamped = hasattr(self.data, 'store') and hasattr(self.data, 'updated_at')
+        self.updated: Dict[str, float] = {} if self._timestamped else dict.fromkeys(self.data, clock())
+
+    def decay(self, value: float, updated: Optional[float], now: float) -> float:
+        """Значення value, записане в момент updated, на момент now"""
+        if updated is None or now <= updated:
+            return value
+        factor = math.exp(-self._rate * (now - updated))
+        return self.default_reputation + (value - self.default_reputation) * factor
+
+    def updated_at(self, name: str) -> Optional[float]:
+        """Час останнього оновлення джерела"""
+        if self._timestamped:
+            return self.data.updated_at(name)
+        return self.updated.get(name)
+
+    def _read(self, name: str, default: Optional[float]) -> Optional[float]:
+        value = self.data.get(name, _MISSING)
+        if value is _MISSING:
+            return default
+        return self.decay(value, self.updated_at(name), self.clock())
+
+    def _write(self, name: str, value: float):
+        now = self.clock()
+        if self._timestamped:
+            self.data.store(name, value, now)
+        else:
+            self.updated[name] = now
+            self.data[name] = value
+        if self.index is not None:
+            self.index.update(name, value)
+
+    def __delitem__(self, name: str):
+        with self.lock_for(name):
+            del self.data[name]
+            self.updated.pop(name, None)
+            if self.index is not None:
+                self.index.remove(name)
+
+    def decayed(self, names: Optional[Iterable[str]] = None) -> Dict[str, float]:
+        """
+        Згаслі значення пакетом (дашборди): одне векторне обчислення
+        замість виклику decay на кожне джерело
+
+        Args:
+            names: Джерела (default - усі); відсутні пропускаються
+
+        Returns:
+            Dict[str, float]: {джерело: репутація зараз}
+        """
+        now = self.clock()
+        if names is None and hasattr(self.data, 'columns'):
+            # Колонки JournaledRegistry; видалені мають значення NaN
+            keys, values, updated = self.data.columns()
+        else:
+            keys = list(self.data) if names is None else list(names)
+            values = list(map(self.data.get, keys, [math.nan] * len(keys)))
+            if self._timestamped:
+                updated = [self.data.updated_at(name) for name in keys]
+            else:
+                updated = list(map(self.updated.get, keys, [now] * len(keys)))
+            updated = [now if stamp is None else stamp for stamp in updated]
+
+        if np is not None:
+            values = np.asarray(values, dtype=np.float64)
+            elapsed = now - np.asarray(updated, dtype=np.float64)
+            factor = np.exp(-self._rate * np.maximum(elapsed, 0.0))
+            current = np.where(elapsed > 0, self.default_reputation
+                               + (values - self.default_reputation) * factor, values)
+            if not np.isnan(current).any():
+                return dict(zip(keys, current.tolist()))
+            current = current.tolist()
+        else:
+            current = [self.decay(value, stamp, now) for value, stamp in zip(values, updated)]
+        return {name: value for name, value in zip(keys, current) if value == value}
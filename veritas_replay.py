@@ -0,0 +1,290 @@
+"""
+Veritas Protocol - Parallel Deterministic Replay
+Перебудова реєстру репутацій з журналу аналізів (таблиця analyses
+VeritasDatabase або її JSON-експорт) після зміни slashing-параметрів.
+
+Оновлення репутації залежить лише від історії самого джерела, тож:
+- записи розбиваються на партиції за джерелом
+- кожна партиція програється у своєму порядку (timestamp, id) у
+  ProcessPoolExecutor; дрібні партиції пакуються в задачі
+- реєстр = початковий реєстр движка + фінальні значення партицій
+
+Результат побітово збігається з послідовним прогоном (replay_serial):
+для кожного джерела виконується та сама послідовність операцій з float.
+
+Записи без тексту програються за збереженою оцінкою (entropy_index,
+language, diagnostics); записи з полем text переоцінюються score_text
+(мова - автовизначення).
+Згасання репутації (reputation_decay) при програванні вимкнене: воно
+залежить від годинника, а не від журналу.
+
+Результат можна записати назад (--write-db, --write-journal) - кожен
+запис атомарний; сервіс, що пише в той самий реєстр, варто зупинити.
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'veritas-news-analyzer', 'app'))
+
+# Мінімум записів у задачі воркера (дрібні партиції групуються)
+TASK_RECORDS = 2048
+
+
+def make_replay_engine(kind: str = 'multilingual', config: Optional[Dict] = None):
+    """
+    Движок з реєстром для програвання
+
+    Args:
+        kind: 'multilingual' (MultilingualVeritasCore) або 'core' (VeritasCore)
+        config: Секція veritas з config.yaml (без reputation_decay); лише
+                для 'multilingual' - VeritasCore не має параметрів
+    """
+    if kind == 'multilingual':
+        from translator import MultilingualVeritasCore
+        config = {key: value for key, value in (config or {}).items() if key != 'reputation_decay'}
+        return MultilingualVeritasCore(config)
+    if kind == 'core':
+        if config:
+            raise ValueError("The 'core' engine takes no config")
+        from veritas_core import VeritasCore
+        return VeritasCore()
+    raise ValueError(f"Unknown engine: {kind}")
+
+
+# === Джерела записів ===
+
+def _record_from_row(row: Dict) -> Dict:
+    """Запис журналу з рядка analyses (БД або експорт export_to_json)"""
+    full = row.get('full_data')
+    analysis = (json.loads(full) if isinstance(full, str) else full or {}).get('veritas_analysis', {})
+    return {
+        'id': row.get('id') or 0,
+        'timestamp': row['timestamp'],
+        'source': row['source'],
+        'language': analysis.get('language', row.get('language') or 'en'),
+        'entropy_index': row['entropy_index'],
+        'diagnostics': analysis.get('diagnostics', {})
+    }
+
+
+def load_database(db_path: str) -> Iterator[Dict]:
+    """Записи таблиці analyses"""
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    try:
+        for row in conn.execute("""
+            SELECT id, timestamp, source, language, entropy_index, full_data FROM analyses
+        """):
+            yield _record_from_row(dict(row))
+    finally:
+        conn.close()
+
+
+def load_log(path: str) -> Iterator[Dict]:
+    """
+    Записи з експорту: JSON-масив (export_to_json) або JSONL, де рядок -
+    рядок analyses чи {timestamp, source, text} для переоцінки
+    """
+    with open(path, encoding='utf-8') as f:
+        content = f.read()
+    stripped = content.lstrip()
+    rows = json.loads(content) if stripped.startswith('[') else \
+        (json.loads(line) for line in content.splitlines() if line.strip())
+    for i, row in enumerate(rows):
+        if 'text' in row:
+            yield {'id': row.get('id', i), 'timestamp': row['timestamp'],
+                   'source': row['source'], 'text': row['text']}
+        else:
+            yield _record_from_row(row)
+
+
+# === Програвання ===
+
+def _order(record: Dict) -> Tuple:
+    return record['timestamp'], record['id']
+
+
+def _scores(engine, records: List[Dict]) -> List[Dict]:
+    scores = []
+    for record in records:
+        if 'text' in record:
+            scores.append(engine.score_text(record['text']))
+        else:
+            scores.append({
+                'language': record['language'],
+                'entropy_index': record['entropy_index'],
+                'diagnostics': record['diagnostics']
+            })
+    return scores
+
+
+def _replay_partition(engine, source: str, records: List[Dict]) -> float:
+    engine.apply_scores(source, _scores(engine, sorted(records, key=_order)))
+    return engine.reputation_registry[source]
+
+
+_worker_engine = None
+
+
+def _init_worker(kind: str, config: Optional[Dict]):
+    global _worker_engine
+    _worker_engine = make_replay_engine(kind, config)
+
+
+def _replay_task(partitions: List[Tuple[str, List[Dict]]]) -> Dict[str, float]:
+    return {source: _replay_partition(_worker_engine, source, records)
+            for source, records in partitions}
+
+
+def partition(records: Iterable[Dict]) -> Dict[str, List[Dict]]:
+    """Записи за джерелом"""
+    partitions: Dict[str, List[Dict]] = {}
+    for record in records:
+        partitions.setdefault(record['source'], []).append(record)
+    return partitions
+
+
+def _tasks(partitions: Dict[str, List[Dict]], task_records: int) -> Iterator[List[Tuple[str, List[Dict]]]]:
+    task, size = [], 0
+    # Великі партиції першими - менше хвоста в кінці
+    for source in sorted(partitions, key=lambda s: -len(partitions[s])):
+        task.append((source, partitions[source]))
+        size += len(partitions[source])
+        if size >= task_records:
+            yield task
+            task, size = [], 0
+    if task:
+        yield task
+
+
+def replay_serial(records: Iterable[Dict], kind: str = 'multilingual',
+                  config: Optional[Dict] = None) -> Dict[str, float]:
+    """Еталон: усі записи одним движком у глобальному порядку (timestamp, id)"""
+    engine = make_replay_engine(kind, config)
+    for record in sorted(records, key=_order):
+        engine.apply_score(record['source'], _scores(engine, [record])[0])
+    return dict(engine.reputation_registry)
+
+
+def replay_parallel(records: Iterable[Dict], kind: str = 'multilingual',
+                    config: Optional[Dict] = None, workers: Optional[int] = None,
+                    task_records: int = TASK_RECORDS) -> Dict[str, float]:
+    """
+    Програвання, розбите за джерелами, у пулі процесів
+
+    Returns:
+        Dict[str, float]: реєстр, ідентичний replay_serial
+    """
+    partitions = partition(records)
+    registry = dict(make_replay_engine(kind, config).reputation_registry)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        _init_worker(kind, config)
+        for task in _tasks(partitions, task_records):
+            registry.update(_replay_task(task))
+        return registry
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(kind, config)) as pool:
+        for finals in pool.map(_replay_task, _tasks(partitions, task_records)):
+            registry.update(finals)
+    return registry
+
+
+# === Запис результату ===
+
+def write_database(db_path: str, registry: Dict[str, float], records: Optional[List[Dict]] = None):
+    """
+    Реєстр у таблицю source_reputation VeritasDatabase (одна транзакція)
+
+    Args:
+        records: Програні записи - для total_analyses
+    """
+    from database import VeritasDatabase
+    counts = dict(Counter(record['source'] for record in records)) if records is not None else None
+    db = VeritasDatabase(db_path)
+    try:
+        db.replace_reputations(registry, counts)
+    finally:
+        db.close()
+
+
+def write_journal(directory: str, registry: Dict[str, float]):
+    """Реєстр як знімок JournaledRegistry (api.py: VERITAS_REPUTATION_DIR)"""
+    from veritas_journal import JournaledRegistry
+    journaled = JournaledRegistry(directory, snapshot_bytes=None)
+    try:
+        journaled.replace(registry)
+    finally:
+        journaled.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Veritas Protocol - replay analyses to rebuild reputation')
+    parser.add_argument('--db', help='SQLite база VeritasDatabase')
+    parser.add_argument('--log', help='JSON/JSONL експорт аналізів')
+    parser.add_argument('--config', help='config.yaml (секція veritas)')
+    parser.add_argument('--engine', choices=['multilingual', 'core'], default='multilingual')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--out', help='Куди записати реєстр (JSON)')
+    parser.add_argument('--verify', action='store_true', help='Порівняти з послідовним прогоном')
+    parser.add_argument('--write-db', nargs='?', const=True, metavar='DB',
+                        help='Записати реєстр у source_reputation (default - база --db)')
+    parser.add_argument('--write-journal', nargs='?', const=True, metavar='DIR',
+                        help='Записати реєстр знімком JournaledRegistry (default - VERITAS_REPUTATION_DIR)')
+    args = parser.parse_args()
+
+    if not args.db and not args.log:
+        parser.error("either --db or --log is required")
+    if args.engine == 'core' and args.config:
+        parser.error("--config applies only to --engine multilingual")
+    if args.write_db is True:
+        if not args.db:
+            parser.error("--write-db needs a path when replaying --log")
+        args.write_db = args.db
+    if args.write_journal is True:
+        args.write_journal = os.environ.get('VERITAS_REPUTATION_DIR')
+        if not args.write_journal:
+            parser.error("--write-journal needs a directory or VERITAS_REPUTATION_DIR")
+    records = list(load_database(args.db) if args.db else load_log(args.log))
+
+    config = None
+    if args.config:
+        import yaml
+        with open(args.config, encoding='utf-8') as f:
+            config = (yaml.safe_load(f) or {}).get('veritas')
+
+    start = time.perf_counter()
+    registry = replay_parallel(records, args.engine, config, args.workers)
+    elapsed = time.perf_counter() - start
+    print(f"{len(records)} records, {len(registry)} sources, {elapsed:.2f}s")
+
+    if args.verify:
+        start = time.perf_counter()
+        serial = replay_serial(records, args.engine, config)
+        print(f"serial: {time.perf_counter() - start:.2f}s, identical: {serial == registry}")
+        if serial != registry:
+            sys.exit(1)
+
+    if args.out:
+        Path(args.out).write_text(json.dumps(registry, ensure_ascii=False, indent=2), encoding='utf-8')
+    if args.write_db:
+        write_database(args.write_db, registry, records)
+        print(f"written to {args.write_db}")
+    if args.write_journal:
+        write_journal(args.write_journal, registry)
+        print(f"written to {args.write_journal}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,369 @@
+"""
+Veritas Protocol - Shared-Memory Reputation Table
+Один реєстр репутацій на всі воркери багатопроцесного сервера
+(gunicorn/uwsgi для api.py) без зовнішнього сервісу.
+
+Таблиця живе в multiprocessing.shared_memory:
+    заголовок '<4sIIIQQ': magic, місткість, ширина імені, розмір запису,
+                          зайняті слоти, живі записи
+    записи фіксованої ширини '<QQddH' + ім'я:
+        seq (seqlock), хеш імені (0 - порожній слот), значення float64,
+        час оновлення float64, довжина імені, UTF-8 ім'я
+
+- ім'я -> слот: відкрита адресація з лінійним пробуванням по стабільному
+  хешу (blake2b, однаковий у всіх процесах); слот назавжди закріплений за
+  іменем, тож кожен процес кешує знайдені слоти - пошук O(1)
+- читання без блокувань: seqlock на запис (непарний seq - запис триває,
+  читач повторює); після SPIN_LIMIT спроб читач бере блокування запису -
+  непарний seq під ним лишив воркер, що впав посеред запису, і читач
+  його виправляє
+- записи серіалізовані: threading.Lock + flock на файлі поруч
+  (між процесами); update/apply_updates - атомарний read-modify-write
+  для всіх воркерів
+- видалення - NaN у значенні (слот лишається за іменем)
+- місткість фіксована: нові імена приймаються до MAX_LOAD слотів, далі -
+  TableFullError (або, з drop_when_full, попередження і запис не
+  зберігається - джерело читається як нове)
+"""
+
+import hashlib
+import math
+import os
+import struct
+import tempfile
+import threading
+import time
+import warnings
+import weakref
+from array import array
+from multiprocessing import resource_tracker, shared_memory
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: лише блокування в межах процесу
+    fcntl = None
+
+from veritas_registry import ConcurrentRegistry
+
+MAGIC = b'VRS1'
+_HEADER = struct.Struct('<4sIIIQQ')
+HEADER_SIZE = 64
+_RECORD = struct.Struct('<QQddH')
+_SEQ = struct.Struct('<Q')
+_PAIR = struct.Struct('<dd')
+_HASH_OFFSET = 8
+_PAIR_OFFSET = 16
+_NAME_OFFSET = _RECORD.size
+
+# Частка заповнення, після якої нові імена не приймаються
+MAX_LOAD = 0.9
+# Спроби читання при непарному seq до взяття блокування запису
+SPIN_LIMIT = 1000
+
+
+class TableFullError(MemoryError):
+    """У таблиці немає місця для нового джерела"""
+
+
+def _name_hash(encoded: bytes) -> int:
+    # Стабільний між процесами (hash() рандомізується); 0 зарезервовано
+    return int.from_bytes(hashlib.blake2b(encoded, digest_size=8).digest(), 'little') | 1
+
+
+class _WriteLock:
+    """Серіалізація записів: між потоками і (через flock) між процесами"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._thread_lock = threading.Lock()
+        self._file = open(path, 'a+b') if fcntl is not None else None
+        self._owner = None
+        _write_locks.add(self)
+
+    def _after_fork(self):
+        # flock належить відкритому опису файлу, спільному після fork:
+        # дочірній процес відкриває власний, інакше блокування з батьком і
+        # сусідніми воркерами (gunicorn --preload) не виключають одне одного.
+        # Скопійований threading.Lock міг бути захоплений іншим потоком батька
+        self._thread_lock = threading.Lock()
+        self._owner = None
+        if self._file is not None:
+            self._file.close()
+            self._file = open(self.path, 'a+b')
+
+    def __enter__(self):
+        self._thread_lock.acquire()
+        if self._file is not None:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+        self._owner = threading.get_ident()
+        return self
+
+    def __exit__(self, *exc):
+        self._owner = None
+        if self._file is not None:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+        self._thread_lock.release()
+        return False
+
+    def held(self) -> bool:
+        """Чи тримає блокування поточний потік"""
+        return self._owner == threading.get_ident()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+_write_locks: 'weakref.WeakSet[_WriteLock]' = weakref.WeakSet()
+
+
+def _reopen_write_locks():
+    for lock in list(_write_locks):
+        lock._after_fork()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reopen_write_locks)
+
+
+class SharedReputationTable(ConcurrentRegistry):
+    """
+    Реєстр репутацій у спільній пам'яті (dict-сумісний)
+
+    Перший процес створює сегмент, решта підключаються за іменем.
+    Сегмент живе, доки не викликано unlink().
+
+    Example:
+        >>> table = SharedReputationTable('veritas-reputation', capacity=1 << 20)
+        >>> engine = VeritasCore(registry=table)   # у кожному воркері
+        >>> table.close()
+    """
+
+    def __init__(self, name: str = 'veritas-reputation', capacity: int = 1 << 16,
+                 name_bytes: int = 94, clock: Callable[[], float] = time.time,
+                 lock_path: Optional[str] = None, drop_when_full: bool = False):
+        """
+        Args:
+            name: Ім'я сегмента спільної пам'яті
+            capacity: Кількість слотів (округлюється до степеня 2); лише при створенні
+            name_bytes: Максимальна довжина імені джерела в UTF-8; лише при створенні
+            clock: Джерело часу оновлень
+            lock_path: Файл блокування записів (default - у тимчасовому каталозі)
+            drop_when_full: Запис нового джерела в заповнену таблицю -
+                            попередження замість TableFullError (лічильник dropped)
+        """
+        self.name = name
+        self.clock = clock
+        self.drop_when_full = drop_when_full
+        self.dropped = 0
+        # Індекс у пам'яті процесу не бачив би записів інших воркерів
+        self.index = None
+        self.lock_path = lock_path or os.path.join(tempfile.gettempdir(), f"{name}.lock")
+        self._lock = _WriteLock(self.lock_path)
+        self._slots: Dict[str, int] = {}
+
+        capacity = 1 << max(capacity - 1, 1).bit_length()
+        record_size = (_RECORD.size + name_bytes + 7) // 8 * 8
+        with self._lock:
+            try:
+                self._shm = shared_memory.SharedMemory(
+                    name=name, create=True, size=HEADER_SIZE + capacity * record_size)
+                _HEADER.pack_into(self._shm.buf, 0, MAGIC, capacity, name_bytes, record_size, 0, 0)
+            except FileExistsError:
+                self._shm = shared_memory.SharedMemory(name=name)
+        # Життєвим циклом сегмента керує unlink(), а не resource_tracker,
+        # який інакше знищив би його з виходом першого воркера
+        resource_tracker.unregister(self._shm._name, 'shared_memory')
+
+        self._buf = self._shm.buf
+        magic, self.capacity, self.name_bytes, self.record_size, _, _ = _HEADER.unpack_from(self._buf, 0)
+        if magic != MAGIC:
+            raise ValueError(f"Shared memory segment {name!r} is not a reputation table")
+        self._mask = self.capacity - 1
+
+    # === Слоти ===
+
+    def _offset(self, slot: int) -> int:
+        return HEADER_SIZE + slot * self.record_size
+
+    def _find(self, name: str, insert: bool = False) -> Optional[int]:
+        """Слот імені; insert=True - займає порожній (лише під блокуванням запису)"""
+        slot = self._slots.get(name)
+        if slot is not None:
+            return slot
+        encoded = name.encode('utf-8')
+        if len(encoded) > self.name_bytes:
+            if insert:
+                raise ValueError(f"Source name longer than {self.name_bytes} bytes: {name!r}")
+            return None
+        key = _name_hash(encoded)
+        buf = self._buf
+        slot = key & self._mask
+        for _ in range(self.capacity):
+            offset = self._offset(slot)
+            stored = _SEQ.unpack_from(buf, offset + _HASH_OFFSET)[0]
+            if stored == 0:
+                return self._claim(slot, key, encoded, name) if insert else None
+            if stored == key:
+                length = struct.unpack_from('<H', buf, offset + _NAME_OFFSET - 2)[0]
+                if buf[offset + _NAME_OFFSET:offset + _NAME_OFFSET + length] == encoded:
+                    self._slots[name] = slot
+                    return slot
+            slot = (slot + 1) & self._mask
+        return None
+
+    def _claim(self, slot: int, key: int, encoded: bytes, name: str) -> int:
+        used, live = struct.unpack_from('<QQ', self._buf, 16)
+        if used + 1 > self.capacity * MAX_LOAD:
+            raise TableFullError(f"Reputation table {self.name!r} is full ({used} of {self.capacity} slots)")
+        offset = self._offset(slot)
+        # Ім'я і значення до хеша: хеш публікує слот для читачів
+        _RECORD.pack_into(self._buf, offset, 0, 0, math.nan, 0.0, len(encoded))
+        self._buf[offset + _NAME_OFFSET:offset + _NAME_OFFSET + len(encoded)] = encoded
+        _SEQ.pack_into(self._buf, offset + _HASH_OFFSET, key)
+        struct.pack_into('<Q', self._buf, 16, used + 1)
+        self._slots[name] = slot
+        return slot
+
+    def _load(self, slot: int) -> Tuple[float, float]:
+        """(значення, час) слота без блокувань (seqlock)"""
+        buf = self._buf
+        offset = self._offset(slot)
+        if not self._lock.held():
+            for _ in range(SPIN_LIMIT):
+                before = _SEQ.unpack_from(buf, offset)[0]
+                if before & 1:
+                    time.sleep(0)
+                    continue
+                pair = _PAIR.unpack_from(buf, offset + _PAIR_OFFSET)
+                if _SEQ.unpack_from(buf, offset)[0] == before:
+                    return pair
+            with self._lock:
+                return self._repair(offset)
+        return self._repair(offset)
+
+    def _repair(self, offset: int) -> Tuple[float, float]:
+        """
+        Читання під блокуванням запису: живих записувачів немає, тож
+        непарний seq лишився від воркера, що впав посеред _set (значення -
+        те, що він встиг записати)
+        """
+        seq = _SEQ.unpack_from(self._buf, offset)[0]
+        if seq & 1:
+            _SEQ.pack_into(self._buf, offset, seq + 1)
+        return _PAIR.unpack_from(self._buf, offset + _PAIR_OFFSET)
+
+    def _set(self, slot: int, value: float, timestamp: float):
+        """Запис значення (лише під блокуванням запису)"""
+        buf = self._buf
+        offset = self._offset(slot)
+        seq = _SEQ.unpack_from(buf, offset)[0]
+        old = _PAIR.unpack_from(buf, offset + _PAIR_OFFSET)[0]
+        _SEQ.pack_into(buf, offset, seq + 1)
+        _PAIR.pack_into(buf, offset + _PAIR_OFFSET, value, timestamp)
+        _SEQ.pack_into(buf, offset, seq + 2)
+        live_delta = (value == value) - (old == old)
+        if live_delta:
+            live = struct.unpack_from('<Q', buf, 24)[0]
+            struct.pack_into('<Q', buf, 24, live + live_delta)
+
+    # === ConcurrentRegistry ===
+
+    def lock_for(self, name: str) -> _WriteLock:
+        """Записи серіалізовані одним блокуванням для всіх процесів"""
+        return self._lock
+
+    def _read(self, name: str, default: Optional[float]) -> Optional[float]:
+        slot = self._find(name)
+        if slot is None:
+            return default
+        value = self._load(slot)[0]
+        return default if value != value else value
+
+    def _write(self, name: str, value: float):
+        try:
+            slot = self._find(name, insert=True)
+        except TableFullError as e:
+            if not self.drop_when_full:
+                raise
+            self.dropped += 1
+            warnings.warn(f"{e}; update of {name!r} dropped", RuntimeWarning)
+            return
+        self._set(slot, value, self.clock())
+
+    def store(self, name: str, value: float, timestamp: Optional[float] = None):
+        """Присвоєння з явним часом оновлення"""
+        with self._lock:
+            self._set(self._find(name, insert=True), value,
+                      self.clock() if timestamp is None else timestamp)
+
+    def updated_at(self, name: str) -> Optional[float]:
+        """Час останнього оновлення джерела"""
+        slot = self._find(name)
+        if slot is None:
+            return None
+        value, timestamp = self._load(slot)
+        return None if value != value else timestamp
+
+    # === Mapping ===
+
+    def __delitem__(self, name: str):
+        with self._lock:
+            if name not in self:
+                raise KeyError(name)
+            self._set(self._find(name), math.nan, self.clock())
+
+    def _names(self) -> Iterator[Tuple[int, str]]:
+        buf = self._buf
+        for slot in range(self.capacity):
+            offset = self._offset(slot)
+            if _SEQ.unpack_from(buf, offset + _HASH_OFFSET)[0]:
+                length = struct.unpack_from('<H', buf, offset + _NAME_OFFSET - 2)[0]
+                yield slot, bytes(buf[offset + _NAME_OFFSET:offset + _NAME_OFFSET + length]).decode('utf-8')
+
+    def __iter__(self) -> Iterator[str]:
+        return (name for slot, name in list(self._names()) if not math.isnan(self._load(slot)[0]))
+
+    def __len__(self) -> int:
+        return struct.unpack_from('<Q', self._buf, 24)[0]
+
+    def __contains__(self, name) -> bool:
+        slot = self._find(name)
+        return slot is not None and not math.isnan(self._load(slot)[0])
+
+    def __repr__(self) -> str:
+        return f"SharedReputationTable({self.name!r}, {len(self)} sources)"
+
+    def columns(self) -> Tuple[List[str], array, array]:
+        """
+        Колонки (імена, значення, час оновлення) для векторних операцій;
+        видалені - зі значенням NaN
+        """
+        names, values, updated = [], array('d'), array('d')
+        for slot, name in self._names():
+            value, timestamp = self._load(slot)
+            names.append(name)
+            values.append(value)
+            updated.append(timestamp)
+        return names, values, updated
+
+    # === Життєвий цикл ===
+
+    def close(self):
+        """Від'єднує процес від сегмента (дані лишаються для інших)"""
+        if self._buf is None:
+            return
+        self._buf = None
+        self._slots.clear()
+        self._shm.close()
+        self._lock.close()
+
+    def unlink(self):
+        """Знищує сегмент (викликає останній власник)"""
+        # SharedMemory.unlink знімає реєстрацію в resource_tracker - повертаємо її
+        resource_tracker.register(self._shm._name, 'shared_memory')
+        self._shm.unlink()
+        if os.path.exists(self.lock_path):
+            os.remove(self.lock_path)
@@ -0,0 +1,477 @@
+"""
+Veritas Protocol - Trust Propagation
+Репутація з урахуванням того, кого джерело підсилює.
+
+Граф цитувань джерело -> джерело будується зі збережених аналізів
+(таблиця analyses VeritasDatabase): ребро A -> B, якщо в матеріалі A
+згадано B - за назвою, за сайтом B у посиланні (site_key: домен або
+акаунт на платформі) або явно в content.citations / content.links.
+Вага ребра - кількість таких матеріалів.
+
+Поширена довіра (PageRank з персоналізацією базовою репутацією r):
+
+    t = min(r, (1 - d) * r + d * W t)
+
+W - цитування, нормовані за вихідною вагою рядка; джерело без цитувань
+посилається саме на себе (t = r). Довіра - очікувана базова репутація там,
+де зупиняється читач, що йде за цитуваннями з імовірністю d. Обмеження
+min(r, ...) не дає відмити репутацію, цитуючи надійні джерела: підсилення
+лише знижує довіру, тож вузол, що переказує низькорепутаційне джерело,
+успадковує частину його недовіри.
+
+Граф зберігається в CSR (indptr int64, indices int32, weights float32 -
+8 байт на ребро); степенева ітерація векторизована numpy. Нові ребра
+накопичуються і зливаються при наступному propagate(), ітерація стартує з
+попереднього вектора довіри (warm start) - після малих змін збігається за
+кілька кроків.
+"""
+
+import argparse
+import json
+import re
+import sqlite3
+import time
+from array import array
+from collections.abc import Mapping
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from urllib.parse import urlsplit
+
+import numpy as np
+
+from states import get_action_protocol
+
+# Назви, які не можуть бути цитуванням (типові значення VeritasDatabase/web)
+IGNORED_SOURCES = {'Unknown', 'Web Input'}
+# Найдовша назва джерела, що шукається в тексті (слів)
+MAX_NAME_TOKENS = 4
+
+# Платформи, де джерело - акаунт (перший сегмент шляху), а не хост
+PLATFORM_HOSTS = {
+    't.me', 'telegram.me', 'twitter.com', 'x.com', 'youtube.com', 'facebook.com',
+    'instagram.com', 'tiktok.com', 'medium.com', 'reddit.com', 'vk.com', 'linkedin.com'
+}
+# Службові сегменти перед іменем акаунта (youtube.com/c/name, t.me/s/name)
+_PLATFORM_PREFIXES = {'c', 'channel', 'user', 's', 'r', 'u', 'in', 'company', 'groups'}
+# Суфікси, під якими реєструються окремі сайти: bbc.co.uk, name.blogspot.com
+PUBLIC_SUFFIXES = {
+    'co.uk', 'org.uk', 'ac.uk', 'gov.uk', 'com.ua', 'org.ua', 'net.ua', 'gov.ua', 'in.ua',
+    'kiev.ua', 'kyiv.ua', 'com.au', 'co.jp', 'com.br', 'co.il', 'com.pl', 'com.tr',
+    'blogspot.com', 'wordpress.com', 'substack.com', 'livejournal.com', 'tumblr.com', 'github.io'
+}
+
+_WORD = re.compile(r'\w+')
+_URL = re.compile(r'https?://[^\s"\'<>]+', re.IGNORECASE)
+
+
+def _name_key(text: str) -> str:
+    return ' '.join(_WORD.findall(text.lower()))
+
+
+def site_key(url: str) -> Optional[str]:
+    """
+    Ідентифікатор сайту з URL: зареєстрований домен (news.bbc.co.uk ->
+    bbc.co.uk) або платформа + акаунт (t.me/name); None - якщо URL не
+    вказує на конкретне джерело (головна сторінка платформи)
+    """
+    try:
+        # Розділові знаки після посилання в тексті - не частина шляху
+        parts = urlsplit(url.strip().rstrip('.,;:!?)]'))
+    except ValueError:
+        return None
+    host = (parts.hostname or '').lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    if '.' not in host:
+        return None
+    labels = host.split('.')
+    domain = '.'.join(labels[-3:]) if '.'.join(labels[-2:]) in PUBLIC_SUFFIXES else '.'.join(labels[-2:])
+    if domain in PUBLIC_SUFFIXES:
+        return None
+    if domain in PLATFORM_HOSTS:
+        segments = [segment for segment in parts.path.lower().split('/') if segment]
+        if segments and segments[0] in _PLATFORM_PREFIXES:
+            segments = segments[1:]
+        return f"{domain}/{segments[0]}" if segments else None
+    return domain
+
+
+class CitationExtractor:
+    """Пошук згадок відомих джерел у матеріалі"""
+
+    def __init__(self):
+        self._names: Dict[str, str] = {}
+        # Сайт -> джерело; None - сайт спільний для кількох джерел
+        self._sites: Dict[str, Optional[str]] = {}
+
+    def add_source(self, source: str, url: Optional[str] = None):
+        """
+        Реєструє джерело для пошуку
+
+        Args:
+            source: Назва джерела
+            url: URL матеріалу джерела (site_key стає його ідентифікатором;
+                 сайт, на якому публікуються кілька джерел, не атрибутується)
+        """
+        if source in IGNORED_SOURCES:
+            return
+        key = _name_key(source)
+        if len(key) >= 3 and len(key.split()) <= MAX_NAME_TOKENS:
+            self._names.setdefault(key, source)
+        site = site_key(url) if url else None
+        if site:
+            if self._sites.get(site, source) != source:
+                source = None
+            self._sites[site] = source
+
+    def _by_url(self, url: str) -> Optional[str]:
+        site = site_key(url)
+        return self._sites.get(site) if site else None
+
+    def citations(self, source: str, texts: Iterable[str], links: Iterable[str] = ()) -> Set[str]:
+        """
+        Джерела, згадані в матеріалі (без самого джерела)
+
+        Args:
+            source: Джерело матеріалу
+            texts: Заголовок, текст тощо
+            links: Явні цитування - URL або назви джерел
+        """
+        cited = set()
+        names = self._names
+        for text in texts:
+            if not text:
+                continue
+            tokens = _WORD.findall(text.lower())
+            for i in range(len(tokens)):
+                for n in range(1, min(MAX_NAME_TOKENS, len(tokens) - i) + 1):
+                    name = names.get(' '.join(tokens[i:i + n]))
+                    if name is not None:
+                        cited.add(name)
+            for url in _URL.findall(text):
+                name = self._by_url(url)
+                if name is not None:
+                    cited.add(name)
+        for link in links:
+            name = self._by_url(link) if _URL.match(link.strip()) else names.get(_name_key(link))
+            if name is not None:
+                cited.add(name)
+        cited.discard(source)
+        return cited
+
+
+class TrustGraph(Mapping):
+    """
+    Граф цитувань з поширеною довірою (dict-сумісний: джерело -> довіра)
+
+    Example:
+        >>> graph = TrustGraph.from_database('veritas_history.db')
+        >>> graph.propagate()
+        >>> get_action_protocol(graph['Mid_Tier_Outlet'])
+    """
+
+    def __init__(self, damping: float = 0.85, default_reputation: float = 0.5,
+                 tol: float = 1e-6, max_iter: int = 200):
+        """
+        Args:
+            damping: Імовірність перейти за цитуванням (d)
+            default_reputation: Базова репутація нового джерела
+            tol: Поріг збіжності (максимальна зміна довіри за крок)
+            max_iter: Максимум ітерацій
+        """
+        if not 0.0 <= damping < 1.0:
+            raise ValueError(f"damping must be in [0, 1): {damping}")
+        self.damping = damping
+        self.default_reputation = default_reputation
+        self.tol = tol
+        self.max_iter = max_iter
+        self.extractor = CitationExtractor()
+
+        self._ids: Dict[str, int] = {}
+        self._names: List[str] = []
+        self._base = array('d')
+
+        # CSR: рядок - джерело, що цитує
+        self._indptr = np.zeros(1, dtype=np.int64)
+        self._indices = np.zeros(0, dtype=np.int32)
+        self._weights = np.zeros(0, dtype=np.float32)
+        self._out = np.zeros(0, dtype=np.float64)
+
+        # Нові ребра до наступного propagate()
+        self._pending_src = array('i')
+        self._pending_dst = array('i')
+        self._pending_weight = array('f')
+
+        self._trust = np.zeros(0, dtype=np.float64)
+        self.iterations = 0
+
+    # === Вузли і ребра ===
+
+    def node(self, source: str) -> int:
+        """Індекс джерела (нове - з базовою репутацією за замовчуванням)"""
+        node = self._ids.get(source)
+        if node is None:
+            node = self._ids[source] = len(self._names)
+            self._names.append(source)
+            self._base.append(self.default_reputation)
+        return node
+
+    def set_reputation(self, source: str, reputation: float):
+        """Базова репутація джерела"""
+        self._base[self.node(source)] = reputation
+
+    def set_reputations(self, registry):
+        """Базові репутації з реєстру (dict, ConcurrentRegistry, DecayingRegistry)"""
+        items = registry.decayed() if hasattr(registry, 'decayed') else registry
+        for source in items:
+            self.set_reputation(source, items[source])
+
+    def add_edge(self, citing: str, cited: str, weight: float = 1.0):
+        """Ребро citing -> cited (повторні ребра сумуються)"""
+        if weight <= 0:
+            raise ValueError(f"Edge weight must be positive: {weight}")
+        if citing == cited:
+            return
+        self._pending_src.append(self.node(citing))
+        self._pending_dst.append(self.node(cited))
+        self._pending_weight.append(weight)
+
+    def add_edges(self, edges: Iterable[Tuple]):
+        """Ребра (citing, cited) або (citing, cited, weight)"""
+        for edge in edges:
+            self.add_edge(*edge)
+
+    def add_edge_arrays(self, citing: np.ndarray, cited: np.ndarray,
+                        weights: Optional[np.ndarray] = None):
+        """
+        Пакет ребер за індексами вузлів (node()) - для мільйонів ребер
+
+        Args:
+            citing: Індекси джерел, що цитують
+            cited: Індекси цитованих джерел
+            weights: Ваги (default - 1.0)
+        """
+        citing = np.asarray(citing, dtype=np.int32)
+        cited = np.asarray(cited, dtype=np.int32)
+        weights = np.ones(len(citing), dtype=np.float32) if weights is None \
+            else np.asarray(weights, dtype=np.float32)
+        if len(citing) and (min(citing.min(), cited.min()) < 0
+                            or max(citing.max(), cited.max()) >= len(self._names)):
+            raise IndexError("Edge refers to an unknown node")
+        if np.any(weights <= 0):
+            raise ValueError("Edge weights must be positive")
+        keep = citing != cited
+        self._pending_src.frombytes(citing[keep].tobytes())
+        self._pending_dst.frombytes(cited[keep].tobytes())
+        self._pending_weight.frombytes(weights[keep].tobytes())
+
+    def add_analysis(self, analysis: Dict):
+        """
+        Ребра з результату аналізу (формат VeritasDatabase.save_analysis)
+
+        Цитовані джерела мають бути вже відомі extractor (add_source або
+        попередні add_analysis).
+        """
+        content = analysis.get('content', {})
+        source = content.get('source', 'Unknown')
+        self.extractor.add_source(source, analysis.get('url'))
+        texts = (content.get('title'), content.get('text_preview'), content.get('text'))
+        links = content.get('citations') or content.get('links') or ()
+        for cited in self.extractor.citations(source, texts, links):
+            self.add_edge(source, cited)
+
+    @property
+    def edge_count(self) -> int:
+        """Ребра CSR плюс ще не злиті (дублікати серед них рахуються окремо)"""
+        return len(self._indices) + len(self._pending_src)
+
+    def _merge(self):
+        """
+        Вклеює нові ребра в CSR (дублікати сумуються)
+
+        Сортуються лише нові ребра (O(k log k)); їх позиції в рядках
+        знаходить векторизований бінарний пошук, а вставка - одне
+        копіювання indices/weights (O(E) memcpy, без сортування всього
+        графа).
+        """
+        n = len(self._names)
+        old_n = len(self._indptr) - 1
+        if n > old_n:
+            # Нові вузли - порожні рядки в кінці
+            self._indptr = np.concatenate([self._indptr, np.full(n - old_n, self._indptr[-1])])
+            self._out = np.concatenate([self._out, np.zeros(n - old_n)])
+
+        src = np.frombuffer(self._pending_src, dtype=np.int32).astype(np.int64)
+        dst = np.frombuffer(self._pending_dst, dtype=np.int32)
+        keys, inverse = np.unique(src * n + dst, return_inverse=True)
+        weights = np.bincount(inverse, weights=np.frombuffer(self._pending_weight, dtype=np.float32),
+                              minlength=len(keys)).astype(np.float32)
+        rows = keys // n
+        cols = (keys - rows * n).astype(np.int32)
+        del src, dst, inverse
+
+        # Перша позиція в рядку з колонкою >= cols (рядки CSR відсортовані)
+        lo = self._indptr[rows]
+        hi = self._indptr[rows + 1]
+        end = hi.copy()
+        active = lo < hi
+        while active.any():
+            mid = (lo + hi) // 2
+            less = active & (self._indices[np.minimum(mid, len(self._indices) - 1)] < cols)
+            lo = np.where(less, mid + 1, lo)
+            hi = np.where(active & ~less, mid, hi)
+            active = lo < hi
+
+        found = lo < end
+        found[found] = self._indices[lo[found]] == cols[found]
+        self._weights[lo[found]] += weights[found]
+        new = ~found
+        self._indices = np.insert(self._indices, lo[new], cols[new])
+        self._weights = np.insert(self._weights, lo[new], weights[new])
+        self._indptr[1:] += np.cumsum(np.bincount(rows[new], minlength=n))
+        self._out += np.bincount(rows, weights=weights, minlength=n)
+
+        self._pending_src = array('i')
+        self._pending_dst = array('i')
+        self._pending_weight = array('f')
+
+    # === Поширення ===
+
+    def propagate(self, warm_start: bool = True) -> int:
+        """
+        Степенева ітерація до збіжності
+
+        Args:
+            warm_start: Почати з попереднього вектора довіри (нові джерела -
+                        з базової репутації)
+
+        Returns:
+            int: Кількість ітерацій
+        """
+        if self._pending_src or len(self._indptr) - 1 != len(self._names):
+            self._merge()
+        base = np.frombuffer(self._base, dtype=np.float64).copy()
+        trust = base.copy()
+        if warm_start and len(self._trust):
+            trust[:len(self._trust)] = self._trust
+
+        d = self.damping
+        teleport = (1.0 - d) * base
+        rows = np.flatnonzero(self._out > 0)
+        starts = self._indptr[rows]
+        out = self._out[rows]
+
+        iterations = 0
+        for iterations in range(1, self.max_iter + 1):
+            # Рядки без цитувань - петля на себе
+            cited = trust.copy()
+            if len(rows):
+                cited[rows] = np.add.reduceat(self._weights * trust[self._indices], starts) / out
+            updated = np.minimum(base, teleport + d * cited)
+            delta = np.max(np.abs(updated - trust)) if len(trust) else 0.0
+            trust = updated
+            if delta < self.tol:
+                break
+
+        self._trust = trust
+        self.iterations = iterations
+        return iterations
+
+    # === Читання ===
+
+    def __getitem__(self, source: str) -> float:
+        """Довіра з останнього propagate(); до нього - базова репутація"""
+        node = self._ids[source]
+        if node < len(self._trust):
+            return float(self._trust[node])
+        return self._base[node]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._names)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __contains__(self, source) -> bool:
+        return source in self._ids
+
+    def reputation(self, source: str) -> float:
+        """Базова (власна) репутація джерела"""
+        return self._base[self._ids[source]]
+
+    def action_protocol(self, source: str) -> Dict:
+        """states.get_action_protocol за поширеною довірою"""
+        return get_action_protocol(self.get(source, self.default_reputation))
+
+    def most_discounted(self, k: int = 10) -> List[Tuple[str, float, float]]:
+        """
+        Джерела, яким підсилення найбільше знизило довіру
+
+        Returns:
+            List[Tuple[str, float, float]]: (джерело, репутація, довіра)
+        """
+        count = min(len(self._trust), len(self._names))
+        if not count or k <= 0:
+            return []
+        drop = np.frombuffer(self._base, dtype=np.float64)[:count] - self._trust[:count]
+        top = np.argpartition(-drop, min(k, count) - 1)[:k]
+        top = top[np.argsort(-drop[top], kind='stable')]
+        return [(self._names[i], self._base[i], float(self._trust[i])) for i in top if drop[i] > 0]
+
+    # === VeritasDatabase ===
+
+    @classmethod
+    def from_database(cls, db_path: str, registry=None, **kwargs) -> 'TrustGraph':
+        """
+        Граф з таблиці analyses
+
+        Args:
+            db_path: SQLite база VeritasDatabase
+            registry: Базові репутації (default - таблиця source_reputation)
+            **kwargs: Параметри TrustGraph
+        """
+        graph = cls(**kwargs)
+        conn = sqlite3.connect(db_path)
+        try:
+            # Спершу всі джерела - цитування можуть бути на пізніші
+            for source, url in conn.execute("SELECT source, url FROM analyses"):
+                graph.extractor.add_source(source, url)
+            for source, url, title, preview, full in conn.execute("""
+                SELECT source, url, title, text_preview, full_data FROM analyses ORDER BY id
+            """):
+                analysis = json.loads(full) if full else {}
+                content = dict(analysis.get('content') or {})
+                content.update({'source': source, 'title': title, 'text_preview': preview})
+                graph.add_analysis({'url': url, 'content': content})
+            if registry is None:
+                for source, reputation in conn.execute("SELECT source, reputation FROM source_reputation"):
+                    graph.set_reputation(source, reputation)
+        finally:
+            conn.close()
+        if registry is not None:
+            graph.set_reputations(registry)
+        return graph
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Veritas Protocol - trust propagation over citations')
+    parser.add_argument('--db', required=True, help='SQLite база VeritasDatabase')
+    parser.add_argument('--damping', type=float, default=0.85)
+    parser.add_argument('--top', type=int, default=20, help='Скільки джерел з найбільшим зниженням показати')
+    parser.add_argument('--out', help='Куди записати довіру (JSON)')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    graph = TrustGraph.from_database(args.db, damping=args.damping)
+    iterations = graph.propagate()
+    elapsed = time.perf_counter() - start
+    print(f"{len(graph)} sources, {graph.edge_count} edges, {iterations} iterations, {elapsed:.2f}s")
+    for source, reputation, trust in graph.most_discounted(args.top):
+        print(f"  {source}: {reputation:.2f} -> {trust:.2f} ({graph.action_protocol(source)['state']})")
+
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump(dict(graph), f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()